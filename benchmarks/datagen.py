@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Seeded generator of large synthetic TickTick accounts, for scale testing.
+
+The projects, tasks, checklist items and kanban columns follow the Project,
+Task, ChecklistItem and Column schemas of ticktick-openapi.md, with the
+variety of a heavy real account: tasks spread unevenly over hundreds of
+projects, due dates from months overdue to years ahead in a dozen time
+zones, all-day and timed tasks, recurrence rules, reminders, checklists and
+content from one line to several kilobytes. The same seed and date always
+give the same account.
+
+A dataset is a dictionary with the "projects" list and the "tasks" and
+"columns" of every project by project ID. It can be saved to JSON (gzipped
+if the file name ends in .gz), served by mock_api.py, or loaded straight
+into a CachedTickTickClient and its indexes:
+
+    python benchmarks/datagen.py --projects 300 --tasks 30000 --output account.json.gz
+    python benchmarks/mock_api.py --dataset account.json.gz
+"""
+
+import sys
+import gzip
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Time zones of the tasks, with the UTC offsets used when the tz database isn't available
+TIME_ZONES = {
+    "UTC": 0, "America/Los_Angeles": -8, "America/Chicago": -6, "America/New_York": -5,
+    "America/Sao_Paulo": -3, "Europe/London": 0, "Europe/Berlin": 1, "Europe/Moscow": 3,
+    "Asia/Kolkata": 5.5, "Asia/Shanghai": 8, "Asia/Tokyo": 9, "Australia/Sydney": 10,
+}
+
+REPEAT_FLAGS = [
+    "RRULE:FREQ=DAILY;INTERVAL=1",
+    "RRULE:FREQ=DAILY;INTERVAL=3",
+    "RRULE:FREQ=WEEKLY;INTERVAL=1",
+    "RRULE:FREQ=WEEKLY;INTERVAL=1;BYDAY=MO,WE,FR",
+    "RRULE:FREQ=WEEKLY;INTERVAL=2;BYDAY=TU",
+    "RRULE:FREQ=MONTHLY;INTERVAL=1;BYMONTHDAY=1",
+    "RRULE:FREQ=MONTHLY;INTERVAL=1;BYDAY=-1FR",
+    "RRULE:FREQ=YEARLY;INTERVAL=1",
+    "RRULE:FREQ=DAILY;INTERVAL=1;COUNT=10",
+    "RRULE:FREQ=WEEKLY;INTERVAL=1;UNTIL=20301231T000000Z",
+]
+
+# Reminders relative to the due time of timed tasks, and to the start of the day of all-day tasks
+TIMED_REMINDERS = ["TRIGGER:PT0S", "TRIGGER:-PT5M", "TRIGGER:-PT15M", "TRIGGER:-PT30M", "TRIGGER:-PT1H", "TRIGGER:-P1D"]
+ALL_DAY_REMINDERS = ["TRIGGER:P0DT9H0M0S", "TRIGGER:-P1DT15H0M0S", "TRIGGER:P0DT8H30M0S", "TRIGGER:-P7DT15H0M0S"]
+
+COLORS = ["#F18181", "#FFB000", "#E6EA49", "#35D870", "#4CA1FF", "#6E75F4", "#C77CFF", "#A1A1A1", None]
+COLUMN_NAMES = ["Backlog", "To do", "In progress", "Review", "Blocked", "Done"]
+
+WORDS = (
+    "report review call email plan design fix write order book meeting budget invoice draft release deploy "
+    "update check prepare schedule clean renew pay send sign read research test migrate refactor document "
+    "interview onboard travel flight hotel dentist doctor groceries laundry garden car insurance tax bank "
+    "gift birthday party dinner lunch gym run yoga course lecture exam project client vendor contract "
+    "quarterly weekly monthly annual follow up backup server database roadmap feedback survey slides "
+    "Café résumé naïve Zürich Köln 会议 报告 購入 予約 встреча"
+).split()
+EMOJI = ["📞", "✈️", "🛒", "💡", "🔥", "✅", "📚", "🏃"]
+
+# (first day, last day) relative to today of the due date buckets, and their weights; None for no due date
+DUE_DATE_BUCKETS = [
+    (None, 35), ((-365, -31), 4), ((-30, -1), 11), ((0, 0), 8), ((1, 1), 5),
+    ((2, 7), 12), ((8, 90), 20), ((91, 730), 5),
+]
+PRIORITIES = [(0, 55), (1, 15), (3, 18), (5, 12)]
+
+def _zone(name: str) -> timezone:
+    try:
+        return ZoneInfo(name)
+    except ZoneInfoNotFoundError:
+        return timezone(timedelta(hours=TIME_ZONES[name]), name)
+
+def format_date(moment: datetime) -> str:
+    """Format a date the way the API returns it, e.g. 2019-11-13T03:00:00.000+0000."""
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+def _weighted(rng: random.Random, choices: List[tuple]) -> Any:
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+class _Generator:
+    def __init__(self, seed: int, today: datetime):
+        self.rng = random.Random(seed)
+        self.today = today.date()
+        self.zones = {name: _zone(name) for name in TIME_ZONES}
+        self.ids = set()
+
+    def new_id(self) -> str:
+        while True:
+            object_id = f"{self.rng.getrandbits(96):024x}"
+            if object_id not in self.ids:
+                self.ids.add(object_id)
+                return object_id
+
+    def words(self, count: int) -> str:
+        return " ".join(self.rng.choice(WORDS) for _ in range(count))
+
+    def sentence(self) -> str:
+        text = self.words(self.rng.randint(4, 16))
+        return text[0].upper() + text[1:] + "."
+
+    def content(self) -> str:
+        kind = self.rng.random()
+        if kind < 0.4:
+            return ""
+        if kind < 0.85:
+            return " ".join(self.sentence() for _ in range(self.rng.randint(1, 3)))
+
+        # Long notes: paragraphs, lists and links, up to several kilobytes
+        blocks = []
+        for _ in range(self.rng.randint(3, 25)):
+            shape = self.rng.random()
+            if shape < 0.6:
+                blocks.append(" ".join(self.sentence() for _ in range(self.rng.randint(2, 8))))
+            elif shape < 0.85:
+                blocks.append("\n".join(f"- {self.words(self.rng.randint(2, 8))}" for _ in range(self.rng.randint(2, 6))))
+            else:
+                blocks.append(f"See https://example.com/{self.words(1).lower()}/{self.rng.randint(1, 99999)}")
+        return "\n\n".join(blocks)
+
+    def title(self) -> str:
+        text = self.words(self.rng.randint(2, 8))
+        text = text[0].upper() + text[1:]
+        if self.rng.random() < 0.05:
+            text = f"{self.rng.choice(EMOJI)} {text}"
+        return text
+
+    def due_day(self) -> Optional[Any]:
+        bucket = _weighted(self.rng, DUE_DATE_BUCKETS)
+        if bucket is None:
+            return None
+        return self.today + timedelta(days=self.rng.randint(*bucket))
+
+    def project(self, position: int, groups: List[str]) -> Dict[str, Any]:
+        project = {
+            "id": self.new_id(),
+            "name": self.title(),
+            "color": self.rng.choice(COLORS),
+            "sortOrder": position * 1099511627776 - self.rng.randint(0, 1 << 30),
+            "closed": self.rng.random() < 0.05,
+            "viewMode": _weighted(self.rng, [("list", 70), ("kanban", 20), ("timeline", 10)]),
+            "permission": _weighted(self.rng, [("write", 90), ("comment", 5), ("read", 5)]),
+            "kind": _weighted(self.rng, [("TASK", 95), ("NOTE", 5)]),
+        }
+        if groups and self.rng.random() < 0.4:
+            project["groupId"] = self.rng.choice(groups)
+        return project
+
+    def columns(self, project: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if project["viewMode"] != "kanban":
+            return []
+        names = COLUMN_NAMES[:self.rng.randint(3, len(COLUMN_NAMES))]
+        return [
+            {"id": self.new_id(), "projectId": project["id"], "name": name, "sortOrder": i * 1099511627776}
+            for i, name in enumerate(names)
+        ]
+
+    def checklist_item(self, position: int, zone_name: str) -> Dict[str, Any]:
+        item = {
+            "id": self.new_id(),
+            "title": self.title(),
+            "status": 1 if self.rng.random() < 0.3 else 0,
+            "sortOrder": position * 1099511627776,
+            "isAllDay": False,
+            "timeZone": zone_name,
+        }
+        if self.rng.random() < 0.2:
+            day = self.due_day() or self.today
+            item["isAllDay"] = self.rng.random() < 0.5
+            hour = 0 if item["isAllDay"] else self.rng.randint(8, 20)
+            item["startDate"] = format_date(datetime(day.year, day.month, day.day, hour, tzinfo=self.zones[zone_name]))
+        if item["status"] == 1:
+            completed = datetime.combine(self.today, datetime.min.time(), timezone.utc) - timedelta(
+                minutes=self.rng.randint(0, 60 * 24 * 60))
+            item["completedTime"] = format_date(completed)
+        return item
+
+    def task(self, project_id: str, sort_order: int) -> Dict[str, Any]:
+        rng = self.rng
+        zone_name = _weighted(rng, [("UTC", 10)] + [(name, 8) for name in TIME_ZONES if name != "UTC"])
+        zone = self.zones[zone_name]
+        task = {
+            "id": self.new_id(),
+            "projectId": project_id,
+            "title": self.title(),
+            "content": self.content(),
+            "isAllDay": False,
+            "timeZone": zone_name,
+            "priority": _weighted(rng, PRIORITIES),
+            "status": 0,
+            "sortOrder": sort_order,
+        }
+
+        day = self.due_day()
+        if day is not None:
+            task["isAllDay"] = rng.random() < 0.45
+            if task["isAllDay"]:
+                # All-day tasks are due at midnight in their time zone
+                due = datetime(day.year, day.month, day.day, tzinfo=zone)
+                start = due - timedelta(days=rng.randint(1, 4)) if rng.random() < 0.1 else due
+            else:
+                due = datetime(day.year, day.month, day.day, rng.randint(7, 21), rng.choice([0, 15, 30, 45]), tzinfo=zone)
+                start = due - timedelta(minutes=rng.choice([15, 30, 60, 120])) if rng.random() < 0.25 else due
+            task["startDate"] = format_date(start)
+            task["dueDate"] = format_date(due)
+
+            if rng.random() < 0.5:
+                pool = ALL_DAY_REMINDERS if task["isAllDay"] else TIMED_REMINDERS
+                task["reminders"] = rng.sample(pool, rng.randint(1, 3))
+            if rng.random() < 0.15:
+                task["repeatFlag"] = rng.choice(REPEAT_FLAGS)
+
+        if rng.random() < 0.25:
+            count = min(rng.randint(1, 4) * rng.randint(1, 3), 12)
+            task["items"] = [self.checklist_item(i, zone_name) for i in range(count)]
+            if rng.random() < 0.3:
+                task["desc"] = self.sentence()
+        return task
+
+def generate_account(projects: int = 200, tasks: int = 20000, seed: int = 0,
+                     today: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Generate a synthetic account.
+
+    Args:
+        projects: Number of projects
+        tasks: Total number of undone tasks, spread unevenly over the projects
+        seed: Seed of the random generator
+        today: Date the due dates are relative to (defaults to today)
+
+    Returns:
+        The dataset: {"projects": [...], "tasks": {project ID: [...]}, "columns": {project ID: [...]}}
+    """
+    generator = _Generator(seed, today or datetime.now(timezone.utc))
+    rng = generator.rng
+
+    groups = [generator.new_id() for _ in range(max(1, projects // 10))]
+    project_list = [generator.project(position, groups) for position in range(projects)]
+
+    # A few large projects and a long tail of small ones, like real accounts
+    weights = [rng.paretovariate(1.2) for _ in project_list]
+    counts = dict.fromkeys((project["id"] for project in project_list), 0)
+    for project in rng.choices(project_list, weights, k=tasks if project_list else 0):
+        counts[project["id"]] += 1
+
+    dataset = {"projects": project_list, "tasks": {}, "columns": {}}
+    for project in project_list:
+        start = -rng.randint(0, 1 << 40)
+        dataset["tasks"][project["id"]] = [
+            generator.task(project["id"], start + position * (1 << 28)) for position in range(counts[project["id"]])
+        ]
+        dataset["columns"][project["id"]] = generator.columns(project)
+    return dataset
+
+def project_data(dataset: Dict[str, Any], project_id: str) -> Dict[str, Any]:
+    """Build the get_project_with_data payload of a project of a dataset."""
+    project = next(project for project in dataset["projects"] if project["id"] == project_id)
+    return {
+        "project": project,
+        "tasks": dataset["tasks"].get(project_id, []),
+        "columns": dataset.get("columns", {}).get(project_id, []),
+    }
+
+def load_into_cache(cache, dataset: Dict[str, Any]) -> None:
+    """
+    Fill a CachedTickTickClient (and so its task and search indexes) with a dataset, without any API request.
+
+    The dataset is parsed into models first, as the client does with API responses.
+
+    Args:
+        cache: The CachedTickTickClient
+        dataset: The dataset
+    """
+    from ticktick_mcp.src.models import parse_project_data, parse_projects
+
+    cache.apply_projects(parse_projects(dataset["projects"]))
+    for project in dataset["projects"]:
+        cache.apply_project_data(project["id"], parse_project_data(project_data(dataset, project["id"])))
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def save_dataset(dataset: Dict[str, Any], path: str) -> None:
+    """Save a dataset to a JSON file, gzipped if the name ends in .gz."""
+    with _open(path, "w") as f:
+        json.dump(dataset, f, ensure_ascii=False)
+
+def load_dataset(path: str) -> Dict[str, Any]:
+    """Load a dataset saved by save_dataset."""
+    with _open(path, "r") as f:
+        dataset = json.load(f)
+    dataset.setdefault("columns", {})
+    return dataset
+
+def describe(dataset: Dict[str, Any]) -> Dict[str, Any]:
+    """Count what a dataset contains."""
+    tasks = [task for project_tasks in dataset["tasks"].values() for task in project_tasks]
+    per_project = sorted((len(project_tasks) for project_tasks in dataset["tasks"].values()), reverse=True)
+    return {
+        "projects": len(dataset["projects"]),
+        "closed_projects": sum(project.get("closed", False) for project in dataset["projects"]),
+        "tasks": len(tasks),
+        "largest_projects": per_project[:5],
+        "checklist_items": sum(len(task.get("items", [])) for task in tasks),
+        "with_due_date": sum("dueDate" in task for task in tasks),
+        "all_day": sum(task.get("isAllDay", False) for task in tasks),
+        "recurring": sum("repeatFlag" in task for task in tasks),
+        "with_reminders": sum(bool(task.get("reminders")) for task in tasks),
+        "content_bytes": sum(len(task.get("content", "").encode()) for task in tasks),
+        "json_bytes": len(json.dumps(dataset, ensure_ascii=False).encode()),
+    }
+
+def add_arguments(parser: argparse.ArgumentParser, projects: int = 200, tasks: int = 20000) -> None:
+    """Add the options of the generator to a parser."""
+    parser.add_argument("--projects", type=int, default=projects, help=f"Number of projects (default: {projects})")
+    parser.add_argument("--tasks", type=int, default=tasks, help=f"Total number of tasks (default: {tasks})")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the generator (default: 0)")
+    parser.add_argument("--date", help="Date the due dates are relative to, as YYYY-MM-DD (default: today)")
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse the --date option."""
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc) if value else None
+
+def generate_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """Generate the dataset described by the options added by add_arguments."""
+    return generate_account(args.projects, args.tasks, args.seed, parse_date(args.date))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic TickTick account")
+    add_arguments(parser)
+    parser.add_argument("--output", help="Save the dataset to this JSON file (.json or .json.gz)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    dataset = generate_from_args(args)
+    elapsed = time.perf_counter() - start
+    if args.output:
+        save_dataset(dataset, args.output)
+        print(f"Dataset written to {args.output}")
+    print(f"Generated in {elapsed:.2f}s:")
+    for name, value in describe(dataset).items():
+        print(f"  {name}: {value}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the JSON backends on large get_project_with_data payloads.
+
+For every payload size, a project with that many tasks is generated with
+datagen.py and encoded as the /project/{id}/data response, and every
+installed backend (see ticktick_mcp/src/json_backend.py) is timed:
+
+- decode: the payload into plain dictionaries and lists
+- parse: the payload into models, the way the clients decode responses
+  (with a schema, for msgspec-schema)
+- encode: the parsed models back to JSON, the way snapshots are saved
+
+    python benchmarks/json_backends.py --sizes 1000,5000,20000 --extra-fields --output json.json
+
+With --extra-fields, every task also has fields that the API returns but
+the models don't have, which msgspec-schema skips and the other backends keep.
+"""
+
+import gc
+import sys
+import json
+import time
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+import datagen
+import run_benchmarks
+from run_benchmarks import percentile
+
+from ticktick_mcp.src.json_backend import JSON_BACKENDS, get_json_backend
+from ticktick_mcp.src.models import parse_project_data
+
+RESULTS_VERSION = 1
+
+OPERATIONS = ("decode", "parse", "encode")
+
+def add_extra_fields(payload: Dict[str, Any]) -> None:
+    """Add to every task of a payload fields the API returns but the models don't have."""
+    for position, task in enumerate(payload["tasks"]):
+        task.update({
+            "tags": ["work", "later"] if position % 3 == 0 else [],
+            "columnId": payload["columns"][0]["id"] if payload["columns"] else None,
+            "kind": "CHECKLIST" if task.get("items") else "TEXT",
+            "createdTime": task.get("startDate") or "2026-01-01T09:00:00.000+0000",
+            "creator": 114478622,
+            "progress": 0,
+            "deleted": 0,
+            "attachments": [],
+        })
+
+def make_payload(tasks: int, seed: int, date: Optional[str], extra_fields: bool) -> bytes:
+    """Generate the get_project_with_data response of a project with this many tasks."""
+    dataset = datagen.generate_account(1, tasks, seed, datagen.parse_date(date))
+    payload = datagen.project_data(dataset, dataset["projects"][0]["id"])
+    if extra_fields:
+        add_extra_fields(payload)
+    return json.dumps(payload).encode()
+
+def time_call(call: Callable[[], Any], iterations: int) -> float:
+    """Get the median time of a call in milliseconds."""
+    call()
+    latencies = []
+    for _ in range(iterations):
+        # Garbage left by the previous run isn't charged to this one
+        gc.collect()
+        start = time.perf_counter()
+        call()
+        latencies.append(time.perf_counter() - start)
+    return percentile(sorted(latencies), 0.5) * 1000
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the JSON backends on large project data payloads")
+    parser.add_argument("--sizes", default="1000,5000,20000",
+                        help="Comma-separated numbers of tasks in the project (default: 1000,5000,20000)")
+    parser.add_argument("--backends", default=",".join(JSON_BACKENDS),
+                        help=f"Comma-separated backends to time, if installed (default: {','.join(JSON_BACKENDS)})")
+    parser.add_argument("--extra-fields", action="store_true",
+                        help="Add fields the models don't have to every task, as the real API does")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the payloads (default: 0)")
+    parser.add_argument("--date", help="Date the due dates are relative to, as YYYY-MM-DD (default: today)")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs of every operation (default: 5)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    backends = []
+    for name in args.backends.split(","):
+        backend = get_json_backend(name)
+        if backend.name != name.strip():
+            print(f"Skipping {name}: not installed")
+            continue
+        backends.append(backend)
+
+    rows = []
+    print(f"{'Tasks':>8} {'Size MB':>8} {'Backend':>14}" + "".join(f" {operation + ' ms':>10}" for operation in OPERATIONS))
+    for size in [int(size) for size in args.sizes.split(",") if size.strip()]:
+        payload = make_payload(size, args.seed, args.date, args.extra_fields)
+        parsed = backends[0].decode(payload, parse_project_data)
+        for backend in backends:
+            timings = {
+                "decode": time_call(lambda: backend.decode(payload), args.iterations),
+                "parse": time_call(lambda: backend.decode(payload, parse_project_data), args.iterations),
+                "encode": time_call(lambda: backend.dumps(parsed), args.iterations),
+            }
+            row = {"tasks": size, "bytes": len(payload), "backend": backend.name,
+                   **{f"{operation}_ms": round(value, 3) for operation, value in timings.items()}}
+            rows.append(row)
+            print(f"{size:>8} {len(payload) / (1 << 20):>8.2f} {backend.name:>14}"
+                  + "".join(f" {timings[operation]:>10.2f}" for operation in OPERATIONS))
+
+    if args.output:
+        report = {"version": RESULTS_VERSION, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                  "config": {name: value for name, value in vars(args).items() if name != "output"},
+                  "environment": run_benchmarks.environment(), "results": rows}
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the TickTick Open API, for benchmarks.
+
+Serves the /open/v1 endpoints documented in ticktick-openapi.md from an
+in-memory dataset, generated by datagen.py or loaded from a file it saved,
+with injected latency and injected 500 and 429 responses. Besides being
+started by run_benchmarks.py, it can be run on its own to try the MCP server
+against a large account:
+
+    python benchmarks/mock_api.py --projects 200 --tasks 20000 --latency 0.05 --port 8081
+    TICKTICK_ACCESS_TOKEN=mock TICKTICK_BASE_URL=http://127.0.0.1:8081/open/v1 uv run -m ticktick_mcp.cli run
+
+Two control endpoints outside /open/v1 are used by the benchmarks:
+GET /_mock/stats returns request counts and POST /_mock/reset restores the
+initial dataset and clears the counts.
+"""
+
+import re
+import sys
+import copy
+import json
+import time
+import random
+import argparse
+import itertools
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+import datagen
+
+API_PREFIX = "/open/v1"
+
+class MockTickTickAPI:
+    """
+    In-memory TickTick Open API served over HTTP in a background thread.
+
+    Every /open/v1 request sleeps latency seconds (varied by jitter, as a
+    fraction), then fails with 500 with probability error_rate or with 429
+    with probability throttle_rate, and otherwise is answered from the
+    dataset. Responses that list tasks are encoded once and reused until the
+    project changes.
+    """
+
+    def __init__(self, dataset: Dict[str, Any], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, retry_after: float = 1.0, seed: int = 0):
+        self.initial_dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.reset()
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; without this, delayed ACKs
+            # add tens of milliseconds to every response with a body
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                api._handle(self, "GET")
+
+            def do_POST(self):
+                api._handle(self, "POST")
+
+            def do_DELETE(self):
+                api._handle(self, "DELETE")
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "MockTickTickAPI":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self) -> None:
+        """Restore the initial dataset and clear the request counts."""
+        with self._lock:
+            self.projects = {project["id"]: dict(project) for project in self.initial_dataset["projects"]}
+            self.tasks = {
+                project_id: {task["id"]: task for task in copy.deepcopy(tasks)}
+                for project_id, tasks in self.initial_dataset["tasks"].items()
+            }
+            self.requests: Counter = Counter()
+            self.statuses: Counter = Counter()
+            self._encoded: Dict[str, bytes] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "by_endpoint": dict(self.requests),
+                "statuses": {str(status): count for status, count in self.statuses.items()},
+                "projects": len(self.projects),
+                "tasks": sum(len(tasks) for tasks in self.tasks.values()),
+            }
+
+    # Request handling
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        path = handler.path.split("?", 1)[0]
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+
+        if path == "/_mock/stats" and method == "GET":
+            return self._send(handler, 200, json.dumps(self.stats()).encode())
+        if path == "/_mock/reset" and method == "POST":
+            self.reset()
+            return self._send(handler, 200, b"{}")
+        if not path.startswith(API_PREFIX):
+            return self._send(handler, 404, b'{"errorMessage": "not found"}')
+
+        endpoint = path[len(API_PREFIX):]
+        if not handler.headers.get("Authorization", "").startswith("Bearer "):
+            return self._respond(handler, 401, b'{"errorMessage": "unauthorized"}')
+
+        if self.latency:
+            time.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+        with self._lock:
+            self.requests[f"{method} {re.sub(r'/[0-9a-f]{24}', '/{id}', endpoint)}"] += 1
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return self._respond(handler, 500, b'{"errorMessage": "injected error"}')
+        if roll < self.error_rate + self.throttle_rate:
+            return self._respond(handler, 429, b'{"errorMessage": "injected throttle"}',
+                                 {"Retry-After": f"{self.retry_after:g}"})
+
+        try:
+            data = json.loads(body) if body else None
+        except ValueError:
+            return self._respond(handler, 400, b'{"errorMessage": "invalid JSON"}')
+
+        with self._lock:
+            status, payload = self._route(method, endpoint, data)
+            if isinstance(payload, (dict, list)):
+                payload = json.dumps(payload).encode()
+        self._respond(handler, status, payload)
+
+    def _respond(self, handler: BaseHTTPRequestHandler, status: int, body: bytes,
+                 headers: Optional[Dict[str, str]] = None) -> None:
+        """Send the response to an API request, counting its status."""
+        with self._lock:
+            self.statuses[status] += 1
+        self._send(handler, status, body, headers)
+
+    def _send(self, handler: BaseHTTPRequestHandler, status: int, body: bytes,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _new_id(self) -> str:
+        return f"{0xfff000000000000000000000 + next(self._ids):024x}"
+
+    def _route(self, method: str, endpoint: str, data: Any) -> Tuple[int, Any]:
+        """
+        Answer an API request, returning the status and the JSON payload (or its encoding).
+
+        Called with the lock held.
+        """
+        not_found = (404, {"errorMessage": "not found"})
+        if endpoint == "/project":
+            if method == "GET":
+                return 200, self._encoded_projects()
+            if method == "POST" and data:
+                project = {"id": self._new_id(), "name": data.get("name", ""), "color": data.get("color"),
+                           "sortOrder": len(self.projects) * 1024, "closed": False,
+                           "viewMode": data.get("viewMode", "list"), "permission": "write",
+                           "kind": data.get("kind", "TASK")}
+                self.projects[project["id"]] = project
+                self.tasks[project["id"]] = {}
+                self._encoded.pop("projects", None)
+                return 200, project
+
+        if endpoint == "/task" and method == "POST" and data:
+            project_id = data.get("projectId")
+            if project_id not in self.tasks:
+                return not_found
+            task = dict(data, id=self._new_id(), status=0, sortOrder=len(self.tasks[project_id]) * 1024)
+            self.tasks[project_id][task["id"]] = task
+            self._encoded.pop(project_id, None)
+            return 200, task
+
+        match = re.fullmatch(r"/task/([^/]+)", endpoint)
+        if match and method == "POST" and data:
+            task = self.tasks.get(data.get("projectId"), {}).get(match[1])
+            if task is None:
+                return not_found
+            task.update({key: value for key, value in data.items() if key != "id"})
+            self._encoded.pop(task["projectId"], None)
+            return 200, task
+
+        match = re.fullmatch(r"/project/([^/]+)(/data)?", endpoint)
+        if match:
+            project_id, with_data = match[1], match[2]
+            project = self.projects.get(project_id)
+            if project is None:
+                return not_found
+            if method == "GET":
+                return 200, self._encoded_project_data(project_id) if with_data else project
+            if method == "POST" and not with_data and data:
+                project.update({key: value for key, value in data.items() if key != "id"})
+                self._encoded.pop("projects", None)
+                self._encoded.pop(project_id, None)
+                return 200, project
+            if method == "DELETE" and not with_data:
+                del self.projects[project_id]
+                self.tasks.pop(project_id, None)
+                self._encoded.pop("projects", None)
+                self._encoded.pop(project_id, None)
+                return 200, b""
+
+        match = re.fullmatch(r"/project/([^/]+)/task/([^/]+)(/complete)?", endpoint)
+        if match:
+            project_id, task_id, complete = match[1], match[2], match[3]
+            task = self.tasks.get(project_id, {}).get(task_id)
+            if task is None:
+                return not_found
+            if method == "GET" and not complete:
+                return 200, task
+            if method == "POST" and complete:
+                task["status"] = 2
+                task["completedTime"] = datagen.format_date(datetime.now(timezone.utc))
+                self._encoded.pop(project_id, None)
+                return 200, b""
+            if method == "DELETE" and not complete:
+                del self.tasks[project_id][task_id]
+                self._encoded.pop(project_id, None)
+                return 200, b""
+
+        return not_found
+
+    def _encoded_projects(self) -> bytes:
+        encoded = self._encoded.get("projects")
+        if encoded is None:
+            encoded = self._encoded["projects"] = json.dumps(list(self.projects.values())).encode()
+        return encoded
+
+    def _encoded_project_data(self, project_id: str) -> bytes:
+        encoded = self._encoded.get(project_id)
+        if encoded is None:
+            tasks = [task for task in self.tasks.get(project_id, {}).values() if task.get("status") == 0]
+            encoded = self._encoded[project_id] = json.dumps({
+                "project": self.projects[project_id], "tasks": tasks,
+                "columns": self.initial_dataset.get("columns", {}).get(project_id, []),
+            }).encode()
+        return encoded
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the dataset and fault injection options of the mock API to a parser."""
+    datagen.add_arguments(parser, projects=20, tasks=1000)
+    parser.add_argument("--dataset", help="Serve the dataset saved in this file by datagen.py instead of generating one")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API request (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Fraction the latency is randomly varied by (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of API requests answered with 500 (default: 0)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="Fraction of API requests answered with 429 (default: 0)")
+    parser.add_argument("--retry-after", type=float, default=1.0,
+                        help="Retry-After of the injected 429 responses, in seconds (default: 1)")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the TickTick Open API")
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8081, help="Port to listen on, 0 for any (default: 8081)")
+    args = parser.parse_args(argv)
+
+    dataset = datagen.load_dataset(args.dataset) if args.dataset else datagen.generate_from_args(args)
+    api = MockTickTickAPI(
+        dataset, host=args.host, port=args.port,
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed
+    )
+    # The first line tells run_benchmarks.py where to connect
+    print(f"Mock TickTick API listening on {api.base_url}", flush=True)
+    try:
+        api.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
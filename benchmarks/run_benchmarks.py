@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks of the TickTick MCP server.
+
+Starts the mock TickTick API (mock_api.py) in a subprocess, points the
+clients at it and measures the latency and throughput of every
+TickTickClient method (with the synchronous and the asynchronous client)
+and of every MCP tool, the read tools both with a cold cache and a warm
+one. Results are written as JSON; given the results of an earlier run, the
+run is compared with it and regressions are reported.
+
+    python benchmarks/run_benchmarks.py --projects 50 --tasks 5000 --latency 0.02 --output baseline.json
+    python benchmarks/run_benchmarks.py --projects 50 --tasks 5000 --latency 0.02 --compare baseline.json
+
+Settings of the server (TICKTICK_CACHE_TTL, TICKTICK_MAX_CONCURRENCY, ...)
+are taken from the environment. The client-side rate limit is disabled
+unless TICKTICK_RATE_LIMIT is set, since it would dominate the timings.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import inspect
+import logging
+import platform
+import argparse
+import subprocess
+import urllib.request
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import mock_api
+
+RESULTS_VERSION = 1
+
+# Changes of the median smaller than this are noise, whatever the ratio
+NOISE_FLOOR_MS = 1.0
+
+def mock_arguments(args: argparse.Namespace) -> List[str]:
+    """Get the command-line options of mock_api.py matching the options of a run."""
+    arguments = [
+        "--latency", str(args.latency), "--jitter", str(args.jitter), "--error-rate", str(args.error_rate),
+        "--throttle-rate", str(args.throttle_rate), "--retry-after", str(args.retry_after),
+    ]
+    if args.dataset:
+        return arguments + ["--dataset", args.dataset]
+    arguments += ["--projects", str(args.projects), "--tasks", str(args.tasks), "--seed", str(args.seed)]
+    return arguments + (["--date", args.date] if args.date else [])
+
+class MockProcess:
+    """The mock TickTick API running in a subprocess, so that it doesn't compete with the server for the GIL."""
+
+    def __init__(self, arguments: List[str]):
+        command = [sys.executable, str(BENCHMARKS_DIR / "mock_api.py"), "--port", "0", *arguments]
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        line = self.process.stdout.readline()
+        if " on " not in line:
+            self.process.kill()
+            raise RuntimeError(f"Mock TickTick API failed to start: {line!r}")
+        self.base_url = line.rsplit(" on ", 1)[1].strip()
+        self.root_url = self.base_url[:-len(mock_api.API_PREFIX)]
+
+    def _call(self, method: str, path: str) -> Dict[str, Any]:
+        request = urllib.request.Request(f"{self.root_url}{path}", method=method, data=b"" if method == "POST" else None)
+        with urllib.request.urlopen(request) as response:
+            return json.loads(response.read() or b"{}")
+
+    def stats(self) -> Dict[str, Any]:
+        return self._call("GET", "/_mock/stats")
+
+    def reset(self) -> None:
+        self._call("POST", "/_mock/reset")
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.wait()
+
+class Case:
+    """
+    One benchmark: a call made once per iteration.
+
+    Args:
+        name: Name of the result
+        call: Function called with the iteration number; it may return an awaitable
+        prepare: Called with the number of iterations before the timed calls, e.g. to
+            create the projects that delete_project deletes
+        before_each: Called before every timed call, e.g. to empty the cache
+        warm_up: Make one untimed call first
+        writes: The call changes the data, so the mock API is reset afterwards
+    """
+
+    def __init__(self, name: str, call: Callable[[int], Any], prepare: Optional[Callable[[int], Any]] = None,
+                 before_each: Optional[Callable[[], Any]] = None, warm_up: bool = False, writes: bool = False):
+        self.name = name
+        self.call = call
+        self.prepare = prepare
+        self.before_each = before_each
+        self.warm_up = warm_up
+        self.writes = writes
+
+async def _resolve(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+def _is_error(result: Any) -> bool:
+    if isinstance(result, dict):
+        return 'error' in result
+    if isinstance(result, str):
+        return result.startswith(("Error", "Failed", "Invalid", "Network error"))
+    return False
+
+def percentile(values: List[float], q: float) -> float:
+    """Get a percentile of sorted values, interpolating between the closest ranks."""
+    if len(values) == 1:
+        return values[0]
+    position = q * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def summarize(latencies: List[float], wall: float, requests: int, errors: int, concurrency: int) -> Dict[str, Any]:
+    """Summarize the latencies of a benchmark, in milliseconds."""
+    values = sorted(latency * 1000 for latency in latencies)
+    return {
+        "iterations": len(values),
+        "concurrency": concurrency,
+        "mean_ms": round(sum(values) / len(values), 3),
+        "p50_ms": round(percentile(values, 0.5), 3),
+        "p95_ms": round(percentile(values, 0.95), 3),
+        "p99_ms": round(percentile(values, 0.99), 3),
+        "min_ms": round(values[0], 3),
+        "max_ms": round(values[-1], 3),
+        "ops_per_sec": round(len(values) / wall, 2) if wall > 0 else None,
+        "api_requests_per_op": round(requests / len(values), 2),
+        "errors": errors,
+    }
+
+async def run_case(case: Case, mock: MockProcess, iterations: int, concurrency: int) -> Dict[str, Any]:
+    """Run a benchmark and summarize it."""
+    if case.prepare:
+        await _resolve(case.prepare(iterations))
+    if case.warm_up:
+        await _resolve(case.call(iterations))
+
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run_one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            if case.before_each:
+                await _resolve(case.before_each())
+            start = time.perf_counter()
+            result = await _resolve(case.call(i))
+            latencies.append(time.perf_counter() - start)
+            errors += _is_error(result)
+
+    requests = mock.stats()["requests"]
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(i) for i in range(iterations)))
+    wall = time.perf_counter() - start
+    requests = mock.stats()["requests"] - requests
+    return summarize(latencies, wall, requests, errors, concurrency)
+
+def client_cases(prefix: str, client, data: Dict[str, Any]) -> List[Case]:
+    """Benchmarks of every method of a TickTickClient or AsyncTickTickClient."""
+    project_ids, tasks = data["project_ids"], data["tasks"]
+    project = lambda i: project_ids[i % len(project_ids)]
+    task = lambda i: tasks[i % len(tasks)]
+    created_projects: List[str] = []
+
+    async def create_projects(count: int) -> None:
+        created_projects.clear()
+        for k in range(count):
+            created = await _resolve(client.create_project(f"Benchmark project {k}"))
+            created_projects.append(created["id"])
+
+    return [
+        Case(f"{prefix}.get_projects", lambda i: client.get_projects()),
+        Case(f"{prefix}.get_project", lambda i: client.get_project(project(i))),
+        Case(f"{prefix}.get_project_with_data", lambda i: client.get_project_with_data(project(i))),
+        Case(f"{prefix}.get_task", lambda i: client.get_task(*task(i))),
+        Case(f"{prefix}.create_task", lambda i: client.create_task(f"Benchmark task {i}", project(i)), writes=True),
+        Case(f"{prefix}.update_task",
+             lambda i: client.update_task(task(i)[1], task(i)[0], title=f"Updated task {i}"), writes=True),
+        Case(f"{prefix}.complete_task", lambda i: client.complete_task(*task(i)), writes=True),
+        Case(f"{prefix}.delete_task", lambda i: client.delete_task(*task(i)), writes=True),
+        Case(f"{prefix}.create_subtask",
+             lambda i: client.create_subtask(f"Benchmark subtask {i}", task(i)[1], task(i)[0]), writes=True),
+        Case(f"{prefix}.create_project", lambda i: client.create_project(f"Benchmark project {i}"), writes=True),
+        Case(f"{prefix}.update_project", lambda i: client.update_project(project(i), name=f"Renamed {i}"), writes=True),
+        Case(f"{prefix}.delete_project", lambda i: client.delete_project(created_projects[i]),
+             prepare=create_projects, writes=True),
+    ]
+
+def _tool_text(result: Any) -> str:
+    # FastMCP returns the content blocks, or (content blocks, structured output) in newer versions
+    content = result[0] if isinstance(result, tuple) else result
+    return content[0].text if content else ""
+
+def tool_cases(server, client, data: Dict[str, Any], batch_size: int) -> List[Case]:
+    """Benchmarks of every MCP tool, the read tools both with a cold and a warm cache."""
+    project_ids, tasks = data["project_ids"], data["tasks"]
+    project = lambda i: project_ids[i % len(project_ids)]
+    task = lambda i: tasks[i % len(tasks)]
+    batch = lambda i: [tasks[(i * batch_size + k) % len(tasks)] for k in range(batch_size)]
+    created_projects: List[str] = []
+
+    def tool(name: str, arguments: Callable[[int], Dict[str, Any]]) -> Callable[[int], Awaitable[str]]:
+        async def call(i: int) -> str:
+            return _tool_text(await server.mcp.call_tool(name, arguments(i)))
+        return call
+
+    async def create_projects(count: int) -> None:
+        created_projects.clear()
+        for k in range(count):
+            created = await client.create_project(f"Benchmark project {k}")
+            created_projects.append(created["id"])
+
+    reads = [
+        ("get_accounts", lambda i: {}),
+        ("get_projects", lambda i: {}),
+        ("get_project", lambda i: {"project_id": project(i)}),
+        ("get_project_tasks", lambda i: {"project_id": project(i)}),
+        ("get_task", lambda i: {"project_id": task(i)[0], "task_id": task(i)[1]}),
+        ("get_all_tasks", lambda i: {}),
+        ("get_all_tasks[limit=20]", lambda i: {"limit": 20, "offset": (i * 20) % max(1, len(tasks))}),
+        ("get_all_tasks[json]", lambda i: {"output_format": "json"}),
+        ("get_all_tasks[compact]", lambda i: {"output_format": "compact"}),
+        ("get_tasks_by_priority", lambda i: {"priority_id": 5}),
+        ("get_tasks_due_today", lambda i: {}),
+        ("get_tasks_due_tomorrow", lambda i: {}),
+        ("get_tasks_due_in_days", lambda i: {"days": 3}),
+        ("get_tasks_due_this_week", lambda i: {}),
+        ("get_overdue_tasks", lambda i: {}),
+        ("search_tasks", lambda i: {"search_term": "review"}),
+        ("get_engaged_tasks", lambda i: {}),
+        ("get_next_tasks", lambda i: {}),
+    ]
+    writes = [
+        ("create_task", lambda i: {"title": f"Benchmark task {i}", "project_id": project(i)}),
+        ("update_task", lambda i: {"task_id": task(i)[1], "project_id": task(i)[0], "title": f"Updated task {i}"}),
+        ("complete_task", lambda i: {"project_id": task(i)[0], "task_id": task(i)[1]}),
+        ("delete_task", lambda i: {"project_id": task(i)[0], "task_id": task(i)[1]}),
+        ("create_subtask", lambda i: {"subtask_title": f"Benchmark subtask {i}", "parent_task_id": task(i)[1],
+                                      "project_id": task(i)[0]}),
+        ("create_project", lambda i: {"name": f"Benchmark project {i}"}),
+        ("batch_create_tasks", lambda i: {"tasks": [
+            {"title": f"Benchmark task {i}.{k}", "project_id": project(i + k)} for k in range(batch_size)
+        ]}),
+        ("batch_update_tasks", lambda i: {"tasks": [
+            {"task_id": task_id, "project_id": project_id, "priority": 3} for project_id, task_id in batch(i)
+        ]}),
+        ("batch_complete_tasks", lambda i: {"tasks": [
+            {"task_id": task_id, "project_id": project_id} for project_id, task_id in batch(i)
+        ]}),
+        ("batch_delete_tasks", lambda i: {"tasks": [
+            {"task_id": task_id, "project_id": project_id} for project_id, task_id in batch(i)
+        ]}),
+    ]
+
+    cases = []
+    for name, arguments in reads:
+        tool_name = name.split("[", 1)[0]
+        cases.append(Case(f"tool.{name}.cold", tool(tool_name, arguments), before_each=client.clear))
+        cases.append(Case(f"tool.{name}.warm", tool(tool_name, arguments), warm_up=True))
+    for name, arguments in writes:
+        cases.append(Case(f"tool.{name}", tool(name, arguments), writes=True))
+    cases.append(Case("tool.delete_project", tool("delete_project", lambda i: {"project_id": created_projects[i]}),
+                      prepare=create_projects, writes=True))
+    return cases
+
+def load_data(client) -> Dict[str, Any]:
+    """Get the IDs of the projects and tasks of the mock account."""
+    projects = client.get_projects()
+    project_ids = [project["id"] for project in projects if not project.get("closed")]
+    tasks: List[Tuple[str, str]] = []
+    for project_id in project_ids:
+        tasks.extend((project_id, task["id"]) for task in client.get_project_with_data(project_id).get("tasks", []))
+    if not project_ids or not tasks:
+        raise RuntimeError("The mock account has no projects or no tasks")
+    return {"project_ids": project_ids, "tasks": tasks}
+
+def environment() -> Dict[str, Any]:
+    """Describe where the benchmarks ran, to tell apart results that aren't comparable."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit,
+    }
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> int:
+    """
+    Print how the median latencies changed since a baseline.
+
+    Returns:
+        The number of benchmarks whose median got slower by more than threshold
+    """
+    regressions = 0
+    print(f"\n{'Benchmark':<48} {'Base p50':>10} {'p50':>10} {'Change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["p50_ms"], result["p50_ms"]
+        change = (after - before) / before if before else 0.0
+        regressed = change > threshold and after - before > NOISE_FLOOR_MS
+        regressions += regressed
+        print(f"{name:<48} {before:>10.2f} {after:>10.2f} {change:>+8.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+def configure_server(base_url: str) -> None:
+    """Point the server at the mock API, with nothing that would make runs differ: no snapshot, no background sync."""
+    os.environ.update({
+        "TICKTICK_ACCESS_TOKEN": "benchmark",
+        "TICKTICK_TOKEN_EXPIRES_AT": "",
+        "TICKTICK_BASE_URL": base_url,
+        "TICKTICK_CACHE_DIR": "",
+        "TICKTICK_SYNC_INTERVAL": "0",
+        "TICKTICK_ACCOUNTS": "",
+    })
+    os.environ.setdefault("TICKTICK_RATE_LIMIT", "0")
+
+async def run(args: argparse.Namespace, mock: MockProcess) -> Dict[str, Dict]:
+    configure_server(mock.base_url)
+    from ticktick_mcp.src import server
+    from ticktick_mcp.src.ticktick_client import TickTickClient
+    from ticktick_mcp.src.async_client import AsyncTickTickClient
+    logging.getLogger().setLevel(logging.WARNING if args.verbose else logging.ERROR)
+
+    sync_client = TickTickClient()
+    async_client = AsyncTickTickClient()
+    cached_client = await server.get_client()
+    if cached_client is None:
+        raise RuntimeError("The MCP server couldn't connect to the mock TickTick API")
+    data = load_data(sync_client)
+
+    cases = (
+        client_cases("client", sync_client, data)
+        + client_cases("async_client", async_client, data)
+        + tool_cases(server, cached_client, data, args.batch_size)
+    )
+    if args.only:
+        patterns = [pattern.strip() for pattern in args.only.split(",") if pattern.strip()]
+        cases = [case for case in cases if any(pattern in case.name for pattern in patterns)]
+
+    results = {}
+    print(f"{'Benchmark':<48} {'p50 ms':>9} {'p95 ms':>9} {'ops/s':>9} {'req/op':>7} {'errors':>6}")
+    for case in cases:
+        # Sync client calls block the event loop, so they can only run one at a time
+        concurrency = 1 if case.name.startswith("client.") else args.concurrency
+        result = await run_case(case, mock, args.iterations, concurrency)
+        results[case.name] = result
+        print(f"{case.name:<48} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+              f"{result['ops_per_sec'] or 0:>9.1f} {result['api_requests_per_op']:>7.2f} {result['errors']:>6}")
+        if case.writes:
+            mock.reset()
+            cached_client.clear()
+
+    sync_client.close()
+    await async_client.aclose()
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the TickTick MCP server against a local mock API")
+    mock_api.add_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=20, help="Timed calls per benchmark (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Calls in flight at once, except for the synchronous client (default: 1)")
+    parser.add_argument("--batch-size", type=int, default=10, help="Tasks per call of the batch tools (default: 10)")
+    parser.add_argument("--only", help="Comma-separated substrings; run only the benchmarks whose name contains one")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with the results in this JSON file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Slowdown of the median reported as a regression (default: 0.1 for 10%%)")
+    parser.add_argument("--verbose", action="store_true", help="Show the server's warnings")
+    args = parser.parse_args(argv)
+
+    mock = MockProcess(mock_arguments(args))
+    try:
+        results = asyncio.run(run(args, mock))
+    finally:
+        mock.stop()
+
+    config = {name: value for name, value in vars(args).items() if name not in ("output", "compare", "verbose")}
+    report = {"version": RESULTS_VERSION, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+              "config": config, "environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != config:
+            print("\nWarning: the baseline was run with different options, so the results may not be comparable")
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\n{regressions} benchmarks regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Scaling curves of the TickTick MCP server: latency and memory against the size of the account.
+
+For every size, an account is generated with datagen.py and served by
+mock_api.py, and a fresh process runs the server against it and measures:
+
+- the time of the first get_all_tasks, which fetches and indexes every project
+- the resident memory of the server process before and after that
+- the median latency of read tools once the cache is warm
+- the time to load the account straight into a CachedTickTickClient and its
+  indexes, without any HTTP
+
+    python benchmarks/scale.py --sizes 1000,5000,10000,20000,50000 --output scale.json --plot scale.png
+
+Plotting needs matplotlib, which the server doesn't depend on.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import datagen
+import run_benchmarks
+from run_benchmarks import MockProcess, percentile
+
+RESULTS_VERSION = 1
+
+# Tools timed with a warm cache, with their arguments
+WARM_TOOLS = [
+    ("get_all_tasks", {}),
+    ("get_all_tasks[limit=50]", {"limit": 50}),
+    ("get_tasks_due_today", {}),
+    ("get_tasks_by_priority", {"priority_id": 5}),
+    ("get_engaged_tasks", {"limit": 50}),
+    ("search_tasks", {"search_term": "budget review", "limit": 50}),
+]
+
+def current_rss() -> Optional[int]:
+    """Get the resident memory of this process in bytes, or None if it can't be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # Peak rather than current memory: kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def _mb(value: Optional[int]) -> Optional[float]:
+    return round(value / (1 << 20), 1) if value is not None else None
+
+async def measure(dataset_path: str, iterations: int, latency: float) -> Dict[str, Any]:
+    """Measure the server against one dataset. Runs in its own process, so that memory use starts from scratch."""
+    mock = MockProcess(["--dataset", dataset_path, "--latency", str(latency)])
+    try:
+        run_benchmarks.configure_server(mock.base_url)
+        from ticktick_mcp.src import server
+        logging.getLogger().setLevel(logging.ERROR)
+
+        rss_before = current_rss()
+        client = await server.get_client()
+        if client is None:
+            raise RuntimeError("The MCP server couldn't connect to the mock TickTick API")
+        start = time.perf_counter()
+        await server.mcp.call_tool("get_all_tasks", {})
+        cold_load = time.perf_counter() - start
+        rss_after = current_rss()
+
+        warm = {}
+        for name, arguments in WARM_TOOLS:
+            tool = name.split("[", 1)[0]
+            # The first call builds the indexes the tool needs
+            await server.mcp.call_tool(tool, arguments)
+            latencies = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                await server.mcp.call_tool(tool, arguments)
+                latencies.append(time.perf_counter() - start)
+            warm[name] = round(percentile(sorted(latencies), 0.5) * 1000, 3)
+
+        stats = mock.stats()
+    finally:
+        mock.stop()
+
+    from ticktick_mcp.src.cache import CachedTickTickClient
+    dataset = datagen.load_dataset(dataset_path)
+    cache = CachedTickTickClient(None, ttl=3600)
+    start = time.perf_counter()
+    datagen.load_into_cache(cache, dataset)
+    index_build = time.perf_counter() - start
+
+    return {
+        "tasks": stats["tasks"],
+        "projects": stats["projects"],
+        "cold_load_s": round(cold_load, 3),
+        "index_build_s": round(index_build, 3),
+        "rss_before_mb": _mb(rss_before),
+        "rss_after_mb": _mb(rss_after),
+        "warm_p50_ms": warm,
+    }
+
+def _label(tool: str) -> str:
+    return tool.replace("get_", "").replace("tasks_", "")
+
+def _print_row(row: Dict[str, Any]) -> None:
+    warm = "".join(f" {value:>{max(9, len(_label(name)))}.2f}" for name, value in row["warm_p50_ms"].items())
+    print(f"{row['tasks']:>8} {row['projects']:>8} {row['rss_after_mb'] or 0:>9.1f} "
+          f"{row['cold_load_s']:>9.2f} {row['index_build_s']:>9.2f}{warm}")
+
+def plot(rows: List[Dict[str, Any]], path: str) -> None:
+    """Plot tasks against latency and tasks against memory."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    tasks = [row["tasks"] for row in rows]
+    figure, (latency_axes, memory_axes) = plt.subplots(1, 2, figsize=(13, 5))
+    for name, _ in WARM_TOOLS:
+        latency_axes.plot(tasks, [row["warm_p50_ms"][name] for row in rows], marker="o", label=f"{name} (warm)")
+    latency_axes.plot(tasks, [row["cold_load_s"] * 1000 for row in rows], marker="s", linestyle="--",
+                      label="get_all_tasks (cold)")
+    latency_axes.set(xlabel="Tasks", ylabel="Median latency (ms)", title="Latency", yscale="log")
+    latency_axes.legend(fontsize="small")
+
+    memory_axes.plot(tasks, [row["rss_after_mb"] for row in rows], marker="o", label="Warm cache")
+    memory_axes.plot(tasks, [row["rss_before_mb"] for row in rows], marker="o", label="Before loading")
+    memory_axes.set(xlabel="Tasks", ylabel="Resident memory (MB)", title="Memory")
+    memory_axes.legend(fontsize="small")
+
+    figure.tight_layout()
+    figure.savefig(path)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure how the TickTick MCP server scales with the size of the account")
+    parser.add_argument("--sizes", default="1000,5000,10000,20000",
+                        help="Comma-separated numbers of tasks (default: 1000,5000,10000,20000)")
+    parser.add_argument("--tasks-per-project", type=int, default=100,
+                        help="Average tasks per project, which sets the number of projects (default: 100)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the datasets (default: 0)")
+    parser.add_argument("--date", help="Date the due dates are relative to, as YYYY-MM-DD (default: today)")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed calls of every warm tool (default: 5)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API request (default: 0)")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--plot", help="Plot the curves to this image file (needs matplotlib)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(asyncio.run(measure(args.worker, args.iterations, args.latency))))
+        return 0
+
+    if args.plot:
+        try:
+            import matplotlib  # noqa: F401
+        except ImportError:
+            print("Plotting needs matplotlib: pip install matplotlib")
+            return 1
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    rows = []
+    print("Tool columns: median latency with a warm cache, in ms\n")
+    print(f"{'Tasks':>8} {'Projects':>8} {'RSS MB':>9} {'Cold s':>9} {'Index s':>9}"
+          + "".join(f" {_label(name):>9}" for name, _ in WARM_TOOLS))
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            projects = max(1, round(size / args.tasks_per_project))
+            dataset = datagen.generate_account(projects, size, args.seed, datagen.parse_date(args.date))
+            dataset_path = str(Path(directory) / f"account-{size}.json")
+            datagen.save_dataset(dataset, dataset_path)
+            del dataset
+
+            command = [sys.executable, __file__, "--worker", dataset_path,
+                       "--iterations", str(args.iterations), "--latency", str(args.latency)]
+            output = subprocess.run(command, capture_output=True, text=True)
+            if output.returncode:
+                print(output.stderr, file=sys.stderr)
+                return output.returncode
+            row = json.loads(output.stdout.strip().splitlines()[-1])
+            rows.append(row)
+            _print_row(row)
+
+    if args.output:
+        report = {"version": RESULTS_VERSION, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                  "config": {name: value for name, value in vars(args).items() if name not in ("output", "plot", "worker")},
+                  "environment": run_benchmarks.environment(), "results": rows}
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.plot:
+        plot(rows, args.plot)
+        print(f"Curves plotted to {args.plot}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Shared fixtures of the offline tests.
+
+The tests run without TickTick credentials: tools and clients talk to the
+mock API of the benchmarks (benchmarks/mock_api.py), serving a small
+hand-written account.
+"""
+
+import os
+import sys
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import datagen
+from mock_api import MockTickTickAPI
+
+from ticktick_mcp.src.models import Task, parse_project_data, parse_projects
+
+WORK = "a00000000000000000000001"
+HOME = "a00000000000000000000002"
+ARCHIVE = "a00000000000000000000003"
+
+def _due(days: int) -> str:
+    """A due date the given number of days from today (UTC), late in the day."""
+    today = datetime.now(timezone.utc).replace(hour=23, minute=30, second=0, microsecond=0)
+    return datagen.format_date(today + timedelta(days=days))
+
+def make_dataset() -> dict:
+    """
+    A small account: two open projects and a closed one.
+
+    Tasks have fields the models know and some they don't (tags, columnId,
+    kind), as the real API returns them.
+    """
+    projects = [
+        {"id": WORK, "name": "Work", "color": "#F18181", "sortOrder": 0, "closed": False,
+         "viewMode": "list", "kind": "TASK", "permission": "write"},
+        {"id": HOME, "name": "Home", "sortOrder": 1024, "closed": False, "viewMode": "list", "kind": "TASK"},
+        {"id": ARCHIVE, "name": "Archive", "sortOrder": 2048, "closed": True, "kind": "TASK"},
+    ]
+    tasks = {
+        WORK: [
+            {"id": "b00000000000000000000001", "projectId": WORK, "title": "Write quarterly report",
+             "content": "Numbers for the board", "priority": 5, "status": 0, "sortOrder": 0,
+             "dueDate": _due(0), "isAllDay": False, "timeZone": "UTC",
+             "tags": ["finance"], "columnId": "c1", "kind": "TEXT"},
+            {"id": "b00000000000000000000002", "projectId": WORK, "title": "Review pull requests",
+             "priority": 3, "status": 0, "sortOrder": 1024, "dueDate": _due(1), "timeZone": "UTC",
+             "items": [{"id": "d00000000000000000000001", "title": "Check the changelog", "status": 0,
+                        "sortOrder": 0}]},
+            {"id": "b00000000000000000000003", "projectId": WORK, "title": "Renew certificates",
+             "priority": 1, "status": 0, "sortOrder": 2048, "dueDate": _due(-3), "timeZone": "UTC"},
+        ],
+        HOME: [
+            {"id": "b00000000000000000000004", "projectId": HOME, "title": "Buy groceries",
+             "content": "Milk and bread", "priority": 0, "status": 0, "sortOrder": 0},
+            {"id": "b00000000000000000000005", "projectId": HOME, "title": "Book dentist appointment",
+             "priority": 5, "status": 0, "sortOrder": 1024, "dueDate": _due(5), "timeZone": "UTC"},
+        ],
+        ARCHIVE: [
+            {"id": "b00000000000000000000006", "projectId": ARCHIVE, "title": "Old report",
+             "priority": 5, "status": 0, "sortOrder": 0},
+        ],
+    }
+    return {"projects": projects, "tasks": tasks, "columns": {}}
+
+class FakeClient:
+    """Answers reads and update_task from make_dataset(), counting requests."""
+
+    def __init__(self):
+        self.dataset = make_dataset()
+        self.requests = []
+        self.error = None
+        # Seconds get_project_with_data takes to answer, after reading the dataset
+        self.delay = 0.0
+
+    async def get_projects(self):
+        self.requests.append("projects")
+        if self.error:
+            return dict(self.error)
+        return parse_projects(self.dataset["projects"])
+
+    async def get_project_with_data(self, project_id):
+        self.requests.append(project_id)
+        if self.error:
+            return dict(self.error)
+        project = next(project for project in self.dataset["projects"] if project["id"] == project_id)
+        project_data = parse_project_data({"project": project, "tasks": self.dataset["tasks"][project_id]})
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return project_data
+
+    async def get_task(self, project_id, task_id):
+        self.requests.append(task_id)
+        if self.error:
+            return dict(self.error)
+        task = next(task for task in self.dataset["tasks"][project_id] if task["id"] == task_id)
+        return Task.from_api(task)
+
+    async def update_task(self, task_id, project_id, title=None, **fields):
+        self.requests.append(f"update {task_id}")
+        tasks = self.dataset["tasks"][project_id]
+        position = next(i for i, task in enumerate(tasks) if task["id"] == task_id)
+        tasks[position] = dict(tasks[position], **({"title": title} if title else {}))
+        return Task.from_api(tasks[position])
+
+@pytest.fixture
+def mock_api():
+    """The mock API, serving make_dataset()."""
+    api = MockTickTickAPI(make_dataset()).start()
+    yield api
+    api.stop()
+
+@pytest.fixture
+def api_env(mock_api, monkeypatch):
+    """
+    Point the default account at the mock API.
+
+    Settings that a .env file could set are set to empty values, which
+    load_dotenv() doesn't override.
+    """
+    monkeypatch.setenv("TICKTICK_ACCESS_TOKEN", "mock")
+    monkeypatch.setenv("TICKTICK_BASE_URL", mock_api.base_url)
+    for name in ("ACCOUNTS", "CACHE_DIR", "RATE_LIMIT", "JSON_BACKEND", "MAX_RETRIES", "TOKEN_EXPIRES_AT",
+                 "REFRESH_TOKEN"):
+        monkeypatch.setenv(f"TICKTICK_{name}", "")
+    monkeypatch.setenv("TICKTICK_SYNC_INTERVAL", "0")
+    return mock_api
+
+@pytest.fixture
+def server(api_env):
+    """The server module, with its default account pointed at the mock API."""
+    from ticktick_mcp.src import server
+
+    server.accounts.clear()
+    yield server
+    server.accounts.clear()
@@ -9,10 +9,16 @@ setup(
     url="https://github.com/parkjs814/ticktick-mcp",
     packages=find_packages(),
     install_requires=[
-        "mcp[cli]>=1.2.0,<2.0.0",
+        "mcp[cli]>=1.10.0,<2.0.0",
         "python-dotenv>=1.0.0,<2.0.0",
         "requests>=2.30.0,<3.0.0",
+        "httpx>=0.27.0,<1.0.0",
     ],
+    extras_require={
+        # Faster JSON backends, used when installed (see ticktick_mcp/src/json_backend.py)
+        "orjson": ["orjson>=3.8.0"],
+        "msgspec": ["msgspec>=0.18.0"],
+    },
     python_requires=">=3.10",
     entry_points={
         "console_scripts": [
@@ -0,0 +1,87 @@
+"""
+Offline tests of the account registry.
+"""
+
+import asyncio
+
+from ticktick_mcp.src.accounts import AccountRegistry, account_env_prefix, configured_accounts
+
+def test_configured_accounts(monkeypatch):
+    monkeypatch.setenv("TICKTICK_ACCESS_TOKEN", "token")
+    monkeypatch.setenv("TICKTICK_ACCOUNTS", "work, home,work,")
+    assert configured_accounts() == ["default", "work", "home"]
+    assert account_env_prefix("default") == "TICKTICK_"
+    assert account_env_prefix("my-work") == "TICKTICK_MY_WORK_"
+
+def test_concurrent_first_requests_create_once(monkeypatch):
+    monkeypatch.setenv("TICKTICK_ACCOUNTS", "work")
+    created = []
+
+    async def create(account):
+        created.append(account)
+        await asyncio.sleep(0.01)
+        return f"client of {account}"
+
+    registry = AccountRegistry(create)
+
+    async def run():
+        return await asyncio.gather(*(registry.get("work") for _ in range(5)))
+
+    assert asyncio.run(run()) == ["client of work"] * 5
+    assert created == ["work"]
+    assert "work" in registry and len(registry) == 1
+
+def test_failed_creation_is_retried(monkeypatch):
+    monkeypatch.setenv("TICKTICK_ACCOUNTS", "work")
+    results = [None, "client"]
+
+    async def create(account):
+        return results.pop(0)
+
+    registry = AccountRegistry(create)
+    assert asyncio.run(registry.get("work")) is None
+    assert asyncio.run(registry.get("work")) == "client"
+
+def test_unknown_accounts_are_rejected(monkeypatch):
+    monkeypatch.setenv("TICKTICK_ACCOUNTS", "work")
+    created = []
+
+    async def create(account):
+        created.append(account)
+        return "client"
+
+    registry = AccountRegistry(create)
+
+    async def run():
+        for position in range(100):
+            assert await registry.get(f"unknown-{position}") is None
+
+    asyncio.run(run())
+    assert created == []
+    assert not registry._locks
+
+def test_accounts_use_their_own_credentials(server, api_env, monkeypatch):
+    monkeypatch.setenv("TICKTICK_ACCOUNTS", "work")
+    monkeypatch.setenv("TICKTICK_WORK_ACCESS_TOKEN", "work-token")
+    authorizations = []
+    respond = api_env._respond
+
+    def respond_recording(handler, status, body, headers=None):
+        authorizations.append(handler.headers["Authorization"])
+        respond(handler, status, body, headers)
+
+    monkeypatch.setattr(api_env, "_respond", respond_recording)
+    assert "- work: not connected yet" in asyncio.run(server.get_accounts())
+
+    assert "Name: Home" in asyncio.run(server.get_projects(account="work"))
+    assert authorizations == ["Bearer work-token"]
+    asyncio.run(server.get_projects())
+    assert authorizations == ["Bearer work-token", "Bearer mock"]
+
+    # Each account has its own client, cache and rate limiter
+    clients = dict(server.accounts.items())
+    assert clients["work"] is not clients["default"]
+    assert clients["work"].rate_limiter is not clients["default"].rate_limiter
+    asyncio.run(server.get_projects(account="work"))
+    assert len(authorizations) == 2
+    assert "- work: connected" in asyncio.run(server.get_accounts())
@@ -0,0 +1,65 @@
+"""
+Offline tests of the batch task tools, run against the mock API (see conftest.py).
+"""
+
+import asyncio
+
+from conftest import HOME, WORK
+
+def test_batch_create_and_cache_invalidation(server, api_env):
+    assert "Buy groceries" in asyncio.run(server.get_project_tasks(HOME))
+    result = asyncio.run(server.batch_create_tasks([
+        {"title": "Water the plants", "project_id": HOME, "priority": 3},
+        {"title": "Send invoice", "project_id": WORK},
+        {"title": "Fix the fence", "project_id": HOME},
+    ]))
+    assert "Successfully created: 3 tasks" in result
+    assert "Failed: 0 tasks" in result
+    # Results are listed in input order
+    assert result.index("1. Water the plants") < result.index("2. Send invoice") < result.index("3. Fix the fence")
+    assert {task["title"] for task in api_env.tasks[HOME].values()} >= {"Water the plants", "Fix the fence"}
+
+    # The touched projects were refetched rather than served from the cache
+    home = asyncio.run(server.get_project_tasks(HOME))
+    assert "Water the plants" in home and "Fix the fence" in home
+    assert "Send invoice" in asyncio.run(server.get_project_tasks(WORK))
+    assert api_env.stats()["by_endpoint"]["POST /task"] == 3
+
+def test_batch_update_complete_and_delete(server, api_env):
+    result = asyncio.run(server.batch_update_tasks([
+        {"task_id": "b00000000000000000000001", "project_id": WORK, "title": "Write annual report"},
+        {"task_id": "b00000000000000000000004", "project_id": HOME, "priority": 5},
+    ]))
+    assert "Successfully updated: 2 tasks" in result
+    assert api_env.tasks[WORK]["b00000000000000000000001"]["title"] == "Write annual report"
+    assert api_env.tasks[HOME]["b00000000000000000000004"]["priority"] == 5
+    assert "Write annual report" in asyncio.run(server.get_project_tasks(WORK))
+
+    result = asyncio.run(server.batch_complete_tasks([
+        {"task_id": "b00000000000000000000002", "project_id": WORK},
+    ]))
+    assert "Successfully completed: 1 tasks" in result
+    # Titles of tasks the request didn't name are looked up in the task index
+    assert "1. Review pull requests" in result
+    assert api_env.tasks[WORK]["b00000000000000000000002"]["status"] == 2
+
+    result = asyncio.run(server.batch_delete_tasks([
+        {"task_id": "b00000000000000000000003", "project_id": WORK},
+        {"task_id": "b" * 24, "project_id": WORK},
+    ]))
+    assert "Successfully deleted: 1 tasks" in result
+    assert "Failed: 1 tasks" in result
+    assert "b00000000000000000000003" not in api_env.tasks[WORK]
+    work = asyncio.run(server.get_project_tasks(WORK))
+    assert "Review pull requests" not in work and "Renew certificates" not in work
+
+def test_batch_is_validated_before_anything_is_sent(server, api_env):
+    result = asyncio.run(server.batch_create_tasks([
+        {"title": "Valid", "project_id": HOME},
+        {"title": "No project"},
+        "not a task",
+    ]))
+    assert result.startswith("Validation errors found:")
+    assert "Task 3: Must be a dictionary" in result
+    assert "POST /task" not in api_env.stats()["by_endpoint"]
+    assert asyncio.run(server.batch_delete_tasks([])).startswith("No tasks provided.")
@@ -0,0 +1,79 @@
+"""
+Offline tests of the benchmark suite: the mock TickTick API and the runner's statistics.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import run_benchmarks
+
+from conftest import HOME, WORK
+
+def request(mock_api, method, endpoint, data=None, token="mock"):
+    """Send a request to the mock API, returning the status and the decoded JSON body."""
+    body = json.dumps(data).encode() if data is not None else None
+    req = urllib.request.Request(mock_api.base_url + endpoint, body, method=method,
+                                 headers={"Authorization": f"Bearer {token}"} if token else {})
+    try:
+        with urllib.request.urlopen(req) as response:
+            status, payload = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, payload = e.code, e.read()
+    return status, json.loads(payload) if payload else None
+
+def test_mock_api_routes(mock_api):
+    assert request(mock_api, "GET", "/project", token=None)[0] == 401
+    status, projects = request(mock_api, "GET", "/project")
+    assert status == 200 and [project["name"] for project in projects] == ["Work", "Home", "Archive"]
+
+    status, task = request(mock_api, "POST", "/task", {"title": "Water the plants", "projectId": HOME})
+    assert status == 200 and task["status"] == 0
+    status, updated = request(mock_api, "POST", f"/task/{task['id']}", {"projectId": HOME, "priority": 5})
+    assert updated["priority"] == 5
+    assert request(mock_api, "POST", f"/project/{HOME}/task/{task['id']}/complete")[0] == 200
+    # Completed tasks are left out of the project data
+    _, data = request(mock_api, "GET", f"/project/{HOME}/data")
+    assert task["id"] not in [listed["id"] for listed in data["tasks"]]
+
+    assert request(mock_api, "GET", "/project/" + "a" * 24)[0] == 404
+    assert request(mock_api, "DELETE", f"/project/{WORK}/task/b00000000000000000000001")[0] == 200
+    assert "b00000000000000000000001" not in mock_api.tasks[WORK]
+
+    stats = mock_api.stats()
+    assert stats["by_endpoint"]["GET /project"] == 1
+    assert stats["by_endpoint"]["GET /project/{id}/data"] == 1
+    assert stats["statuses"]["401"] == 1
+
+    mock_api.reset()
+    assert "b00000000000000000000001" in mock_api.tasks[WORK]
+    assert mock_api.stats()["requests"] == 0
+
+def test_mock_api_injects_failures(mock_api):
+    mock_api.error_rate = 1.0
+    assert request(mock_api, "GET", "/project")[0] == 500
+    mock_api.error_rate, mock_api.throttle_rate, mock_api.retry_after = 0.0, 1.0, 2
+    req = urllib.request.Request(mock_api.base_url + "/project", headers={"Authorization": "Bearer mock"})
+    with pytest.raises(urllib.error.HTTPError) as raised:
+        urllib.request.urlopen(req)
+    assert raised.value.code == 429
+    assert raised.value.headers["Retry-After"] == "2"
+
+def test_percentile_and_summary():
+    assert run_benchmarks.percentile([5.0], 0.99) == 5.0
+    assert run_benchmarks.percentile([1.0, 2.0, 3.0, 4.0], 0.5) == 2.5
+    summary = run_benchmarks.summarize([0.001, 0.002, 0.003, 0.004], wall=0.01, requests=8, errors=1, concurrency=2)
+    assert summary["p50_ms"] == 2.5
+    assert (summary["min_ms"], summary["max_ms"]) == (1.0, 4.0)
+    assert summary["ops_per_sec"] == 400
+    assert summary["api_requests_per_op"] == 2
+    assert summary["errors"] == 1
+
+def test_compare_reports_regressions(capsys):
+    baseline = {"fast": {"p50_ms": 0.2}, "slow": {"p50_ms": 10.0}, "steady": {"p50_ms": 10.0}}
+    results = {"fast": {"p50_ms": 0.5}, "slow": {"p50_ms": 15.0}, "steady": {"p50_ms": 10.5}, "new": {"p50_ms": 1.0}}
+    # "fast" slowed down by less than the noise floor, "steady" by less than the threshold
+    assert run_benchmarks.compare(results, baseline, threshold=0.1) == 1
+    assert "REGRESSION" in [line for line in capsys.readouterr().out.splitlines() if line.startswith("slow")][0]
@@ -0,0 +1,131 @@
+"""
+Offline tests of the in-memory cache in front of the TickTick client.
+"""
+
+import asyncio
+
+from ticktick_mcp.src.cache import CachedTickTickClient, TTLCache
+
+from conftest import FakeClient, make_dataset
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ticktick_mcp.src.cache.time.monotonic", lambda: now[0])
+    cache = TTLCache(max_size=4, ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.get("a", allow_stale=True) == 1
+    assert "a" not in cache
+
+def test_lru_eviction_calls_on_evict():
+    evicted = []
+    cache = TTLCache(max_size=2, ttl=60, on_evict=lambda key, value: evicted.append((key, value)))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert evicted == [("b", 2)]
+    # Invalidated and replaced entries are not evictions
+    cache.invalidate("a")
+    cache.set("c", 4)
+    assert evicted == [("b", 2)]
+    assert len(cache) == 1
+
+def test_evicted_project_leaves_the_index():
+    dataset = make_dataset()
+    work, home, archive = (project["id"] for project in dataset["projects"])
+    cached = CachedTickTickClient(FakeClient(), ttl=60, max_projects=2)
+
+    async def run():
+        await cached.get_project_with_data(work)
+        await cached.get_project_with_data(home)
+        assert cached.index.project_ids() == {work, home}
+        await cached.get_project_with_data(archive)
+
+    asyncio.run(run())
+    assert work not in cached.project_data_cache
+    assert cached.index.project_ids() == {home, archive}
+    assert not cached.index.search("quarterly")
+    assert all(cached.index.get(task["id"]) is None for task in dataset["tasks"][work])
+
+def test_reads_are_cached_and_writes_invalidate():
+    client = FakeClient()
+    cached = CachedTickTickClient(client, ttl=60)
+    work = client.dataset["projects"][0]["id"]
+
+    async def run():
+        await cached.get_projects()
+        await cached.get_projects()
+        await cached.get_project_with_data(work)
+        await cached.get_project_with_data(work)
+        assert client.requests == ["projects", work]
+        cached.invalidate_project(work)
+        assert not cached.index.project_task_ids(work)
+        await cached.get_project_with_data(work)
+        assert client.requests == ["projects", work, work]
+
+    asyncio.run(run())
+
+def test_expired_entries_answer_while_the_api_is_unavailable(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ticktick_mcp.src.cache.time.monotonic", lambda: now[0])
+    client = FakeClient()
+    cached = CachedTickTickClient(client, ttl=60)
+    work = client.dataset["projects"][0]["id"]
+    task_id = client.dataset["tasks"][work][0]["id"]
+
+    async def run():
+        projects = await cached.get_projects()
+        project_data = await cached.get_project_with_data(work)
+        now[0] += 61
+        client.error = {"error": "TickTick API is unavailable", "status_code": 503}
+        assert await cached.get_projects() == projects
+        assert await cached.get_project_with_data(work) == project_data
+        assert (await cached.get_task(work, task_id)).title == "Write quarterly report"
+        # Errors caused by the request itself are passed on
+        client.error = {"error": "Not found", "status_code": 404}
+        assert await cached.get_projects() == client.error
+        # Without a cached copy the error is passed on too
+        client.error = {"error": "TickTick API is unavailable", "status_code": 503}
+        assert await cached.get_project_with_data("unknown") == client.error
+
+    asyncio.run(run())
+    assert client.requests == ["projects", work, "projects", work, task_id, "projects", "unknown"]
+
+def test_read_overlapping_a_write_is_not_cached():
+    client = FakeClient()
+    client.delay = 0.05
+    cached = CachedTickTickClient(client, ttl=60)
+    work = client.dataset["projects"][0]["id"]
+    task_id = client.dataset["tasks"][work][0]["id"]
+
+    async def run():
+        read = asyncio.ensure_future(cached.get_project_with_data(work))
+        await asyncio.sleep(0.01)
+        await cached.update_task(task_id, work, title="Write annual report")
+        # The read was answered before the write, so it still has the old title
+        assert (await read)["tasks"][0].title == "Write quarterly report"
+        assert work not in cached.project_data_cache
+        assert not cached.index.project_task_ids(work)
+        return await cached.get_project_with_data(work)
+
+    assert asyncio.run(run())["tasks"][0].title == "Write annual report"
+    assert client.requests == [work, f"update {task_id}", work]
+
+def test_project_list_fetched_during_a_write_is_not_cached():
+    client = FakeClient()
+    cached = CachedTickTickClient(client, ttl=60)
+    fetch = client.get_projects
+
+    async def fetch_during_write():
+        projects = await fetch()
+        cached.invalidate_projects()
+        return projects
+
+    client.get_projects = fetch_during_write
+    asyncio.run(cached.get_projects())
+    assert cached.PROJECTS_KEY not in cached.projects_cache
+    assert asyncio.run(cached.refresh())
+    assert cached.PROJECTS_KEY not in cached.projects_cache
@@ -0,0 +1,164 @@
+"""
+Offline tests of the TickTick clients, run against the mock API (see conftest.py).
+"""
+
+import time
+import asyncio
+
+import pytest
+
+from ticktick_mcp.src.async_client import AsyncTickTickClient
+from ticktick_mcp.src.ticktick_client import TickTickClient
+
+from conftest import HOME, WORK
+
+def run_with(client, coroutine_function):
+    """Run a coroutine function taking the client and close the client afterwards."""
+    async def run():
+        try:
+            return await coroutine_function(client)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+def test_async_client_round_trip(api_env):
+    async def run(client):
+        task = await client.create_task("Water the plants", HOME, priority=3)
+        updated = await client.update_task(task.id, HOME, title="Water the garden")
+        fetched = await client.get_task(HOME, task.id)
+        completed = await client.complete_task(HOME, task.id)
+        project_data = await client.get_project_with_data(HOME)
+        missing = await client.get_task(HOME, "b" * 24)
+        return task, updated, fetched, completed, project_data, missing
+
+    task, updated, fetched, completed, project_data, missing = run_with(AsyncTickTickClient(), run)
+    assert (task.title, task.priority, task.project_id) == ("Water the plants", 3, HOME)
+    assert updated.title == fetched.title == "Water the garden"
+    assert "error" not in completed
+    # Completed tasks are no longer listed with the project
+    assert task.id not in [listed.id for listed in project_data["tasks"]]
+    assert project_data["project"].name == "Home"
+    assert missing["status_code"] == 404
+
+def test_async_client_matches_the_sync_client(api_env):
+    sync_client = TickTickClient()
+    try:
+        expected = sync_client.get_projects(), sync_client.get_project_with_data(WORK)
+    finally:
+        sync_client.close()
+
+    async def run(client):
+        return await client.get_projects(), await client.get_project_with_data(WORK)
+
+    assert run_with(AsyncTickTickClient(), run) == expected
+
+def test_async_requests_overlap(api_env):
+    api_env.latency = 0.2
+
+    async def run(client):
+        start = time.monotonic()
+        results = await asyncio.gather(
+            client.get_project(WORK), client.get_project(HOME),
+            client.get_project_with_data(WORK), client.get_project_with_data(HOME),
+            client.get_task(WORK, "b00000000000000000000001"), client.get_task(HOME, "b00000000000000000000004"),
+        )
+        return results, time.monotonic() - start
+
+    results, elapsed = run_with(AsyncTickTickClient(), run)
+    assert [result.id for result in results[:2]] + [result.id for result in results[4:]] == [
+        WORK, HOME, "b00000000000000000000001", "b00000000000000000000004"]
+    # Six requests of 0.2s each, in flight at the same time
+    assert api_env.stats()["requests"] == 6
+    assert elapsed < 0.8
+
+def count_connections(api_env, monkeypatch):
+    """Collect the client ports of the requests the mock API answers, one per connection."""
+    ports = []
+    respond = api_env._respond
+
+    def respond_counting(handler, status, body, headers=None):
+        ports.append(handler.client_address[1])
+        respond(handler, status, body, headers)
+
+    monkeypatch.setattr(api_env, "_respond", respond_counting)
+    return ports
+
+def test_sync_client_reuses_connections(api_env, monkeypatch):
+    ports = count_connections(api_env, monkeypatch)
+    client = TickTickClient()
+    try:
+        session = client._get_session()
+        for _ in range(5):
+            client.get_project(WORK)
+        assert client._get_session() is session
+    finally:
+        client.close()
+    assert len(ports) == 5
+    assert len(set(ports)) == 1
+
+def test_sync_client_drops_idle_connections(api_env, monkeypatch):
+    ports = count_connections(api_env, monkeypatch)
+    client = TickTickClient(keepalive_timeout=0.1)
+    try:
+        client.get_project(WORK)
+        time.sleep(0.2)
+        client.get_project(WORK)
+    finally:
+        client.close()
+    assert len(set(ports)) == 2
+
+def test_async_client_reuses_connections(api_env, monkeypatch):
+    ports = count_connections(api_env, monkeypatch)
+
+    async def run(client):
+        for project_id in (WORK, HOME) * 3:
+            await client.get_project(project_id)
+
+    run_with(AsyncTickTickClient(), run)
+    assert len(ports) == 6
+    assert len(set(ports)) == 1
+
+def test_concurrent_identical_gets_are_coalesced(api_env):
+    api_env.latency = 0.1
+
+    async def run(client):
+        results = await asyncio.gather(*(client.get_project_with_data(WORK) for _ in range(5)),
+                                       client.get_project_with_data(HOME))
+        # Sent again once the first request has finished
+        results.append(await client.get_project_with_data(WORK))
+        return results, client.coalesced_requests
+
+    results, coalesced = run_with(AsyncTickTickClient(), run)
+    assert coalesced == 4
+    assert all(result is results[0] for result in results[1:5])
+    assert results[6] is not results[0] and results[6] == results[0]
+    assert api_env.stats()["by_endpoint"] == {"GET /project/{id}/data": 3}
+
+def test_write_ends_coalescing(api_env):
+    api_env.latency = 0.1
+
+    async def run(client):
+        before = asyncio.ensure_future(client.get_project_with_data(HOME))
+        await asyncio.sleep(0.02)
+        write = asyncio.ensure_future(client.create_task("Water the plants", HOME))
+        await asyncio.sleep(0)
+        # Issued while the first GET is still in flight, but after the write
+        after = await client.get_project_with_data(HOME)
+        await write
+        return await before, after, client.coalesced_requests
+
+    before, after, coalesced = run_with(AsyncTickTickClient(), run)
+    assert coalesced == 0
+    assert after is not before
+    assert api_env.stats()["by_endpoint"] == {"GET /project/{id}/data": 2, "POST /task": 1}
+
+def test_async_client_must_be_closed_with_aclose(api_env):
+    async def run(client):
+        await client.get_project(WORK)
+        with pytest.raises(TypeError, match="aclose"):
+            client.close()
+        # The session is still open and usable
+        return await client.get_project(HOME)
+
+    assert run_with(AsyncTickTickClient(), run).name == "Home"
@@ -0,0 +1,161 @@
+"""
+Offline tests of the concurrency helpers and the batch executor.
+"""
+
+import asyncio
+import threading
+
+import datagen
+
+from ticktick_mcp.src.async_client import AsyncTickTickClient
+from ticktick_mcp.src.concurrency import BatchExecutor, bounded_as_completed, bounded_gather
+
+from conftest import HOME, MockTickTickAPI
+
+class Tracker:
+    """Counts how many calls of an async function are in flight at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    async def call(self, item, delay=0.01, result=None):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+            return item if result is None else result(item)
+        finally:
+            self.in_flight -= 1
+
+def test_bounded_gather_keeps_order_and_cap():
+    tracker = Tracker()
+
+    async def call(item):
+        return await tracker.call(item, delay=0.01 * (10 - item))
+
+    assert asyncio.run(bounded_gather(range(10), call, 3)) == list(range(10))
+    assert tracker.peak == 3
+
+def test_bounded_as_completed_yields_as_calls_finish():
+    tracker = Tracker()
+
+    async def call(item):
+        return await tracker.call(item * 10, delay=0.01 * (5 - item))
+
+    async def run():
+        return [pair async for pair in bounded_as_completed(range(5), call, 5)]
+
+    assert asyncio.run(run()) == [(4, 40), (3, 30), (2, 20), (1, 10), (0, 0)]
+
+def test_batch_executor_keeps_order_and_cap():
+    tracker = Tracker()
+
+    async def call(item):
+        return await tracker.call(item, delay=0.01 * (8 - item), result=lambda i: {"id": str(i)})
+
+    results = asyncio.run(BatchExecutor(max_concurrency=2).run(range(8), call))
+    assert [item.result["id"] for item in results] == [str(i) for i in range(8)]
+    assert [item.position for item in results] == list(range(8))
+    assert all(item.ok and item.latency > 0 for item in results)
+    assert tracker.peak == 2
+
+def test_batch_executor_reports_exceptions():
+    async def call(item):
+        if item == 1:
+            raise RuntimeError("boom")
+        return {"id": str(item)}
+
+    results = asyncio.run(BatchExecutor(max_concurrency=4).run(range(3), call))
+    assert [item.ok for item in results] == [True, False, True]
+    assert results[1].result == {"error": "boom"}
+
+def test_batch_executor_does_not_retry_rate_limited_calls():
+    tracker = Tracker()
+    calls = []
+
+    async def call(item):
+        calls.append((item, tracker.in_flight))
+        return await tracker.call(item, result=lambda i: {"error": "rate limited", "status_code": 429})
+
+    results = asyncio.run(BatchExecutor(max_concurrency=8).run(range(16), call))
+    assert sorted(item for item, _ in calls) == list(range(16))
+    assert not any(item.ok for item in results)
+    # The first eight calls halve the limit down to one, so the rest go out one at a time
+    assert max(in_flight for item, in_flight in calls if item >= 8) == 0
+
+def test_rate_limited_writes_are_retried_once_per_client_retry(api_env, monkeypatch):
+    api_env.throttle_rate = 1.0
+    api_env.retry_after = 0.01
+    monkeypatch.setenv("TICKTICK_MAX_RETRIES", "2")
+    client = AsyncTickTickClient()
+
+    async def create(title):
+        return await client.create_task(title, HOME)
+
+    async def run():
+        try:
+            return await BatchExecutor(max_concurrency=2).run(["a", "b", "c"], create)
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(run())
+    assert all(item.result.get("status_code") == 429 for item in results)
+    # Each write is sent once plus the client's two retries; the executor adds none
+    assert api_env.stats()["by_endpoint"] == {"POST /task": 9}
+
+def test_rate_limited_write_succeeds_on_client_retry(api_env, monkeypatch):
+    api_env.throttle_rate = 1.0
+    api_env.retry_after = 0.01
+    respond = api_env._respond
+
+    def respond_once_throttled(handler, status, body, headers=None):
+        # Only the first request is rate limited
+        api_env.throttle_rate = 0.0
+        respond(handler, status, body, headers)
+
+    monkeypatch.setattr(api_env, "_respond", respond_once_throttled)
+    client = AsyncTickTickClient()
+
+    async def run():
+        try:
+            return await client.create_task("Water the plants", HOME)
+        finally:
+            await client.aclose()
+
+    task = asyncio.run(run())
+    assert task.title == "Water the plants"
+    assert api_env.stats()["by_endpoint"]["POST /task"] == 2
+    assert api_env.stats()["statuses"] == {"429": 1, "200": 1}
+
+def test_filter_tools_fetch_projects_concurrently(server, monkeypatch):
+    dataset = datagen.generate_account(projects=12, tasks=200, seed=0)
+    open_projects = sum(not project.get("closed") for project in dataset["projects"])
+    api = MockTickTickAPI(dataset, latency=0.05)
+    lock = threading.Lock()
+    in_flight = [0, 0]
+    handle = api._handle
+
+    def handle_counting(handler, method):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+        try:
+            handle(handler, method)
+        finally:
+            with lock:
+                in_flight[0] -= 1
+
+    monkeypatch.setattr(api, "_handle", handle_counting)
+    api.start()
+    try:
+        monkeypatch.setenv("TICKTICK_BASE_URL", api.base_url)
+        monkeypatch.setenv("TICKTICK_MAX_CONCURRENCY", "4")
+        result = asyncio.run(server.get_all_tasks())
+    finally:
+        api.stop()
+
+    assert result.startswith("Found 12 projects")
+    assert api.stats()["by_endpoint"]["GET /project/{id}/data"] == open_projects
+    # The projects were fetched several at a time, but never more than the cap
+    assert in_flight[1] == 4
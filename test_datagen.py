@@ -0,0 +1,57 @@
+"""
+Offline tests of the synthetic account generator.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import datagen
+
+from ticktick_mcp.src.cache import CachedTickTickClient
+from ticktick_mcp.src.models import Task, parse_project_data
+
+from conftest import FakeClient
+
+TODAY = datetime(2026, 1, 15, tzinfo=timezone.utc)
+
+def test_same_seed_same_account():
+    first = datagen.generate_account(projects=20, tasks=500, seed=7, today=TODAY)
+    assert first == datagen.generate_account(projects=20, tasks=500, seed=7, today=TODAY)
+    assert first != datagen.generate_account(projects=20, tasks=500, seed=8, today=TODAY)
+
+def test_counts_and_variety():
+    dataset = datagen.generate_account(projects=30, tasks=2000, seed=1, today=TODAY)
+    summary = datagen.describe(dataset)
+    assert summary["projects"] == 30
+    assert summary["tasks"] == 2000
+    assert summary["largest_projects"][0] > 2000 / 30
+    assert 0 < summary["with_due_date"] < 2000
+    assert summary["all_day"] and summary["recurring"] and summary["with_reminders"]
+    assert summary["checklist_items"]
+    ids = [task["id"] for tasks in dataset["tasks"].values() for task in tasks]
+    assert len(set(ids)) == len(ids)
+    assert all(len(task_id) == 24 for task_id in ids)
+
+def test_tasks_parse_into_models():
+    dataset = datagen.generate_account(projects=10, tasks=300, seed=2, today=TODAY)
+    for project in dataset["projects"]:
+        project_data = parse_project_data(datagen.project_data(dataset, project["id"]))
+        for task, raw in zip(project_data["tasks"], dataset["tasks"][project["id"]]):
+            assert task.project_id == project["id"]
+            assert (task.due is not None) == ("dueDate" in raw)
+            # Every generated field survives parsing
+            assert Task.from_api(task.to_dict()).to_dict() == task.to_dict()
+            assert set(raw) <= set(task.to_dict())
+
+def test_save_and_load(tmp_path):
+    dataset = datagen.generate_account(projects=5, tasks=50, seed=3, today=TODAY)
+    for name in ("account.json", "account.json.gz"):
+        datagen.save_dataset(dataset, str(tmp_path / name))
+        assert datagen.load_dataset(str(tmp_path / name)) == json.loads(json.dumps(dataset))
+
+def test_load_into_cache():
+    dataset = datagen.generate_account(projects=10, tasks=400, seed=4, today=TODAY)
+    cache = CachedTickTickClient(FakeClient(), ttl=60)
+    datagen.load_into_cache(cache, dataset)
+    assert len(cache.index) == 400
+    assert cache.index.project_ids() == {project["id"] for project in dataset["projects"]}
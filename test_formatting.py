@@ -0,0 +1,56 @@
+"""
+Offline tests of the incremental rendering of tool output and of progress reporting.
+"""
+
+import asyncio
+
+from ticktick_mcp.src.formatting import format_task, render_filtered_projects, render_numbered
+from ticktick_mcp.src.models import Project, Task
+
+def test_render_numbered():
+    chunks = list(render_numbered("Task", ["a", "b"], str.upper))
+    assert chunks == ["Task 1:\nA\n", "Task 2:\nB\n"]
+
+def test_render_filtered_projects_consumes_sections_lazily():
+    project = Project.from_api({"id": "p1", "name": "Work"})
+    task = Task.from_api({"id": "t1", "title": "Write report", "priority": 5})
+    produced = []
+
+    def sections():
+        for i in (1, 2):
+            produced.append(i)
+            yield i, project, [(1, task)] if i == 1 else []
+
+    chunks = render_filtered_projects(3, sections(), "priority high")
+    assert next(chunks) == "Found 3 projects:\n\n"
+    assert produced == []
+    first = next(chunks)
+    assert produced == [1]
+    assert "With 1 tasks that are to be 'priority high' in this project :\n" in first
+    assert f"Task 1:\n{format_task(task)}\n" in first
+    assert "With 0 tasks" in next(chunks)
+    assert produced == [1, 2]
+    assert list(chunks) == []
+
+class RecordingContext:
+    """Stands in for the MCP request context, recording progress notifications."""
+
+    def __init__(self, fail=False):
+        self.progress = []
+        self.fail = fail
+
+    async def report_progress(self, progress, total=None, message=None):
+        if self.fail:
+            raise RuntimeError("client went away")
+        self.progress.append((progress, total))
+
+def test_filter_tools_report_progress(server):
+    ctx = RecordingContext()
+    result = asyncio.run(server.get_all_tasks(ctx=ctx))
+    # One notification per open project fetched
+    assert ctx.progress == [(1, 2), (2, 2)]
+    assert "Write quarterly report" in result
+
+def test_failing_progress_does_not_fail_the_tool(server):
+    result = asyncio.run(server.get_all_tasks(ctx=RecordingContext(fail=True)))
+    assert "Write quarterly report" in result
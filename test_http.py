@@ -0,0 +1,40 @@
+"""
+Offline tests of the DNS rebinding protection of the HTTP transports.
+"""
+
+from mcp.server.transport_security import TransportSecurityMiddleware
+
+from ticktick_mcp.src.server import _transport_security
+
+def accepts(settings, host, origin=None):
+    middleware = TransportSecurityMiddleware(settings)
+    return middleware._validate_host(host) and middleware._validate_origin(origin)
+
+def test_localhost_only_by_default():
+    settings = _transport_security("127.0.0.1")
+    assert settings.enable_dns_rebinding_protection
+    assert accepts(settings, "127.0.0.1:8000", "http://localhost:3000")
+    assert accepts(settings, "localhost")
+    assert not accepts(settings, "attacker.example:8000")
+    assert not accepts(settings, "127.0.0.1:8000", "http://attacker.example")
+
+def test_listening_host_is_allowed():
+    settings = _transport_security("192.168.1.20")
+    assert settings.enable_dns_rebinding_protection
+    assert accepts(settings, "192.168.1.20:8000", "http://192.168.1.20:8000")
+    assert not accepts(settings, "attacker.example:8000")
+
+def test_wildcard_host_needs_allowed_hosts():
+    settings = _transport_security("0.0.0.0")
+    assert not accepts(settings, "0.0.0.0:8000")
+    assert not accepts(settings, "mcp.example.com")
+
+    settings = _transport_security("0.0.0.0", ["mcp.example.com"])
+    assert accepts(settings, "mcp.example.com", "https://mcp.example.com")
+    assert accepts(settings, "mcp.example.com:8443")
+    assert not accepts(settings, "attacker.example")
+
+def test_ipv6_host():
+    settings = _transport_security("fd00::1")
+    assert accepts(settings, "[fd00::1]:8000", "http://[fd00::1]:8000")
+    assert accepts(settings, "[::1]:8000")
@@ -0,0 +1,104 @@
+"""
+Offline tests of the task index behind the cross-project filter tools.
+"""
+
+from ticktick_mcp.src.index import TaskIndex
+from ticktick_mcp.src.models import Task, parse_timestamp
+
+from conftest import ARCHIVE, HOME, WORK, make_dataset
+
+def parse(tasks):
+    return [Task.from_api(task) for task in tasks]
+
+def make_index():
+    dataset = make_dataset()
+    index = TaskIndex()
+    for project_id, tasks in dataset["tasks"].items():
+        index.update_project(project_id, parse(tasks))
+    return index, dataset
+
+def due(task):
+    return parse_timestamp(task["dueDate"])
+
+def test_update_project_indexes_every_field():
+    index, dataset = make_index()
+    assert len(index) == 6
+    assert index.project_ids() == {WORK, HOME, ARCHIVE}
+    assert index.project_task_ids(HOME) == {task["id"] for task in dataset["tasks"][HOME]}
+    assert index.with_priority(5) == {"b00000000000000000000001", "b00000000000000000000005",
+                                      "b00000000000000000000006"}
+    assert index.with_priority(0, 1) == {"b00000000000000000000003", "b00000000000000000000004"}
+    assert set(index.search("report")) == {"b00000000000000000000001", "b00000000000000000000006"}
+    record = index.get("b00000000000000000000002")
+    assert (record.project_id, record.position, record.task.title) == (WORK, 2, "Review pull requests")
+
+def test_due_between_bounds():
+    index, dataset = make_index()
+    work = dataset["tasks"][WORK]
+    assert index.due_between() == {"b00000000000000000000001", "b00000000000000000000002",
+                                   "b00000000000000000000003", "b00000000000000000000005"}
+    # The start is inclusive and the end exclusive
+    assert index.due_between(due(work[0]), due(work[1])) == {"b00000000000000000000001"}
+    assert index.due_between(end=due(work[0])) == {"b00000000000000000000003"}
+
+def test_apply_changes_adds_updates_and_removes():
+    index, dataset = make_index()
+    tasks = dataset["tasks"][WORK]
+    assert index.apply_changes(WORK, parse(tasks)) == 0
+
+    changed = dict(tasks[0], title="Write annual report", priority=1)
+    added = {"id": "b00000000000000000000007", "projectId": WORK, "title": "Plan offsite", "priority": 3}
+    assert index.apply_changes(WORK, parse([changed, tasks[1], added])) == 3
+    assert index.project_task_ids(WORK) == {"b00000000000000000000001", "b00000000000000000000002",
+                                            "b00000000000000000000007"}
+    assert "b00000000000000000000003" not in index
+    assert "b00000000000000000000003" not in index.due_between()
+    assert "b00000000000000000000001" not in index.with_priority(5)
+    assert "b00000000000000000000001" in index.with_priority(1)
+    assert "b00000000000000000000007" in index.with_priority(3)
+    assert set(index.search("annual")) == {"b00000000000000000000001"}
+    assert "b00000000000000000000001" not in index.search("quarterly")
+    assert set(index.search("offsite")) == {"b00000000000000000000007"}
+    assert index.get("b00000000000000000000007").position == 3
+
+def test_apply_changes_counts_moves_within_a_project():
+    index, dataset = make_index()
+    tasks = dataset["tasks"][WORK]
+    assert index.apply_changes(WORK, parse([tasks[1], tasks[0], tasks[2]])) == 2
+    assert index.get("b00000000000000000000002").position == 1
+    assert [task.id for _, task in index.group_by_project(index.project_task_ids(WORK))[WORK]] == [
+        "b00000000000000000000002", "b00000000000000000000001", "b00000000000000000000003"]
+
+def test_due_index_is_resorted_after_a_due_date_change():
+    index, dataset = make_index()
+    tasks = dataset["tasks"][WORK]
+    start, end = due(tasks[0]), due(tasks[1])
+    assert index.due_between(start, end) == {"b00000000000000000000001"}
+
+    # The overdue task is now due after the task due tomorrow
+    moved = dict(tasks[2], dueDate=dataset["tasks"][HOME][1]["dueDate"])
+    index.apply_changes(WORK, parse([tasks[0], tasks[1], moved]))
+    assert index.due_between(end=start) == set()
+    assert index.due_between(start=due(moved)) == {"b00000000000000000000003", "b00000000000000000000005"}
+
+def test_task_moved_between_projects():
+    index, dataset = make_index()
+    moved = dict(dataset["tasks"][HOME][0], projectId=WORK)
+    index.apply_changes(WORK, parse(dataset["tasks"][WORK] + [moved]))
+    assert index.get(moved["id"]).project_id == WORK
+    assert moved["id"] not in index.project_task_ids(HOME)
+    assert set(index.search("groceries")) == {moved["id"]}
+
+def test_remove_project():
+    index, dataset = make_index()
+    index.remove_project(WORK)
+    assert index.project_ids() == {HOME, ARCHIVE}
+    assert len(index) == 3
+    assert not index.project_task_ids(WORK)
+    assert set(index.search("report")) == {"b00000000000000000000006"}
+    assert index.with_priority(5) == {"b00000000000000000000005", "b00000000000000000000006"}
+    assert index.due_between() == {"b00000000000000000000005"}
+    # Removing it again, or a project that was never indexed, is a no-op
+    index.remove_project(WORK)
+    index.remove_project("unknown")
+    assert len(index) == 3
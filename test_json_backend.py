@@ -0,0 +1,71 @@
+"""
+Offline tests of the JSON backends: every backend that "auto" can pick decodes the same data.
+"""
+
+import json
+
+import pytest
+
+from ticktick_mcp.src.json_backend import JSON_BACKENDS, JSONBackend, get_json_backend
+from ticktick_mcp.src.models import Task, parse_project_data, parse_task
+
+from conftest import WORK, make_dataset
+
+PAYLOAD = json.dumps({
+    "project": make_dataset()["projects"][0],
+    "tasks": make_dataset()["tasks"][WORK],
+    "columns": [{"id": "c1", "projectId": WORK, "name": "Doing"}],
+}).encode()
+
+def installed(name):
+    backend = get_json_backend(name)
+    if backend.name != name:
+        pytest.skip(f"{name} is not installed")
+    return backend
+
+@pytest.mark.parametrize("name", [name for name in JSON_BACKENDS if name != "msgspec-schema"])
+def test_backends_keep_extra_fields(name):
+    backend = installed(name)
+    data = backend.decode(PAYLOAD, parse_project_data)
+    expected = JSONBackend().decode(PAYLOAD, parse_project_data)
+
+    assert [task.to_dict() for task in data["tasks"]] == [task.to_dict() for task in expected["tasks"]]
+    report = data["tasks"][0]
+    assert report.extra == {"tags": ["finance"], "columnId": "c1", "kind": "TEXT"}
+    assert report["tags"] == ["finance"]
+    assert data["project"]["permission"] == "write"
+    assert data["columns"][0]["name"] == "Doing"
+
+@pytest.mark.parametrize("name", JSON_BACKENDS)
+def test_backends_round_trip_models(name):
+    backend = installed(name)
+    task = backend.decode(PAYLOAD, parse_project_data)["tasks"][1]
+    assert isinstance(task, Task)
+    again = backend.decode(backend.dumps(task), parse_task)
+    assert again == task
+    assert again.items[0].title == "Check the changelog"
+
+def test_auto_is_lossless():
+    assert get_json_backend("auto").name != "msgspec-schema"
+    data = get_json_backend("auto").decode(PAYLOAD, parse_project_data)
+    assert data["tasks"][0].get("columnId") == "c1"
+
+def test_schema_backend_drops_unknown_fields():
+    backend = installed("msgspec-schema")
+    data = backend.decode(PAYLOAD, parse_project_data)
+    report = data["tasks"][0]
+    assert report.title == "Write quarterly report"
+    assert report.priority == 5
+    assert "tags" not in report
+    # An unexpected shape is decoded without the schema
+    assert backend.decode(b"[1, 2]", parse_task) == [1, 2]
+
+@pytest.mark.parametrize("name", JSON_BACKENDS)
+def test_invalid_json_raises_value_error(name):
+    backend = installed(name)
+    with pytest.raises(ValueError):
+        backend.decode(b'{"id": ', parse_task)
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_json_backend("simplejson")
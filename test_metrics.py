@@ -0,0 +1,92 @@
+"""
+Offline tests of the request and tool metrics.
+"""
+
+import json
+import asyncio
+
+import pytest
+
+from ticktick_mcp.src.metrics import (
+    LatencyHistogram, RequestMetrics, ToolMetrics, endpoint_template, render_prometheus
+)
+
+def test_endpoint_template():
+    assert endpoint_template("/project") == "/project"
+    assert endpoint_template("/project/abc/data") == "/project/{projectId}/data"
+    assert endpoint_template("/project/abc/task/def/complete") == "/project/{projectId}/task/{taskId}/complete"
+    assert endpoint_template("/task/def?x=1") == "/task/{taskId}"
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.4))
+    assert histogram.quantile(0.5) is None
+    for seconds in (0.05, 0.15, 0.15, 0.3, 1.0):
+        histogram.observe(seconds)
+    assert histogram.counts == [1, 2, 1, 1]
+    assert (histogram.min, histogram.max, histogram.count) == (0.05, 1.0, 5)
+    # The median falls in the middle of the (0.1, 0.2] bucket
+    assert histogram.quantile(0.5) == pytest.approx(0.175)
+    # The extremes are exact
+    assert histogram.quantile(0) == 0.05
+    assert histogram.quantile(1) == 1.0
+    summary = histogram.summary()
+    assert summary["count"] == 5 and summary["mean"] == pytest.approx(0.33)
+
+def test_request_metrics_group_by_endpoint():
+    metrics = RequestMetrics()
+    metrics.record("GET", "/project/a/data", 200, 0.01, 100)
+    metrics.record("GET", "/project/b/data", 503, 0.02)
+    metrics.record_retry("GET", "/project/b/data")
+    metrics.record("GET", "/project/b/data", "circuit_open")
+    summary = metrics.summary()["GET /project/{projectId}/data"]
+    assert summary["requests"] == 3
+    assert summary["statuses"] == {"200": 1, "503": 1, "circuit_open": 1}
+    assert summary["bytes"] == 100
+    assert summary["retries"] == 1
+    # Attempts that weren't sent have no latency
+    assert summary["latency"]["count"] == 2
+    metrics.clear()
+    assert metrics.summary() == {}
+
+def test_render_prometheus():
+    metrics = RequestMetrics()
+    metrics.record("GET", "/project", 200, 0.02, 10)
+    tools = ToolMetrics()
+    tools.record("get_projects", 0.03)
+    tools.record("get_projects", 0.5, failed=True)
+    text = render_prometheus({"work": metrics}, tools, {"ticktick_up": ("Up.", {"work": 1})})
+    lines = text.splitlines()
+    assert 'ticktick_api_requests_total{account="work",method="GET",endpoint="/project",status="200"} 1' in lines
+    assert 'ticktick_api_response_bytes_total{account="work",method="GET",endpoint="/project"} 10' in lines
+    assert ('ticktick_api_request_duration_seconds_bucket'
+            '{account="work",method="GET",endpoint="/project",le="0.025"} 1') in lines
+    assert ('ticktick_api_request_duration_seconds_bucket'
+            '{account="work",method="GET",endpoint="/project",le="+Inf"} 1') in lines
+    assert 'ticktick_tool_calls_total{tool="get_projects"} 2' in lines
+    assert 'ticktick_tool_failures_total{tool="get_projects"} 1' in lines
+    assert 'ticktick_up{account="work"} 1' in lines
+    assert "# TYPE ticktick_up gauge" in lines
+
+def test_client_requests_are_recorded(server, api_env):
+    asyncio.run(server.get_projects())
+    asyncio.run(server.get_project_tasks("a00000000000000000000002"))
+    stats = json.loads(asyncio.run(server.get_server_stats(output_format="json")))
+    requests = stats["accounts"]["default"]["requests"]
+    assert requests["GET /project"]["statuses"] == {"200": 1}
+    assert requests["GET /project/{projectId}/data"]["requests"] == 1
+    assert requests["GET /project"]["bytes"] > 0
+    assert stats["accounts"]["default"]["circuit"] == "closed"
+
+    text = asyncio.run(server.get_server_stats())
+    assert "- GET /project: 1 requests (200: 1)" in text
+    assert 'ticktick_api_requests_total{account="default",method="GET",endpoint="/project",status="200"} 1' in (
+        asyncio.run(server.get_server_stats(output_format="prometheus")))
+    assert asyncio.run(server.get_server_stats(output_format="xml")).startswith("Invalid output_format")
+
+def test_tool_calls_are_recorded(server, api_env):
+    server.tool_metrics.clear()
+    asyncio.run(server.mcp.call_tool("get_projects", {}))
+    asyncio.run(server.mcp.call_tool("get_projects", {}))
+    assert server.tool_metrics.summary()["get_projects"]["calls"] == 2
+    assert server.tool_metrics.summary()["get_projects"]["failures"] == 0
+    assert "- get_projects: 2 calls, 0 failed" in asyncio.run(server.get_server_stats())
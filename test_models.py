@@ -0,0 +1,110 @@
+"""
+Offline tests of the task and project models and of date parsing.
+"""
+
+import json
+import calendar
+from datetime import datetime
+
+import pytest
+
+from ticktick_mcp.src.models import (
+    TICKTICK_DATETIME_FORMAT, ChecklistStatus, Priority, Project, Task, TaskStatus, json_default,
+    parse_project_data, parse_projects, parse_task, parse_timestamp, same_task_version
+)
+
+@pytest.mark.parametrize("value", [
+    "2019-11-13T03:00:00.000+0000", "2019-11-13T03:00:00.000+0530", "2019-11-13T03:00:00.000-0800",
+    "2024-02-29T23:59:59.999+1400", "1970-01-01T00:00:00.000+0000",
+])
+def test_parse_timestamp_matches_strptime(value):
+    assert parse_timestamp(value) == int(datetime.strptime(value, TICKTICK_DATETIME_FORMAT).timestamp())
+
+def test_parse_timestamp_offsets():
+    utc = calendar.timegm((2019, 11, 13, 3, 0, 0))
+    assert parse_timestamp("2019-11-13T03:00:00.000+0000") == utc
+    assert parse_timestamp("2019-11-13T08:30:00.000+0530") == utc
+    assert parse_timestamp("2019-11-12T19:00:00.000-0800") == utc
+    # Other formats strptime accepts go through the slow path
+    assert parse_timestamp("2019-11-13T03:00:00.0+0000") == utc
+
+@pytest.mark.parametrize("value", [None, "", "tomorrow", "2019-13-13T03:00:00.000+0000", "2019-11-13", 20191113])
+def test_parse_timestamp_rejects_malformed_dates(value):
+    assert parse_timestamp(value) is None
+
+def test_tasks_hold_parsed_dates():
+    task = Task.from_api({"id": "t1", "dueDate": "2019-11-13T03:00:00.000+0000", "startDate": "soon"})
+    assert task.due == calendar.timegm((2019, 11, 13, 3, 0, 0))
+    assert task.start is None
+    assert Task.from_api({"id": "t2"}).due is None
+
+TASK = {
+    "id": "t1", "projectId": "p1", "title": "Write report", "priority": 5, "status": 0, "sortOrder": 1024,
+    "dueDate": "2019-11-13T03:00:00.000+0000", "isAllDay": False, "reminders": ["TRIGGER:PT0S"],
+    "items": [{"id": "i1", "title": "Draft", "status": 1, "isAllDay": False, "sortOrder": 0}],
+    "tags": ["work"], "columnId": "c1",
+}
+
+def test_task_round_trip():
+    task = Task.from_api(TASK)
+    assert task.to_dict() == TASK
+    assert task == TASK
+    assert Task.from_api(task) is task
+    assert Task.from_api(task.to_dict()) == task
+
+def test_task_reads_like_a_dict():
+    task = Task.from_api(TASK)
+    assert task["title"] == task.title == "Write report"
+    assert task.get("projectId") == "p1"
+    # Fields without an attribute are kept in extra
+    assert task.extra == {"tags": ["work"], "columnId": "c1"}
+    assert task["tags"] == ["work"]
+    assert "content" not in task and task.get("content", "none") == "none"
+    with pytest.raises(KeyError):
+        task["content"]
+    assert task.items[0]["title"] == "Draft"
+    assert task.items[0].status == ChecklistStatus.COMPLETED
+
+def test_codes_become_enums_and_unknown_codes_are_kept():
+    task = Task.from_api(dict(TASK, priority=3, status=2))
+    assert task.priority is Priority.MEDIUM
+    assert task.status is TaskStatus.COMPLETED
+    odd = Task.from_api(dict(TASK, priority=4))
+    assert odd.priority == 4 and odd.to_dict()["priority"] == 4
+
+def test_missing_fields_get_defaults():
+    task = Task.from_api({"id": "t1"})
+    assert task.to_dict() == {"id": "t1", "isAllDay": False, "reminders": [], "priority": 0, "status": 0,
+                              "sortOrder": 0, "items": []}
+    assert Project.from_api({"id": "p1"}).closed is None
+
+def test_models_are_slotted():
+    task = Task.from_api(TASK)
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.color = "red"
+    assert not hasattr(Project.from_api({"id": "p1"}), "__dict__")
+
+def test_same_task_version():
+    task = Task.from_api(TASK)
+    assert same_task_version(task, Task.from_api(dict(TASK)))
+    assert not same_task_version(task, Task.from_api(dict(TASK, title="Write annual report")))
+    # With version markers only the markers are compared
+    versioned = Task.from_api(dict(TASK, etag="e1"))
+    assert same_task_version(versioned, Task.from_api(dict(TASK, etag="e1", title="Renamed")))
+    assert not same_task_version(versioned, Task.from_api(dict(TASK, etag="e2")))
+
+def test_parsers_pass_errors_through():
+    error = {"error": "Not found", "status_code": 404}
+    assert parse_task(error) is error
+    assert parse_task({}) == {}
+    assert parse_projects(error) is error
+    assert parse_project_data(error) is error
+    data = parse_project_data({"project": {"id": "p1", "name": "Work"}, "tasks": [TASK], "columns": [{"id": "c1"}]})
+    assert isinstance(data["project"], Project) and isinstance(data["tasks"][0], Task)
+    assert data["columns"] == [{"id": "c1"}]
+
+def test_models_serialize_as_api_json():
+    project = Project.from_api({"id": "p1", "name": "Work", "closed": False, "groupId": "g1"})
+    assert json.loads(json.dumps([project, Task.from_api(TASK)], default=json_default)) == [
+        {"id": "p1", "name": "Work", "closed": False, "groupId": "g1", "sortOrder": 0}, TASK]
@@ -0,0 +1,90 @@
+"""
+Offline tests of the client-side rate limiter and of Retry-After handling.
+"""
+
+import time
+import asyncio
+import email.utils
+
+from ticktick_mcp.src.async_client import AsyncTickTickClient
+from ticktick_mcp.src.ratelimit import TokenBucket
+from ticktick_mcp.src.ticktick_client import parse_retry_after
+
+def fake_clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ticktick_mcp.src.ratelimit.time.monotonic", lambda: now[0])
+    return now
+
+def test_burst_then_reserved_delays(monkeypatch):
+    fake_clock(monkeypatch)
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    # Once the burst is spent, requests queue up one token interval apart
+    assert [round(bucket.reserve(), 3) for _ in range(3)] == [0.1, 0.2, 0.3]
+    assert bucket.waits == 3
+    assert round(bucket.wait_time, 3) == 0.6
+
+def test_refill_over_time(monkeypatch):
+    now = fake_clock(monkeypatch)
+    bucket = TokenBucket(rate=10, burst=5)
+    for _ in range(5):
+        bucket.reserve()
+    assert bucket.available == 0
+    now[0] += 0.2
+    assert round(bucket.available, 3) == 2
+    assert bucket.reserve() == 0
+    # Never refills beyond the burst
+    now[0] += 60
+    assert bucket.available == 5
+    assert bucket.budget() == {"rate": 10, "burst": 5, "available": 5, "waits": 0, "wait_time": 0}
+
+def test_throttle_holds_back_following_requests(monkeypatch):
+    now = fake_clock(monkeypatch)
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.throttle(2)
+    assert round(bucket.reserve(), 3) == 2.1
+    now[0] += 2.1
+    assert round(bucket.reserve(), 3) == 0.1
+
+def test_disabled_rate_limit():
+    bucket = TokenBucket(rate=0, burst=1)
+    assert not bucket.enabled
+    assert all(bucket.reserve() == 0 for _ in range(100))
+    bucket.throttle(10)
+    assert bucket.reserve() == 0
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("0.5") == 0.5
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 28 <= parse_retry_after(retry_at) <= 30
+    assert parse_retry_after(email.utils.formatdate(time.time() - 30, usegmt=True)) == 0
+
+def test_client_honors_retry_after(api_env, monkeypatch):
+    api_env.throttle_rate = 1.0
+    api_env.retry_after = 0.3
+    respond = api_env._respond
+
+    def respond_once_throttled(handler, status, body, headers=None):
+        api_env.throttle_rate = 0.0
+        respond(handler, status, body, headers)
+
+    monkeypatch.setattr(api_env, "_respond", respond_once_throttled)
+    client = AsyncTickTickClient()
+
+    async def run():
+        try:
+            start = time.monotonic()
+            projects = await client.get_projects()
+            return projects, time.monotonic() - start
+        finally:
+            await client.aclose()
+
+    projects, elapsed = asyncio.run(run())
+    assert [project.name for project in projects] == ["Work", "Home", "Archive"]
+    # The retry waited for the delay the API asked for, not the shorter backoff
+    assert elapsed >= 0.3
+    assert api_env.stats()["statuses"] == {"429": 1, "200": 1}
@@ -0,0 +1,178 @@
+"""
+Offline tests of the retry policy and the circuit breaker.
+"""
+
+import asyncio
+import socket
+
+import pytest
+
+from ticktick_mcp.src.async_client import AsyncTickTickClient
+from ticktick_mcp.src.ticktick_client import TickTickClient
+from ticktick_mcp.src.retry import CircuitBreaker, RetryPolicy, backoff_delay, is_unavailable
+
+def fake_clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("ticktick_mcp.src.retry.time.monotonic", lambda: now[0])
+    return now
+
+def test_circuit_breaker_transitions(monkeypatch):
+    now = fake_clock(monkeypatch)
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    # Closed until the threshold of consecutive failures is reached
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened == 1
+
+    # Open: requests are refused until reset_timeout has passed
+    now[0] += 29
+    assert not breaker.allow_request()
+    assert breaker.retry_after() == 1
+    assert breaker.open_response()["circuit_open"]
+
+    # Half-open: one probe goes through, the others are still refused
+    now[0] += 1
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow_request()
+
+    # The probe succeeds: closed again
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow_request()
+
+def test_failed_probe_reopens_the_circuit(monkeypatch):
+    now = fake_clock(monkeypatch)
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    now[0] += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == 30
+    # Reopening after a probe isn't counted as a new outage
+    assert breaker.opened == 1
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_disabled_circuit_breaker_never_opens():
+    breaker = CircuitBreaker(failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.allow_request()
+
+def test_retry_policy_decisions():
+    policy = RetryPolicy(max_retries=2, base_delay=1, max_delay=8)
+    assert policy.retry_delay("GET", 1, 503) is not None
+    assert policy.retry_delay("GET", 1, None) is not None
+    assert policy.retry_delay("GET", 3, 503) is None
+    assert policy.retry_delay("GET", 1, 404) is None
+    # Writes that may have been applied aren't sent again
+    assert policy.retry_delay("POST", 1, 503) is None
+    assert policy.retry_delay("POST", 1, None) is None
+    assert policy.retry_delay("POST", 1, None, sent=False) is not None
+    # Rate limited writes were refused, so they are retried after Retry-After
+    assert policy.retry_delay("POST", 1, 429, retry_after=2) == 2
+    assert RetryPolicy(max_retries=0).retry_delay("GET", 1, 503) is None
+
+def test_backoff_delay():
+    for attempt in range(1, 6):
+        delay = min(8, 0.5 * 2 ** (attempt - 1))
+        assert delay / 2 <= backoff_delay(attempt, 0.5, 8) <= delay
+    assert backoff_delay(1, 0.5, 8, retry_after=3) == 3
+    assert backoff_delay(1, 0.5, 8, retry_after=60) == 8
+
+def test_is_unavailable():
+    assert is_unavailable({"error": "timed out"})
+    assert is_unavailable({"error": "server error", "status_code": 502})
+    assert is_unavailable({"error": "rate limited", "status_code": 429})
+    assert not is_unavailable({"error": "not found", "status_code": 404})
+    assert not is_unavailable({"id": "1"})
+    assert not is_unavailable([])
+
+def test_client_fails_fast_while_the_circuit_is_open(api_env, monkeypatch):
+    api_env.error_rate = 1.0
+    monkeypatch.setenv("TICKTICK_MAX_RETRIES", "0")
+    monkeypatch.setenv("TICKTICK_CIRCUIT_FAILURE_THRESHOLD", "2")
+    client = AsyncTickTickClient()
+
+    async def run():
+        try:
+            return [await client.get_projects() for _ in range(4)]
+        finally:
+            await client.aclose()
+
+    results = asyncio.run(run())
+    assert [result.get("status_code") for result in results[:2]] == [500, 500]
+    assert all(result.get("circuit_open") for result in results[2:])
+    # Only the requests before the circuit opened reached the API
+    assert api_env.stats()["by_endpoint"] == {"GET /project": 2}
+
+def closed_port_url():
+    """A base URL on which connections are refused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/open/v1"
+
+def drop_connections(mock_api, monkeypatch):
+    """Make the mock API read each request and close the connection without answering."""
+    def handle(handler, method):
+        with mock_api._lock:
+            mock_api.requests[f"{method} {handler.path}"] += 1
+        handler.rfile.read(int(handler.headers.get("Content-Length") or 0))
+        handler.close_connection = True
+    monkeypatch.setattr(mock_api, "_handle", handle)
+
+def send(client, call):
+    """Make a request with either client and return its result."""
+    if not isinstance(client, AsyncTickTickClient):
+        return call(client)
+
+    async def run():
+        try:
+            return await call(client)
+        finally:
+            await client.aclose()
+    return asyncio.run(run())
+
+def retries(client):
+    return sum(stats["retries"] for stats in client.metrics.summary().values())
+
+@pytest.mark.parametrize("client_class", [TickTickClient, AsyncTickTickClient])
+def test_refused_connection_is_retried_for_writes(api_env, monkeypatch, client_class):
+    monkeypatch.setenv("TICKTICK_BASE_URL", closed_port_url())
+    monkeypatch.setenv("TICKTICK_MAX_RETRIES", "1")
+    monkeypatch.setenv("TICKTICK_RETRY_BASE_DELAY", "0.01")
+    client = client_class()
+
+    result = send(client, lambda client: client.create_task("Retried", "p1"))
+    assert "error" in result
+    # The request never reached the API, so retrying it can't create a duplicate
+    assert retries(client) == 1
+
+@pytest.mark.parametrize("client_class", [TickTickClient, AsyncTickTickClient])
+def test_dropped_connection_is_retried_for_reads_only(api_env, monkeypatch, client_class):
+    drop_connections(api_env, monkeypatch)
+    monkeypatch.setenv("TICKTICK_MAX_RETRIES", "1")
+    monkeypatch.setenv("TICKTICK_RETRY_BASE_DELAY", "0.01")
+
+    client = client_class()
+    assert "error" in send(client, lambda client: client.create_task("Not retried", "p1"))
+    # The API may have created the task before the connection dropped
+    assert retries(client) == 0
+
+    client = client_class()
+    assert "error" in send(client, lambda client: client.get_projects())
+    assert retries(client) == 1
+    assert sum(api_env.requests.values()) == 3
@@ -0,0 +1,58 @@
+"""
+Offline tests of the full-text search index.
+"""
+
+from ticktick_mcp.src.models import Task
+from ticktick_mcp.src.search import SearchIndex, tokenize
+
+def task(task_id, title, content=None, items=()):
+    return Task.from_api({"id": task_id, "title": title, "content": content,
+                          "items": [{"id": f"{task_id}-{i}", "title": item} for i, item in enumerate(items)]})
+
+def make_index():
+    index = SearchIndex()
+    index.add("1", task("1", "Write quarterly report", "Numbers for the board"))
+    index.add("2", task("2", "Review report drafts", items=["Check the quarterly numbers"]))
+    index.add("3", task("3", "Buy groceries", "Milk, bread"))
+    return index
+
+def test_tokenize():
+    assert tokenize("Write the Q3-report, now!") == ["write", "the", "q3", "report", "now"]
+    assert tokenize("会议报告") == ["会", "议", "报", "告"]
+    assert tokenize(None) == []
+
+def test_every_query_token_must_match():
+    index = make_index()
+    assert set(index.search("report")) == {"1", "2"}
+    assert set(index.search("quarterly report")) == {"1", "2"}
+    assert set(index.search("report milk")) == set()
+    assert set(index.search("MILK")) == {"3"}
+
+def test_prefix_matching_and_ranking():
+    index = make_index()
+    assert set(index.search("rep")) == {"1", "2"}
+    scores = index.search("quarterly")
+    # A title match outweighs a subtask match
+    assert scores["1"] > scores["2"]
+    # An exact token beats a longer token it is a prefix of
+    index.add("4", task("4", "Reports archive"))
+    scores = index.search("report")
+    assert scores["1"] > scores["4"]
+
+def test_mid_word_fragments_do_not_match():
+    index = make_index()
+    # Token search only matches from the start of a word (see search_tasks for the substring fallback)
+    assert index.search("port") == {}
+    assert index.search("roceries") == {}
+
+def test_update_and_remove():
+    index = make_index()
+    index.add("3", task("3", "Buy flowers"))
+    assert index.search("groceries") == {}
+    assert set(index.search("flowers")) == {"3"}
+    index.remove("1")
+    assert set(index.search("report")) == {"2"}
+    assert "1" not in index and len(index) == 2
+    index.remove("1")
+    index.clear()
+    assert index.search("review") == {} and len(index) == 0
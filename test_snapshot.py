@@ -0,0 +1,120 @@
+"""
+Offline tests of the on-disk snapshot and warm starts from it.
+"""
+
+import asyncio
+import threading
+
+from ticktick_mcp.src.cache import CachedTickTickClient
+from ticktick_mcp.src.json_backend import get_json_backend
+from ticktick_mcp.src.models import parse_project_data, parse_projects
+from ticktick_mcp.src.snapshot import SNAPSHOT_FILENAME, SnapshotStore
+
+from conftest import HOME, WORK, FakeClient, make_dataset
+
+def project_data(dataset, project_id):
+    project = next(project for project in dataset["projects"] if project["id"] == project_id)
+    return parse_project_data({"project": project, "tasks": dataset["tasks"][project_id]})
+
+def test_round_trip(tmp_path):
+    dataset = make_dataset()
+    store = SnapshotStore(str(tmp_path / "nested" / SNAPSHOT_FILENAME), get_json_backend("json"))
+    assert store.load() == (None, {})
+
+    projects = parse_projects(dataset["projects"])
+    store.save_projects(projects)
+    store.save_project_data(WORK, project_data(dataset, WORK))
+    store.save_project_data(HOME, project_data(dataset, HOME))
+    store.close()
+
+    store = SnapshotStore(str(tmp_path / "nested" / SNAPSHOT_FILENAME), get_json_backend("json"))
+    loaded_projects, loaded_data = store.load()
+    assert loaded_projects == projects
+    assert loaded_data == {WORK: project_data(dataset, WORK), HOME: project_data(dataset, HOME)}
+    # Fields the models don't know survive the round trip
+    assert loaded_data[WORK]["tasks"][0].to_dict()["tags"] == ["finance"]
+
+    store.delete_project_data(WORK)
+    assert set(store.load()[1]) == {HOME}
+    store.delete_projects()
+    assert store.load() == (None, {HOME: project_data(dataset, HOME)})
+    store.clear()
+    assert store.load() == (None, {})
+    store.close()
+
+def test_from_cache_dir(tmp_path):
+    store = SnapshotStore.from_cache_dir(str(tmp_path / "cache"))
+    assert store.path == tmp_path / "cache" / SNAPSHOT_FILENAME
+    assert store.path.exists()
+    store.close()
+
+def test_warm_start_answers_without_requests(tmp_path):
+    client = FakeClient()
+    store = SnapshotStore.from_cache_dir(str(tmp_path))
+    cached = CachedTickTickClient(client, ttl=60, snapshot=store)
+    assert not cached.load_snapshot()
+
+    asyncio.run(cached.refresh())
+    assert client.requests == ["projects", WORK, HOME]
+    store.close()
+
+    # A new process loads the snapshot into its cache and index
+    client = FakeClient()
+    warm = CachedTickTickClient(client, ttl=60, snapshot=SnapshotStore.from_cache_dir(str(tmp_path)))
+    assert warm.load_snapshot()
+    assert set(warm.index.search("quarterly")) == {"b00000000000000000000001"}
+
+    async def run():
+        projects = await warm.get_projects()
+        work = await warm.get_project_with_data(WORK)
+        return projects, work
+
+    projects, work = asyncio.run(run())
+    assert [project.name for project in projects] == ["Work", "Home", "Archive"]
+    assert [task.title for task in work["tasks"]] == [
+        "Write quarterly report", "Review pull requests", "Renew certificates"]
+    assert client.requests == []
+
+    # Invalidating a project removes it from the snapshot too
+    warm.invalidate_project(WORK)
+    warm.snapshot.flush()
+    assert set(warm.snapshot.load()[1]) == {HOME}
+    warm.snapshot.close()
+
+def test_cache_writes_run_in_order_on_the_writer_thread(tmp_path, monkeypatch):
+    store = SnapshotStore.from_cache_dir(str(tmp_path))
+    writes = []
+    save = store.save_project_data
+
+    def save_recording(project_id, project_data):
+        writes.append(threading.current_thread().name)
+        save(project_id, project_data)
+
+    monkeypatch.setattr(store, "save_project_data", save_recording)
+    client = FakeClient()
+    cached = CachedTickTickClient(client, ttl=60, snapshot=store)
+
+    async def run():
+        await cached.get_project_with_data(WORK)
+        cached.invalidate_project(WORK)
+        await cached.get_project_with_data(HOME)
+
+    asyncio.run(run())
+    store.flush()
+    assert len(writes) == 2
+    assert all(name.startswith("ticktick-snapshot") for name in writes)
+    # The delete of WORK ran after its save
+    assert set(store.load()[1]) == {HOME}
+    store.close()
+
+def test_failed_write_is_logged(tmp_path, caplog):
+    store = SnapshotStore.from_cache_dir(str(tmp_path))
+
+    def fail():
+        raise OSError("disk full")
+
+    store.submit(fail).result()
+    assert "Failed to write snapshot: disk full" in caplog.text
+    store.save_projects([])
+    assert store.load() == ([], {})
+    store.close()
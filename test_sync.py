@@ -0,0 +1,82 @@
+"""
+Offline tests of the background sync daemon.
+"""
+
+import asyncio
+
+from ticktick_mcp.src.cache import CachedTickTickClient
+from ticktick_mcp.src.sync import SyncDaemon
+
+from conftest import HOME, WORK, FakeClient
+
+def make_daemon(interval=60):
+    client = FakeClient()
+    cache = CachedTickTickClient(client, ttl=30)
+    return client, cache, SyncDaemon(cache, interval=interval, jitter=0)
+
+def test_sync_fills_the_cache():
+    client, cache, daemon = make_daemon()
+    assert asyncio.run(daemon.sync_once())
+    assert daemon.syncs == 1 and daemon.last_sync is not None
+    # Closed projects aren't fetched
+    assert client.requests == ["projects", WORK, HOME]
+    assert cache.index.project_ids() == {WORK, HOME}
+    # Entries outlive the cache TTL until the next sync is due
+    assert daemon.entry_ttl == 120
+    assert asyncio.run(cache.get_project_with_data(WORK))["tasks"][0].title == "Write quarterly report"
+    assert client.requests == ["projects", WORK, HOME]
+
+def test_sync_applies_only_what_changed():
+    client, cache, daemon = make_daemon()
+    asyncio.run(daemon.sync_once())
+    unchanged = cache.index.get("b00000000000000000000002")
+
+    work = client.dataset["tasks"][WORK]
+    work[0] = dict(work[0], title="Write annual report")
+    del work[2]
+    client.dataset["tasks"][HOME].append(
+        {"id": "b00000000000000000000007", "projectId": HOME, "title": "Water the plants", "priority": 1})
+    asyncio.run(daemon.sync_once())
+
+    assert set(cache.index.search("annual")) == {"b00000000000000000000001"}
+    assert not cache.index.search("quarterly")
+    assert "b00000000000000000000003" not in cache.index
+    assert set(cache.index.search("plants")) == {"b00000000000000000000007"}
+    # Unchanged tasks keep their record
+    assert cache.index.get("b00000000000000000000002") is unchanged
+
+def test_sync_forgets_closed_projects():
+    client, cache, daemon = make_daemon()
+    asyncio.run(daemon.sync_once())
+    client.dataset["projects"][1] = dict(client.dataset["projects"][1], closed=True)
+    asyncio.run(daemon.sync_once())
+    assert cache.index.project_ids() == {WORK}
+    assert HOME not in cache.project_data_cache
+
+def test_sync_skips_projects_written_to_meanwhile():
+    client, cache, daemon = make_daemon()
+    fetch = client.get_project_with_data
+
+    async def fetch_during_write(project_id):
+        project_data = await fetch(project_id)
+        # A tool writes to the account while the sync is fetching
+        cache.invalidate_project(project_id)
+        return project_data
+
+    client.get_project_with_data = fetch_during_write
+    asyncio.run(daemon.sync_once())
+    assert not cache.index.project_ids()
+
+def test_failed_sync_keeps_the_cache():
+    client, cache, daemon = make_daemon()
+    asyncio.run(daemon.sync_once())
+    client.error = {"error": "TickTick API is unavailable", "status_code": 503}
+    assert not asyncio.run(daemon.sync_once())
+    assert daemon.syncs == 1
+    assert cache.index.project_ids() == {WORK, HOME}
+
+def test_disabled_daemon_returns_at_once():
+    client, cache, daemon = make_daemon(interval=0)
+    assert not daemon.enabled
+    asyncio.run(daemon.run())
+    assert client.requests == []
@@ -0,0 +1,125 @@
+"""
+Offline tests of token refresh and of the .env file the tokens are saved to.
+"""
+
+import time
+import asyncio
+import threading
+
+import httpx
+
+from ticktick_mcp.src import ticktick_client
+from ticktick_mcp.src.async_client import AsyncTickTickClient
+from ticktick_mcp.src.auth import TickTickAuth
+from ticktick_mcp.src.env_file import update_env_file
+
+def read_env(path):
+    return dict(line.rstrip("\n").split("=", 1) for line in open(path) if "=" in line)
+
+def test_update_env_file(tmp_path):
+    env_path = tmp_path / ".env"
+    env_path.write_text("# comment\nTICKTICK_CLIENT_ID=id\nTICKTICK_ACCESS_TOKEN=old\n")
+    env_path.chmod(0o600)
+
+    update_env_file({"TICKTICK_ACCESS_TOKEN": "new"},
+                    {"TICKTICK_CLIENT_ID": "other", "TICKTICK_CLIENT_SECRET": "secret"}, env_path)
+    assert read_env(env_path) == {"TICKTICK_CLIENT_ID": "id", "TICKTICK_ACCESS_TOKEN": "new",
+                                  "TICKTICK_CLIENT_SECRET": "secret"}
+    assert env_path.stat().st_mode & 0o777 == 0o600
+    # The file is replaced atomically, leaving no temporary file behind
+    assert [path.name for path in tmp_path.iterdir()] == [".env"]
+
+def test_auth_clears_expiry_without_expires_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text("TICKTICK_ACCESS_TOKEN=old\nTICKTICK_TOKEN_EXPIRES_AT=1700000000\n")
+    auth = TickTickAuth(client_id="id", client_secret="secret")
+
+    auth.tokens = {"access_token": "new", "refresh_token": "refresh"}
+    auth._save_tokens_to_env()
+    env = read_env(tmp_path / ".env")
+    assert env["TICKTICK_ACCESS_TOKEN"] == "new"
+    assert env["TICKTICK_TOKEN_EXPIRES_AT"] == "0"
+
+    auth.tokens = {"access_token": "newer", "expires_in": 3600}
+    auth._save_tokens_to_env()
+    expires_at = int(read_env(tmp_path / ".env")["TICKTICK_TOKEN_EXPIRES_AT"])
+    assert abs(expires_at - (time.time() + 3600)) < 5
+
+class TokenServer:
+    """httpx transport answering the token endpoint and GET /project, counting requests."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.refreshes = 0
+        self.authorizations = []
+
+    def handle(self, request):
+        if request.url.path == "/oauth/token":
+            self.refreshes += 1
+            return httpx.Response(200, json=self.tokens)
+        self.authorizations.append(request.headers["Authorization"])
+        return httpx.Response(200, json=[])
+
+def make_client(monkeypatch, server, expires_at):
+    monkeypatch.setenv("TICKTICK_BASE_URL", "https://api.test/open/v1")
+    monkeypatch.setenv("TICKTICK_TOKEN_URL", "https://auth.test/oauth/token")
+    monkeypatch.setenv("TICKTICK_CLIENT_ID", "id")
+    monkeypatch.setenv("TICKTICK_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("TICKTICK_ACCESS_TOKEN", "old")
+    monkeypatch.setenv("TICKTICK_REFRESH_TOKEN", "refresh")
+    monkeypatch.setenv("TICKTICK_TOKEN_EXPIRES_AT", str(expires_at))
+    client = AsyncTickTickClient()
+
+    def get_session():
+        loop = asyncio.get_running_loop()
+        if client._session_loop is not loop:
+            client._session = httpx.AsyncClient(transport=httpx.MockTransport(server.handle))
+            client._session_loop = loop
+            client._in_flight = {}
+            client._refresh_lock = asyncio.Lock()
+        return client._session
+
+    client._get_session = get_session
+    return client
+
+def test_async_refresh_saves_tokens_off_the_event_loop(monkeypatch):
+    saves = []
+
+    def save(updates, defaults=None):
+        saves.append((updates, threading.current_thread() is threading.main_thread()))
+
+    monkeypatch.setattr(ticktick_client, "update_env_file", save)
+    server = TokenServer({"access_token": "new"})
+    client = make_client(monkeypatch, server, int(time.time()) + 3600)
+
+    async def run():
+        try:
+            return await client._refresh_access_token(stale_token="old")
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run())
+    assert client.access_token == "new"
+    # The response has no expires_in, so the old expiry is forgotten
+    assert client.token_expires_at is None
+    (updates, on_main_thread), = saves
+    assert not on_main_thread
+    assert updates["TICKTICK_ACCESS_TOKEN"] == "new"
+    assert updates["TICKTICK_TOKEN_EXPIRES_AT"] == "0"
+
+def test_token_is_refreshed_once_before_it_expires(monkeypatch):
+    monkeypatch.setattr(ticktick_client, "update_env_file", lambda updates, defaults=None: None)
+    server = TokenServer({"access_token": "new", "refresh_token": "refresh2", "expires_in": 3600})
+    client = make_client(monkeypatch, server, int(time.time()) + 10)
+
+    async def run():
+        try:
+            return await asyncio.gather(*(client.get_project(f"p{i}") for i in range(5)))
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
+    assert server.refreshes == 1
+    assert server.authorizations == ["Bearer new"] * 5
+    assert client.refresh_token == "refresh2"
+    assert client.token_expires_at > time.time() + 3000
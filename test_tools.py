@@ -0,0 +1,137 @@
+"""
+Offline tests of the MCP tools, run against the mock API (see conftest.py).
+"""
+
+import json
+import asyncio
+
+from conftest import HOME, WORK
+
+def test_tasks_by_priority(server):
+    result = asyncio.run(server.get_tasks_by_priority(5))
+    assert "Write quarterly report" in result
+    assert "Book dentist appointment" in result
+    # Tasks of closed projects are left out
+    assert "Old report" not in result
+    assert "Review pull requests" not in result
+
+def test_invalid_priority_lists_codes(server):
+    result = asyncio.run(server.get_tasks_by_priority(2))
+    assert result == "Invalid priority_id. Valid values: [0, 1, 3, 5]"
+
+def test_task_json_shape(server, mock_api):
+    task = mock_api.tasks[HOME]["b00000000000000000000004"]
+    result = json.loads(asyncio.run(server.get_task(HOME, task["id"], output_format="json")))
+    # API field names, defaults for the fields the API left out, nulls dropped
+    assert result == {
+        "id": "b00000000000000000000004", "projectId": HOME, "title": "Buy groceries",
+        "content": "Milk and bread", "isAllDay": False, "reminders": [], "priority": 0, "status": 0,
+        "sortOrder": 0, "items": [],
+    }
+
+def test_task_json_keeps_unknown_fields(server, mock_api):
+    result = json.loads(asyncio.run(server.get_task(WORK, "b00000000000000000000001", output_format="json")))
+    assert result["tags"] == ["finance"]
+    assert result["columnId"] == "c1"
+    assert result["kind"] == "TEXT"
+    assert result["dueDate"] == mock_api.tasks[WORK]["b00000000000000000000001"]["dueDate"]
+
+def test_project_tasks_json_and_compact(server):
+    result = json.loads(asyncio.run(server.get_project_tasks(HOME, output_format="json")))
+    assert result["project"] == {"id": HOME, "name": "Home", "sortOrder": 1024, "closed": False,
+                                 "viewMode": "list", "kind": "TASK"}
+    assert [task["title"] for task in result["tasks"]] == ["Buy groceries", "Book dentist appointment"]
+
+    result = json.loads(asyncio.run(server.get_project_tasks(HOME, output_format="compact")))
+    assert result["project_id"] == HOME
+    assert result["id"] == ["b00000000000000000000004", "b00000000000000000000005"]
+    assert result["title"] == ["Buy groceries", "Book dentist appointment"]
+    assert result["due"][0] is None and isinstance(result["due"][1], int)
+    assert result["priority"] == [0, 5]
+
+def test_filter_json_fields(server):
+    result = json.loads(asyncio.run(server.get_tasks_by_priority(5, fields=["id", "title"], output_format="json")))
+    assert result["total"] == 2
+    assert result["projects"] == {WORK: "Work", HOME: "Home"}
+    assert result["tasks"] == [
+        {"id": "b00000000000000000000001", "title": "Write quarterly report"},
+        {"id": "b00000000000000000000005", "title": "Book dentist appointment"},
+    ]
+
+def test_invalid_output_format(server):
+    assert asyncio.run(server.get_projects(output_format="xml")).startswith("Invalid output_format: xml.")
+
+def test_filters_cover_projects_evicted_from_the_cache(server, monkeypatch):
+    # A cache smaller than the account evicts a project while the others are fetched
+    monkeypatch.setenv("TICKTICK_CACHE_MAX_PROJECTS", "1")
+    result = asyncio.run(server.get_tasks_by_priority(5))
+    assert "Write quarterly report" in result
+    assert "Book dentist appointment" in result
+    result = asyncio.run(server.search_tasks("dentist"))
+    assert "Book dentist appointment" in result
+
+def test_unknown_account(server, monkeypatch):
+    monkeypatch.setenv("TICKTICK_ACCOUNTS", "work")
+    result = asyncio.run(server.get_projects(account="personal"))
+    assert result == "Unknown account 'personal'; configured accounts: default, work"
+    assert "personal" not in server.accounts
+
+def test_search_matches_word_prefixes(server):
+    result = asyncio.run(server.search_tasks("rev pull"))
+    assert "Review pull requests" in result
+    assert "Write quarterly report" not in result
+    # Subtask titles are searched too
+    assert "Review pull requests" in asyncio.run(server.search_tasks("changelog"))
+
+def test_search_falls_back_to_substrings(server):
+    # "port" is only in the middle of "report", so no word starts with it
+    result = asyncio.run(server.search_tasks("port"))
+    assert "Write quarterly report" in result
+    assert "Buy groceries" not in result
+    assert "Write quarterly report" not in asyncio.run(server.search_tasks("xyzzy"))
+
+def test_paging_json(server):
+    async def page(offset, limit=2):
+        return json.loads(await server.get_all_tasks(limit=limit, offset=offset, fields=["id"], output_format="json"))
+
+    # Tasks of open projects only, in project then task order
+    first = asyncio.run(page(0))
+    assert first["total"] == 5
+    assert [task["id"] for task in first["tasks"]] == ["b00000000000000000000001", "b00000000000000000000002"]
+    assert first["next_offset"] == 2
+    assert first["projects"] == {WORK: "Work"}
+
+    second = asyncio.run(page(2))
+    assert [task["id"] for task in second["tasks"]] == ["b00000000000000000000003", "b00000000000000000000004"]
+    assert second["next_offset"] == 4
+
+    # The last page ends exactly at the total: no next_offset
+    last = asyncio.run(page(4))
+    assert [task["id"] for task in last["tasks"]] == ["b00000000000000000000005"]
+    assert "next_offset" not in last
+    assert "next_offset" not in asyncio.run(page(3, limit=2))
+
+    for offset in (5, 50):
+        beyond = asyncio.run(page(offset))
+        assert beyond["total"] == 5 and beyond["offset"] == offset
+        assert beyond["tasks"] == [] and "next_offset" not in beyond
+
+def test_paging_text(server):
+    result = asyncio.run(server.get_tasks_by_priority(5, limit=1))
+    assert result.startswith("Showing tasks 1-1 of 2 tasks")
+    assert "Write quarterly report" in result
+    assert "Call again with offset=1" in result
+
+    result = asyncio.run(server.get_tasks_by_priority(5, limit=1, offset=1))
+    assert result.startswith("Showing tasks 2-2 of 2 tasks")
+    assert "Book dentist appointment" in result
+    assert "Call again" not in result
+
+    result = asyncio.run(server.get_tasks_by_priority(5, offset=2))
+    assert result.startswith("No tasks that are to be")
+    assert "at offset 2 (2 tasks in total)" in result
+
+def test_invalid_paging(server):
+    assert asyncio.run(server.get_all_tasks(limit=0)) == "limit must be a positive integer."
+    assert asyncio.run(server.get_all_tasks(offset=-1)) == "offset must be a non-negative integer."
+    assert asyncio.run(server.get_all_tasks(fields=["owner"])).startswith("Unknown fields: owner.")
@@ -10,7 +10,7 @@ import logging
 from pathlib import Path
 from dotenv import load_dotenv
 
-from .src.server import main as server_main
+from .src.server import main as server_main, TRANSPORTS
 from .authenticate import main as auth_main
 
 
@@ -34,8 +34,27 @@ def main():
     run_parser.add_argument(
         "--transport", 
         default="stdio", 
-        choices=["stdio"], 
-        help="Transport type (currently only stdio is supported)"
+        choices=TRANSPORTS, 
+        help="Transport type: stdio for a single client, sse or streamable-http to share one server between many clients"
+    )
+    run_parser.add_argument(
+        "--host",
+        help="Interface the HTTP transports listen on (default: 127.0.0.1)"
+    )
+    run_parser.add_argument(
+        "--port",
+        type=int,
+        help="Port the HTTP transports listen on (default: 8000)"
+    )
+    run_parser.add_argument(
+        "--limit-concurrency",
+        type=int,
+        help="Maximum number of concurrent HTTP connections and requests before answering 503 (default: unlimited)"
+    )
+    run_parser.add_argument(
+        "--allowed-hosts",
+        help="Comma-separated host names, besides localhost and --host, that HTTP clients connect with "
+             "(DNS rebinding protection rejects any other Host header)"
     )
     
     # 'auth' command for authentication
@@ -86,7 +105,13 @@ Run 'uv run -m ticktick_mcp.cli auth' to set up authentication later.
         
         # Start the server
         try:
-            server_main()
+            server_main(
+                transport=getattr(args, "transport", "stdio"),
+                host=getattr(args, "host", None),
+                port=getattr(args, "port", None),
+                limit_concurrency=getattr(args, "limit_concurrency", None),
+                allowed_hosts=args.allowed_hosts.split(",") if getattr(args, "allowed_hosts", None) else None
+            )
         except KeyboardInterrupt:
             print("Server stopped by user", file=sys.stderr)
             sys.exit(0)
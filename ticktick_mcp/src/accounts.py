@@ -0,0 +1,114 @@
+"""
+Registry of the TickTick accounts served by one MCP server.
+
+Every account has its own tokens, read from environment variables with an
+account-specific prefix, and gets its own client with its own connection
+pool, cache and concurrency limit. Clients are created on first use.
+"""
+
+import os
+import re
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# The account configured with the unprefixed TICKTICK_ variables
+DEFAULT_ACCOUNT = "default"
+
+def account_env_prefix(account: str) -> str:
+    """
+    Get the prefix of the environment variables of an account.
+
+    The default account uses TICKTICK_ACCESS_TOKEN and so on; an account named
+    "work" uses TICKTICK_WORK_ACCESS_TOKEN.
+    """
+    if account == DEFAULT_ACCOUNT:
+        return "TICKTICK_"
+    return f"TICKTICK_{re.sub(r'[^A-Z0-9]', '_', account.upper())}_"
+
+def configured_accounts() -> List[str]:
+    """
+    Get the names of the configured accounts.
+
+    These are the default account, if TICKTICK_ACCESS_TOKEN is set, followed by
+    the comma-separated names in TICKTICK_ACCOUNTS.
+    """
+    names = [DEFAULT_ACCOUNT] if os.getenv("TICKTICK_ACCESS_TOKEN") else []
+    for name in os.getenv("TICKTICK_ACCOUNTS", "").split(","):
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+class AccountRegistry(Generic[T]):
+    """
+    Keeps one client per account, creating it on first use.
+
+    Concurrent first requests for the same account wait for a single creation.
+    Creations that fail are not remembered, so the next request tries again.
+    Names that aren't configured (see configured_accounts) are rejected before
+    anything is created or remembered for them.
+    """
+
+    def __init__(self, create: Callable[[str], Awaitable[Optional[T]]]):
+        """
+        Args:
+            create: Coroutine function building the client of an account,
+                returning None if it can't be initialized
+        """
+        self._create = create
+        self._clients: Dict[str, T] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def __contains__(self, account: str) -> bool:
+        return account in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def items(self) -> List[Tuple[str, T]]:
+        """Get (account, client) pairs for the accounts initialized so far."""
+        return list(self._clients.items())
+
+    async def get(self, account: Optional[str] = None) -> Optional[T]:
+        """
+        Get the client of an account, creating it if needed.
+
+        Args:
+            account: Name of the account (the default account if not given)
+
+        Returns:
+            The client, or None if the account is unknown or its client couldn't be initialized
+        """
+        account = account or DEFAULT_ACCOUNT
+        client = self._clients.get(account)
+        if client is not None:
+            return client
+
+        # The default account reports its own missing token when created
+        if account != DEFAULT_ACCOUNT and account not in configured_accounts():
+            logger.error(f"Unknown account '{account}'. Add it to TICKTICK_ACCOUNTS and set "
+                         f"{account_env_prefix(account)}ACCESS_TOKEN.")
+            return None
+
+        lock = self._locks.setdefault(account, asyncio.Lock())
+        async with lock:
+            client = self._clients.get(account)
+            if client is None:
+                client = await self._create(account)
+                if client is not None:
+                    self._clients[account] = client
+            return client
+
+    def remove(self, account: str) -> Optional[T]:
+        """Forget the client of an account, returning it."""
+        return self._clients.pop(account, None)
+
+    def clear(self) -> None:
+        """Forget every client."""
+        self._clients.clear()
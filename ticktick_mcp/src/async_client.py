@@ -0,0 +1,270 @@
+import time
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from .retry import RetryPolicy
+from .ticktick_client import TickTickClient, error_response, parse_retry_after
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class AsyncTickTickClient(TickTickClient):
+    """
+    Asynchronous client for the TickTick API.
+
+    Exposes the same methods as TickTickClient (get_projects, get_project_with_data,
+    create_task, ...), but each of them returns a coroutine. Requests go through a
+    pooled httpx.AsyncClient so connections are kept alive and reused between calls,
+    and concurrent calls overlap instead of blocking the event loop.
+
+    Identical GET requests that are in flight at the same time are coalesced: the
+    first one goes to the API and the others wait for it and share its parsed
+    result (the same object, which callers must not modify). Any write ends the
+    coalescing of the GETs already in flight, so a GET issued after a write never
+    receives data fetched before it.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, pool_max_per_host: Optional[int] = None,
+                 keepalive_timeout: Optional[float] = None, access_token: Optional[str] = None,
+                 refresh_token: Optional[str] = None, env_prefix: str = "TICKTICK_",
+                 retry_policy: Optional[RetryPolicy] = None):
+        super().__init__(pool_size=pool_size, pool_max_per_host=pool_max_per_host,
+                         keepalive_timeout=keepalive_timeout, access_token=access_token,
+                         refresh_token=refresh_token, env_prefix=env_prefix, retry_policy=retry_policy)
+        # httpx has no per-host connection limit, but the client only talks to the
+        # API host, so the per-host limit caps the idle connections kept alive
+        self.limits = httpx.Limits(
+            max_connections=self.pool_size,
+            max_keepalive_connections=min(self.pool_size, self.pool_max_per_host),
+            keepalive_expiry=self.keepalive_timeout
+        )
+        self.timeout = httpx.Timeout(self.retry_policy.read_timeout, connect=self.retry_policy.connect_timeout)
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced_requests = 0
+
+    def _get_session(self) -> httpx.AsyncClient:
+        """
+        Get the pooled HTTP session, creating it on first use.
+
+        Pooled connections belong to the event loop they were opened on, so a new
+        session is created if the client is used from a different loop (for example
+        the startup check in main() runs before the MCP server starts its own loop).
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session_loop is not loop:
+            self._session = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._session_loop = loop
+            # Requests in flight and locks held on another loop can't be awaited from this one
+            self._in_flight = {}
+            self._refresh_lock = asyncio.Lock()
+        return self._session
+
+    def close(self) -> None:
+        """
+        Not supported: the async session can only be closed from a coroutine.
+
+        Raises:
+            TypeError: Always; use aclose instead
+        """
+        raise TypeError("AsyncTickTickClient must be closed with 'await client.aclose()'")
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session."""
+        if self._session is not None:
+            await self._session.aclose()
+            self._session = None
+            self._session_loop = None
+
+    async def _refresh_access_token(self, stale_token: Optional[str] = None) -> bool:
+        """
+        Refresh the access token using the refresh token.
+
+        Args:
+            stale_token: The access token the caller found expired; if another caller
+                has replaced it in the meantime, its token is used instead of refreshing again
+
+        Returns:
+            True if successful, False otherwise
+        """
+        self._get_session()
+        async with self._refresh_lock:
+            if self._token_refreshed_since(stale_token):
+                return True
+            return await self._send_refresh_request()
+
+    async def _send_refresh_request(self) -> bool:
+        """Send the refresh token request and apply the new tokens."""
+        refresh_request = self._build_refresh_request()
+        if refresh_request is None:
+            return False
+        token_data, headers = refresh_request
+
+        try:
+            # Send the token request
+            response = await self._get_session().post(self.token_url, data=token_data, headers=headers)
+            response.raise_for_status()
+
+            # Use the new tokens right away; writing .env (with an fsync) happens off the event loop
+            tokens = response.json()
+            self._use_tokens(tokens)
+            await asyncio.to_thread(self._save_tokens_to_env, tokens)
+            logger.info("Access token refreshed successfully.")
+            return True
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error refreshing access token: {e}")
+            return False
+
+    async def _make_request(self, method: str, endpoint: str, data=None, parse: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Makes a request to the TickTick API, coalescing identical concurrent GETs.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            endpoint: API endpoint (without base URL)
+            data: Request data (for POST, PUT)
+            parse: Function that turns the JSON of a successful response into models
+
+        Returns:
+            API response, parsed with parse if given, or an error dictionary
+        """
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        if method != "GET":
+            self._in_flight.clear()
+            return await self._send_request(method, endpoint, data, parse)
+
+        self._get_session()
+        in_flight = self._in_flight.get(endpoint)
+        if in_flight is None:
+            in_flight = asyncio.ensure_future(self._send_request(method, endpoint, parse=parse))
+            self._in_flight[endpoint] = in_flight
+
+            def forget(future: asyncio.Future) -> None:
+                if self._in_flight.get(endpoint) is future:
+                    del self._in_flight[endpoint]
+
+            in_flight.add_done_callback(forget)
+        else:
+            self.coalesced_requests += 1
+            logger.debug(f"Coalesced GET {endpoint} with the request in flight")
+
+        # Shielded so that a cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(in_flight)
+
+    async def _send_request(self, method: str, endpoint: str, data=None,
+                            parse: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        Sends a request to the TickTick API, retrying failed attempts according to the retry policy.
+
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API endpoint (without base URL)
+            data: Request data (for POST)
+            parse: Function that turns the JSON of a successful response into models
+
+        Returns:
+            API response, parsed with parse if given, or an error dictionary
+        """
+        url = f"{self.base_url}{endpoint}"
+        session = self._get_session()
+
+        # Refresh the access token before it expires rather than after a 401
+        if self._token_needs_refresh():
+            logger.info("Access token is about to expire. Refreshing...")
+            if not await self._refresh_access_token(stale_token=self.access_token):
+                # Don't try again before every request; fall back to refreshing on 401
+                self.token_expires_at = None
+
+        # Encoded once, not on every attempt
+        body = self.json_backend.dumps(data) if method == "POST" and data is not None else None
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.circuit_breaker.allow_request():
+                logger.warning(f"Not sending {method} {endpoint}: the circuit is open")
+                self.metrics.record(method, endpoint, "circuit_open")
+                return self.circuit_breaker.open_response()
+
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            start = time.perf_counter()
+            try:
+                response = await self._send(session, method, url, body)
+            except httpx.TransportError as e:
+                # No response: the API or the network failed
+                self.metrics.record(method, endpoint, "error", time.perf_counter() - start)
+                self.circuit_breaker.record_failure()
+                delay = self.retry_policy.retry_delay(
+                    method, attempt, sent=not isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                )
+                if delay is None:
+                    result = error_response(e)
+                    logger.error(f"API request failed: {result['error']}")
+                    return result
+            except httpx.HTTPError as e:
+                logger.error(f"API request failed: {e}")
+                return error_response(e)
+            else:
+                self.metrics.record(method, endpoint, response.status_code, time.perf_counter() - start,
+                                    len(response.content))
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    self.rate_limiter.throttle(retry_after or self.retry_policy.base_delay)
+                delay = self.retry_policy.retry_delay(
+                    method, attempt, response.status_code, retry_after
+                ) if response.status_code >= 400 else None
+                if delay is None:
+                    return self._parse_response(response, parse)
+
+            self.metrics.record_retry(method, endpoint)
+            logger.warning(f"{method} {endpoint} failed (attempt {attempt}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+    async def _send(self, session: httpx.AsyncClient, method: str, url: str, body: Optional[bytes] = None) -> httpx.Response:
+        """
+        Send a request once, refreshing the access token and resending it if it is rejected with 401.
+
+        Raises:
+            httpx.HTTPError: If no response was received
+        """
+        token = self.access_token
+        response = await session.request(method, url, headers=self.headers, content=body)
+
+        # Check if the request was unauthorized (401)
+        if response.status_code == 401:
+            logger.info("Access token expired. Attempting to refresh...")
+
+            # Try to refresh the access token and retry the request with the new token
+            if await self._refresh_access_token(stale_token=token):
+                response = await session.request(method, url, headers=self.headers, content=body)
+        return response
+
+    def _parse_response(self, response: httpx.Response, parse: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Get the result of a request from its final response, parsed with parse if it succeeded."""
+        try:
+            # Raise an exception for 4xx/5xx status codes
+            response.raise_for_status()
+
+            # Return empty dict for 204 No Content
+            if response.status_code == 204 or not response.content:
+                return {}
+
+            return self.json_backend.decode(response.content, parse)
+        except httpx.HTTPStatusError as e:
+            logger.error(f"API request failed: {e}")
+            return error_response(e, e.response.status_code, e.response.headers)
+        except ValueError as e:
+            logger.error(f"Invalid JSON in API response: {e}")
+            return error_response(e, response.status_code)
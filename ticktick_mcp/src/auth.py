@@ -15,11 +15,12 @@ import http.server
 import socketserver
 import urllib.parse
 import requests
-from pathlib import Path
 from typing import Dict, Optional, Tuple, Any
 from dotenv import load_dotenv
 import logging
 
+from .env_file import update_env_file
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
@@ -315,34 +316,22 @@ class TickTickAuth:
         if not self.tokens:
             return
         
-        # Load existing .env file content
-        env_path = Path('.env')
-        env_content = {}
-        
-        if env_path.exists():
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_content[key] = value
-        
-        # Update with new tokens
-        env_content["TICKTICK_ACCESS_TOKEN"] = self.tokens.get('access_token', '')
+        updates = {"TICKTICK_ACCESS_TOKEN": self.tokens.get('access_token', '')}
         if 'refresh_token' in self.tokens:
-            env_content["TICKTICK_REFRESH_TOKEN"] = self.tokens.get('refresh_token', '')
-        
+            updates["TICKTICK_REFRESH_TOKEN"] = self.tokens.get('refresh_token', '')
+        # 0 when the response doesn't say, so an expiry time saved for an older token isn't kept
+        expires_in = self.tokens.get('expires_in')
+        updates["TICKTICK_TOKEN_EXPIRES_AT"] = str(int(time.time() + float(expires_in))) if expires_in else "0"
+
         # Make sure client credentials are saved as well
-        if self.client_id and "TICKTICK_CLIENT_ID" not in env_content:
-            env_content["TICKTICK_CLIENT_ID"] = self.client_id
-        if self.client_secret and "TICKTICK_CLIENT_SECRET" not in env_content:
-            env_content["TICKTICK_CLIENT_SECRET"] = self.client_secret
-        
-        # Write back to .env file
-        with open(env_path, 'w') as f:
-            for key, value in env_content.items():
-                f.write(f"{key}={value}\n")
-        
+        defaults = {}
+        if self.client_id:
+            defaults["TICKTICK_CLIENT_ID"] = self.client_id
+        if self.client_secret:
+            defaults["TICKTICK_CLIENT_SECRET"] = self.client_secret
+
+        update_env_file(updates, defaults)
+
         logger.info("Tokens saved to .env file")
 
 def setup_auth_cli():
@@ -0,0 +1,437 @@
+"""
+In-process caching for the TickTick MCP server.
+
+CachedTickTickClient sits in front of an AsyncTickTickClient and keeps the
+project list and each project's task data in memory, so repeated queries
+from an agent don't download every project again. Methods that change a
+project invalidate the cached entries for that project. Entries hold the
+Task and Project models the client parses responses into. The cache can be
+backed by an on-disk SnapshotStore so that the server starts warm, and keeps
+a TaskIndex over every project payload it has fetched.
+"""
+
+import os
+import time
+import logging
+import contextlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set
+
+from .concurrency import bounded_gather, DEFAULT_MAX_CONCURRENCY
+from .index import TaskIndex
+from .models import Project, Task
+from .retry import is_unavailable
+from .snapshot import SnapshotStore
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 60.0
+DEFAULT_CACHE_MAX_PROJECTS = 256
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    A least-recently-used cache whose entries expire after a time to live.
+
+    Expired entries are kept until they are replaced or evicted, so that they
+    can still be served, with allow_stale, when fresh data can't be fetched.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_MAX_PROJECTS, ttl: float = DEFAULT_CACHE_TTL,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        """
+        Args:
+            max_size: Maximum number of entries; the least recently used entry is evicted first
+            ttl: Default time to live of an entry in seconds (0 disables caching)
+            on_evict: Called with the key and value of every entry evicted to make room
+                (not of entries that are invalidated, replaced or cleared)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None, allow_stale: bool = False) -> Any:
+        """Get a value if it is cached and has not expired (or, with allow_stale, even if it has)."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic() and not allow_stale:
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value, evicting the least recently used entries if the cache is full."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            evicted_key, (_, evicted_value) = self._entries.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(evicted_key, evicted_value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a value from the cache."""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all values from the cache."""
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class CachedTickTickClient:
+    """
+    Caching layer in front of an AsyncTickTickClient.
+
+    get_projects and get_project_with_data are served from memory while their
+    entries are fresh, and every fetched project payload is added to a TaskIndex
+    (the index attribute) for fast cross-project queries. create_task,
+    update_task, complete_task, delete_task, create_subtask, create_project,
+    update_project and delete_project pass through to the API and invalidate the
+    cached entries of the project they change; inside deferred_invalidation,
+    each changed project is invalidated once when the block exits. Data whose
+    fetch overlapped such an invalidation is returned to the caller but not
+    cached, since it may predate the write. Any other attribute is looked up
+    on the wrapped client.
+
+    When the API is unavailable (the circuit breaker is open, the network
+    fails or the API answers 5xx or 429), reads fall back to expired entries,
+    so tools keep answering from the last data fetched during an outage.
+    """
+
+    PROJECTS_KEY = "projects"
+
+    def __init__(self, client, ttl: Optional[float] = None, max_projects: Optional[int] = None,
+                 snapshot: Optional[SnapshotStore] = None):
+        """
+        Args:
+            client: The AsyncTickTickClient to cache
+            ttl: Seconds an entry stays fresh (defaults to TICKTICK_CACHE_TTL, 0 disables caching)
+            max_projects: Maximum number of cached project payloads (defaults to TICKTICK_CACHE_MAX_PROJECTS)
+            snapshot: Optional on-disk store that fetched data is also saved to, on its writer thread
+        """
+        if ttl is None:
+            ttl = float(os.getenv("TICKTICK_CACHE_TTL", DEFAULT_CACHE_TTL))
+        if max_projects is None:
+            max_projects = int(os.getenv("TICKTICK_CACHE_MAX_PROJECTS", DEFAULT_CACHE_MAX_PROJECTS))
+
+        self.client = client
+        self.projects_cache = TTLCache(max_size=1, ttl=ttl)
+        # Tasks of project payloads evicted from the cache are dropped from the index too
+        self.project_data_cache = TTLCache(max_size=max_projects, ttl=ttl,
+                                           on_evict=lambda project_id, _: self.index.remove_project(project_id))
+        self.snapshot = snapshot
+        self.index = TaskIndex()
+        # Incremented whenever cached data is invalidated, so that reads and
+        # background syncs can tell that a write happened while they were fetching
+        self.version = 0
+        self._deferred_project_ids: Optional[Set[str]] = None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def _store_projects(self, projects: List[Project]) -> None:
+        """Cache the project list and save it to the snapshot."""
+        self.projects_cache.set(self.PROJECTS_KEY, projects)
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.save_projects, projects)
+
+    def _store_project_data(self, project_id: str, project_data: Dict) -> None:
+        """Cache and index the data of a project and save it to the snapshot."""
+        self.project_data_cache.set(project_id, project_data)
+        self.index.update_project(project_id, project_data.get('tasks', []))
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.save_project_data, project_id, project_data)
+
+    def _stale(self, cache: TTLCache, key: Hashable, error: Dict) -> Any:
+        """Get an expired entry to answer with instead of an error, or the error if there is none."""
+        stale = cache.get(key, allow_stale=True)
+        if stale is None:
+            return error
+        logger.warning(f"Serving expired cache entry {key!r}: {error['error']}")
+        return stale
+
+    def invalidate_project(self, project_id: str) -> None:
+        """Drop the cached data of a project."""
+        if self._deferred_project_ids is not None:
+            self._deferred_project_ids.add(project_id)
+            return
+
+        self.version += 1
+        self.project_data_cache.invalidate(project_id)
+        self.index.remove_project(project_id)
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.delete_project_data, project_id)
+
+    @contextlib.contextmanager
+    def deferred_invalidation(self) -> Iterator[None]:
+        """
+        Collect the projects invalidated inside the block and invalidate each of them once on exit.
+
+        Meant for batches of writes, which would otherwise drop the cached data
+        and snapshot of a project once per task. Until the block exits, reads
+        are served the data cached before the batch.
+        """
+        if self._deferred_project_ids is not None:
+            # Already inside a deferred block; the outermost one invalidates
+            yield
+            return
+
+        self._deferred_project_ids = set()
+        try:
+            yield
+        finally:
+            project_ids, self._deferred_project_ids = self._deferred_project_ids, None
+            for project_id in project_ids:
+                self.invalidate_project(project_id)
+
+    def invalidate_projects(self) -> None:
+        """Drop the cached project list."""
+        self.version += 1
+        self.projects_cache.invalidate(self.PROJECTS_KEY)
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.delete_projects)
+
+    def clear(self) -> None:
+        """Drop everything that is cached."""
+        self.version += 1
+        self.projects_cache.clear()
+        self.project_data_cache.clear()
+        self.index.clear()
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.clear)
+
+    def apply_projects(self, projects: List[Project], ttl: Optional[float] = None) -> bool:
+        """
+        Store a freshly fetched project list, writing the snapshot only if it changed.
+
+        Args:
+            projects: The project list from the API
+            ttl: Time to live of the cache entry (defaults to the cache's TTL)
+
+        Returns:
+            True if the project list changed
+        """
+        cached = self.projects_cache.get(self.PROJECTS_KEY)
+        if cached == projects:
+            # Unchanged: just extend the life of the entry
+            self.projects_cache.set(self.PROJECTS_KEY, cached, ttl)
+            return False
+
+        self.projects_cache.set(self.PROJECTS_KEY, projects, ttl)
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.save_projects, projects)
+        return True
+
+    def apply_project_data(self, project_id: str, project_data: Dict, ttl: Optional[float] = None) -> int:
+        """
+        Store freshly fetched project data, re-indexing only the tasks that changed.
+
+        Args:
+            project_id: ID of the project
+            project_data: The get_project_with_data payload from the API
+            ttl: Time to live of the cache entry (defaults to the cache's TTL)
+
+        Returns:
+            The number of tasks added, changed or removed, plus one if the project itself changed
+        """
+        cached = self.project_data_cache.get(project_id)
+        changes = self.index.apply_changes(project_id, project_data.get('tasks', []))
+        if cached is not None:
+            changes += int(any(cached.get(key) != project_data.get(key) for key in ('project', 'columns')))
+        elif not changes:
+            # Nothing to compare the project against
+            changes = 1
+
+        if not changes:
+            # Unchanged: keep the cached payload the index points into and extend its life
+            self.project_data_cache.set(project_id, cached, ttl)
+            return 0
+
+        self.project_data_cache.set(project_id, project_data, ttl)
+        if self.snapshot:
+            self.snapshot.submit(self.snapshot.save_project_data, project_id, project_data)
+        return changes
+
+    def load_snapshot(self) -> bool:
+        """
+        Fill the cache from the on-disk snapshot.
+
+        Returns:
+            True if a project list was loaded, False otherwise
+        """
+        if not self.snapshot:
+            return False
+
+        try:
+            projects, projects_data = self.snapshot.load()
+        except Exception as e:
+            logger.error(f"Failed to load snapshot: {e}")
+            return False
+
+        if projects is None:
+            return False
+
+        self.projects_cache.set(self.PROJECTS_KEY, projects)
+        for project_id, project_data in projects_data.items():
+            self.project_data_cache.set(project_id, project_data)
+            self.index.update_project(project_id, project_data.get('tasks', []))
+
+        logger.info(f"Loaded {len(projects)} projects and {len(projects_data)} project payloads from snapshot")
+        return True
+
+    async def refresh(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> bool:
+        """
+        Re-fetch the project list and the data of every open project.
+
+        Returns:
+            True if the project list could be fetched, False otherwise
+        """
+        version = self.version
+        projects = await self.client.get_projects()
+        if 'error' in projects:
+            logger.error(f"Failed to refresh projects: {projects['error']}")
+            return False
+        if self.version == version:
+            self._store_projects(projects)
+
+        open_project_ids = [project.id for project in projects if not project.closed and project.id]
+
+        async def fetch(project_id: str) -> None:
+            version = self.version
+            project_data = await self.client.get_project_with_data(project_id)
+            if 'error' not in project_data and self.version == version:
+                self._store_project_data(project_id, project_data)
+
+        await bounded_gather(open_project_ids, fetch, max_concurrency)
+        return True
+
+    # Project methods
+    async def get_projects(self) -> List[Project]:
+        """Gets all projects for the user."""
+        projects = self.projects_cache.get(self.PROJECTS_KEY)
+        if projects is None:
+            version = self.version
+            projects = await self.client.get_projects()
+            if 'error' not in projects:
+                # Not cached if a write invalidated the cache meanwhile; the data may predate it
+                if self.version == version:
+                    self._store_projects(projects)
+            elif is_unavailable(projects):
+                projects = self._stale(self.projects_cache, self.PROJECTS_KEY, projects)
+        return projects
+
+    async def get_project_with_data(self, project_id: str) -> Dict:
+        """Gets project with tasks and columns."""
+        project_data = self.project_data_cache.get(project_id)
+        if project_data is None:
+            version = self.version
+            project_data = await self.client.get_project_with_data(project_id)
+            if 'error' not in project_data:
+                # Not cached if a write invalidated the cache meanwhile; the data may predate it
+                if self.version == version:
+                    self._store_project_data(project_id, project_data)
+            elif is_unavailable(project_data):
+                project_data = self._stale(self.project_data_cache, project_id, project_data)
+        return project_data
+
+    async def create_project(self, name: str, color: str = "#F18181", view_mode: str = "list", kind: str = "TASK") -> Dict:
+        """Creates a new project."""
+        try:
+            return await self.client.create_project(name=name, color=color, view_mode=view_mode, kind=kind)
+        finally:
+            self.invalidate_projects()
+
+    async def update_project(self, project_id: str, name: str = None, color: str = None,
+                             view_mode: str = None, kind: str = None) -> Dict:
+        """Updates an existing project."""
+        try:
+            return await self.client.update_project(project_id, name=name, color=color,
+                                                    view_mode=view_mode, kind=kind)
+        finally:
+            self.invalidate_projects()
+            self.invalidate_project(project_id)
+
+    async def delete_project(self, project_id: str) -> Dict:
+        """Deletes a project."""
+        try:
+            return await self.client.delete_project(project_id)
+        finally:
+            self.invalidate_projects()
+            self.invalidate_project(project_id)
+
+    # Task methods
+    async def get_task(self, project_id: str, task_id: str) -> Task:
+        """Gets a specific task, from the cached project data if it is there."""
+        project_data = self.project_data_cache.get(project_id)
+        if project_data is not None:
+            for task in project_data.get('tasks', []):
+                if task.id == task_id:
+                    return task
+        task = await self.client.get_task(project_id, task_id)
+        if is_unavailable(task):
+            project_data = self.project_data_cache.get(project_id, allow_stale=True)
+            for cached_task in (project_data or {}).get('tasks', []):
+                if cached_task.id == task_id:
+                    logger.warning(f"Serving cached task {task_id}: {task['error']}")
+                    return cached_task
+        return task
+
+    async def create_task(self, title: str, project_id: str, content: str = None,
+                          start_date: str = None, due_date: str = None,
+                          priority: int = 0, is_all_day: bool = False) -> Dict:
+        """Creates a new task."""
+        try:
+            return await self.client.create_task(title=title, project_id=project_id, content=content,
+                                                 start_date=start_date, due_date=due_date,
+                                                 priority=priority, is_all_day=is_all_day)
+        finally:
+            self.invalidate_project(project_id)
+
+    async def update_task(self, task_id: str, project_id: str, title: str = None,
+                          content: str = None, priority: int = None,
+                          start_date: str = None, due_date: str = None) -> Dict:
+        """Updates an existing task."""
+        try:
+            return await self.client.update_task(task_id=task_id, project_id=project_id, title=title,
+                                                 content=content, priority=priority,
+                                                 start_date=start_date, due_date=due_date)
+        finally:
+            self.invalidate_project(project_id)
+
+    async def complete_task(self, project_id: str, task_id: str) -> Dict:
+        """Marks a task as complete."""
+        try:
+            return await self.client.complete_task(project_id, task_id)
+        finally:
+            self.invalidate_project(project_id)
+
+    async def delete_task(self, project_id: str, task_id: str) -> Dict:
+        """Deletes a task."""
+        try:
+            return await self.client.delete_task(project_id, task_id)
+        finally:
+            self.invalidate_project(project_id)
+
+    async def create_subtask(self, subtask_title: str, parent_task_id: str, project_id: str,
+                             content: str = None, priority: int = 0) -> Dict:
+        """Creates a subtask for a parent task within the same project."""
+        try:
+            return await self.client.create_subtask(subtask_title=subtask_title, parent_task_id=parent_task_id,
+                                                    project_id=project_id, content=content, priority=priority)
+        finally:
+            self.invalidate_project(project_id)
@@ -0,0 +1,196 @@
+"""
+Concurrency helpers for the TickTick MCP server.
+
+The MCP tools frequently need to call the TickTick API once per project.
+These helpers fan such calls out concurrently while keeping the number of
+requests in flight bounded, either collecting the results in input order
+or yielding them as they complete. BatchExecutor does the same for batches
+of writes, sending fewer at once when the API starts rate limiting.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from .models import Project, Task
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+async def bounded_gather(
+    items: Iterable[T],
+    func: Callable[[T], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> List[Any]:
+    """
+    Run an async function for every item with a cap on concurrent calls.
+
+    Args:
+        items: Inputs to fan out over
+        func: Coroutine function called once per item
+        max_concurrency: Maximum number of calls in flight at once
+
+    Returns:
+        The results of func, in the same order as items
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(item: T) -> Any:
+        async with semaphore:
+            return await func(item)
+
+    return await asyncio.gather(*(run(item) for item in items))
+
+async def bounded_as_completed(
+    items: Iterable[T],
+    func: Callable[[T], Awaitable[Any]],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Run an async function for every item with a cap on concurrent calls,
+    yielding the results as soon as each call finishes.
+
+    Args:
+        items: Inputs to fan out over
+        func: Coroutine function called once per item
+        max_concurrency: Maximum number of calls in flight at once
+
+    Yields:
+        (position of the item in items, result of func) pairs, in completion order
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(position: int, item: T) -> Tuple[int, Any]:
+        async with semaphore:
+            return position, await func(item)
+
+    tasks = [asyncio.ensure_future(run(position, item)) for position, item in enumerate(items)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Don't leave calls running if the consumer stops early
+        for task in tasks:
+            task.cancel()
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+class BatchItemResult:
+    """The outcome of one item of a batch run by BatchExecutor."""
+
+    __slots__ = ("position", "result", "latency")
+
+    def __init__(self, position: int, result: Dict[str, Any], latency: float):
+        self.position = position
+        self.result = result
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        return 'error' not in self.result
+
+    def __repr__(self) -> str:
+        return f"BatchItemResult(position={self.position}, ok={self.ok})"
+
+class _AdaptiveLimit:
+    """
+    A concurrency limit that shrinks when the API rate limits and grows back as calls succeed.
+
+    The limit is halved on every rate limited response and raised by one after
+    a full limit's worth of successful calls (additive increase, multiplicative
+    decrease).
+    """
+
+    def __init__(self, max_limit: int):
+        self.max_limit = max_limit
+        self.limit = max_limit
+        self.in_flight = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self, throttled: bool = False) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            if not throttled:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_limit:
+                    self.limit += 1
+                    self._successes = 0
+            else:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            self._condition.notify_all()
+
+class BatchExecutor:
+    """
+    Runs a batch of API calls concurrently under an adaptive concurrency limit.
+
+    The executor doesn't retry calls itself: rate limited requests (HTTP 429)
+    are retried by the client after the Retry-After delay, and its rate
+    limiter holds back the account's other requests meanwhile (see
+    RetryPolicy and TokenBucket). A call that still comes back rate limited
+    halves the number of calls the executor keeps in flight. Other failures
+    are reported as they are: the batch tools issue writes, and a write that
+    failed any other way may have been applied.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        """
+        Args:
+            max_concurrency: Maximum number of calls in flight at once
+                (defaults to TICKTICK_BATCH_CONCURRENCY or DEFAULT_BATCH_CONCURRENCY)
+        """
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv("TICKTICK_BATCH_CONCURRENCY", DEFAULT_BATCH_CONCURRENCY))
+
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def run(
+        self,
+        items: Iterable[T],
+        operation: Callable[[T], Awaitable[Dict[str, Any]]]
+    ) -> List[BatchItemResult]:
+        """
+        Run an API call for every item of a batch.
+
+        Args:
+            items: Inputs of the batch
+            operation: Coroutine function making the API call for one item; it returns
+                the client's result (a model, or a dictionary which holds an 'error' key on failure)
+
+        Returns:
+            One BatchItemResult per item, in the same order as items. Exceptions raised
+            by operation are reported as {"error": message} results.
+        """
+        limit = _AdaptiveLimit(self.max_concurrency)
+
+        async def run_item(position: int, item: T) -> BatchItemResult:
+            await limit.acquire()
+            start = time.perf_counter()
+            try:
+                result = await operation(item)
+            except Exception as e:
+                logger.error(f"Batch operation {position + 1} failed: {e}")
+                result = {"error": str(e)}
+            latency = time.perf_counter() - start
+
+            if not isinstance(result, (dict, Task, Project)):
+                result = {"result": result}
+            throttled = result.get('status_code') == 429
+            if throttled:
+                logger.warning(f"Batch operation {position + 1} was rate limited, sending fewer operations at once")
+            await limit.release(throttled)
+            return BatchItemResult(position, result, latency)
+
+        return list(await asyncio.gather(*(run_item(position, item) for position, item in enumerate(items))))
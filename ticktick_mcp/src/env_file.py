@@ -0,0 +1,64 @@
+"""
+Updating the .env file that holds the TickTick credentials.
+
+Tokens are written back to .env whenever they change, possibly by several
+clients (one per account) at once, so updates are serialized and each one
+replaces the file atomically: readers see either the old or the new file,
+never a partially written one.
+"""
+
+import os
+import tempfile
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Serializes read-modify-write cycles of the file within this process
+_lock = threading.Lock()
+
+def update_env_file(updates: Dict[str, str], defaults: Optional[Dict[str, str]] = None,
+                    env_path: Union[str, Path] = ".env") -> None:
+    """
+    Set variables in a .env file, keeping the other variables in it.
+
+    Args:
+        updates: Variables to set
+        defaults: Variables to set only if the file doesn't have them yet
+        env_path: Path of the .env file
+    """
+    env_path = Path(env_path)
+    with _lock:
+        # Load existing .env file content
+        env_content = {}
+        if env_path.exists():
+            with open(env_path, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith('#') and '=' in line:
+                        key, value = line.split('=', 1)
+                        env_content[key] = value
+
+        for key, value in (defaults or {}).items():
+            env_content.setdefault(key, value)
+        env_content.update(updates)
+
+        # Write a temporary file next to .env and move it into place
+        fd, tmp_path = tempfile.mkstemp(dir=str(env_path.parent), prefix=".env.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                for key, value in env_content.items():
+                    f.write(f"{key}={value}\n")
+                f.flush()
+                os.fsync(f.fileno())
+            if env_path.exists():
+                os.chmod(tmp_path, env_path.stat().st_mode & 0o777)
+            os.replace(tmp_path, env_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    logger.debug(f"Updated {', '.join(updates)} in {env_path}")
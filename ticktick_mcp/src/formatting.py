@@ -0,0 +1,289 @@
+"""
+Rendering of TickTick data into the output of the MCP tools.
+
+Text output is built from lists of parts joined once, and the cross-project
+listings are produced as a stream of chunks, one per project, so large
+accounts don't pay for repeated string concatenation.
+
+The json and compact output formats are built as plain data for the server
+to encode: json has projects and tasks as objects with the API's field
+names, compact has one list per column of a few task fields.
+
+The json objects are the parsed models turned back into JSON (see
+models._Model.to_dict), not the raw responses: fields the models default
+(isAllDay, priority, status, sortOrder, reminders and items for tasks,
+sortOrder for projects) are always present, fields that are missing or
+null are left out, and fields the models don't have (tags, columnId, ...)
+are passed through unchanged.
+"""
+
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .models import ChecklistStatus, Priority, Project, Task, TaskStatus
+
+PRIORITY_MAP = {Priority.NONE: "None", Priority.LOW: "Low", Priority.MEDIUM: "Medium", Priority.HIGH: "High"}
+
+# Task fields that can be selected for output
+TASK_FIELDS = ("id", "title", "project_id", "start_date", "due_date", "priority", "status", "content", "subtasks")
+
+# Output formats of the read tools
+OUTPUT_FORMATS = ("text", "json", "compact")
+
+# API fields of the selectable task fields, for the json output format
+TASK_FIELD_KEYS = {
+    "id": "id", "title": "title", "project_id": "projectId", "start_date": "startDate", "due_date": "dueDate",
+    "priority": "priority", "status": "status", "content": "content", "subtasks": "items",
+}
+
+# Columns of the compact output format: due dates are epoch seconds and priorities their codes
+COMPACT_TASK_COLUMNS = ("id", "project_id", "title", "due", "priority")
+COMPACT_PROJECT_COLUMNS = ("id", "name")
+
+# Format a task object from TickTick for better display
+def format_task(task: Union[Task, Dict], fields: Optional[Collection[str]] = None) -> str:
+    """
+    Format a task into a human-readable string.
+
+    Args:
+        task: Task from the API (a dictionary is parsed first)
+        fields: Fields to include (see TASK_FIELDS); all fields if not given
+    """
+    task = Task.from_api(task)
+
+    def show(field: str) -> bool:
+        return fields is None or field in fields
+
+    parts = []
+    if show('id'):
+        parts.append(f"ID: {_or(task.id, 'No ID')}\n")
+    if show('title'):
+        parts.append(f"Title: {_or(task.title, 'No title')}\n")
+
+    # Add project ID
+    if show('project_id'):
+        parts.append(f"Project ID: {_or(task.project_id, 'None')}\n")
+
+    # Add dates if available
+    if show('start_date') and task.start_date:
+        parts.append(f"Start Date: {task.start_date}\n")
+    if show('due_date') and task.due_date:
+        parts.append(f"Due Date: {task.due_date}\n")
+
+    # Add priority if available
+    if show('priority'):
+        parts.append(f"Priority: {PRIORITY_MAP.get(task.priority, str(task.priority))}\n")
+
+    # Add status if available
+    if show('status'):
+        status = "Completed" if task.status == TaskStatus.COMPLETED else "Active"
+        parts.append(f"Status: {status}\n")
+
+    # Add content if available
+    if show('content') and task.content:
+        parts.append(f"\nContent:\n{task.content}\n")
+
+    # Add subtasks if available
+    items = task.items
+    if show('subtasks') and items:
+        parts.append(f"\nSubtasks ({len(items)}):\n")
+        for i, item in enumerate(items, 1):
+            status = "✓" if item.status == ChecklistStatus.COMPLETED else "□"
+            parts.append(f"{i}. [{status}] {_or(item.title, 'No title')}\n")
+
+    return "".join(parts)
+
+# Format a project object from TickTick for better display
+def format_project(project: Union[Project, Dict]) -> str:
+    """Format a project into a human-readable string."""
+    project = Project.from_api(project)
+    parts = [
+        f"Name: {_or(project.name, 'No name')}\n",
+        f"ID: {_or(project.id, 'No ID')}\n"
+    ]
+
+    # Add color if available
+    if project.color:
+        parts.append(f"Color: {project.color}\n")
+
+    # Add view mode if available
+    if project.view_mode:
+        parts.append(f"View Mode: {project.view_mode}\n")
+
+    # Add closed status if available
+    if project.closed is not None:
+        parts.append(f"Closed: {'Yes' if project.closed else 'No'}\n")
+
+    # Add kind if available
+    if project.kind:
+        parts.append(f"Kind: {project.kind}\n")
+
+    return "".join(parts)
+
+def _or(value: Any, default: str) -> Any:
+    """Get a field of a model, or a placeholder if the API didn't return it."""
+    return default if value is None else value
+
+def render_numbered(label: str, items: Iterable[Dict], formatter) -> Iterator[str]:
+    """
+    Render a numbered list such as "Task 1:\\n...".
+
+    Args:
+        label: Label put in front of each number
+        items: Objects to render
+        formatter: Function that formats one object
+    """
+    for i, item in enumerate(items, 1):
+        yield f"{label} {i}:\n{formatter(item)}\n"
+
+def render_filtered_projects(
+    project_count: int,
+    sections: Iterable[Tuple[int, Project, List[Tuple[int, Task]]]],
+    filter_name: str,
+    fields: Optional[Collection[str]] = None
+) -> Iterator[str]:
+    """
+    Render the result of a cross-project task filter, one chunk per project.
+
+    Args:
+        project_count: Total number of projects, including closed ones
+        sections: (project number, project, [(task number, task), ...]) for each project,
+            consumed lazily so that sections can be produced while they are rendered
+        filter_name: Name of the filter for output formatting
+        fields: Task fields to include (see TASK_FIELDS); all fields if not given
+    """
+    yield f"Found {project_count} projects:\n\n"
+
+    for i, project, tasks in sections:
+        parts = [
+            f"Project {i}:\n{format_project(project)}",
+            f"With {len(tasks)} tasks that are to be '{filter_name}' in this project :\n"
+        ]
+        for t, task in tasks:
+            parts.append(f"Task {t}:\n{format_task(task, fields)}\n")
+        parts.append("\n\n")
+        yield "".join(parts)
+
+def render_task_page(
+    page: List[Tuple[int, Project, int, Task]],
+    total: int,
+    offset: int,
+    filter_name: str,
+    fields: Optional[Collection[str]] = None
+) -> Iterator[str]:
+    """
+    Render one page of the result of a cross-project task filter.
+
+    Args:
+        page: (project number, project, task number, task) for each task on the page
+        total: Number of matching tasks across all pages
+        offset: Number of matching tasks before this page
+        filter_name: Name of the filter for output formatting
+        fields: Task fields to include (see TASK_FIELDS); all fields if not given
+    """
+    if not page:
+        yield f"No tasks that are to be '{filter_name}' at offset {offset} ({total} tasks in total).\n"
+        return
+
+    yield f"Showing tasks {offset + 1}-{offset + len(page)} of {total} tasks that are to be '{filter_name}':\n\n"
+
+    current_project = None
+    for i, project, t, task in page:
+        if i != current_project:
+            current_project = i
+            yield f"Project {i}:\n{format_project(project)}\n"
+        yield f"Task {t}:\n{format_task(task, fields)}\n"
+
+    next_offset = offset + len(page)
+    if next_offset < total:
+        yield f"\nMore tasks are available. Call again with offset={next_offset} to see the next page.\n"
+
+def task_json(task: Union[Task, Dict], fields: Optional[Collection[str]] = None) -> Dict[str, Any]:
+    """
+    Get a task as an object with the API's field names, for the json output format.
+
+    Args:
+        task: Task from the API (a dictionary is parsed first)
+        fields: Fields to include (see TASK_FIELDS); all fields, including the ones
+            the text output leaves out, if not given
+    """
+    data = Task.from_api(task).to_dict()
+    if fields is None:
+        return data
+    keys = {TASK_FIELD_KEYS[field] for field in fields}
+    return {key: value for key, value in data.items() if key in keys}
+
+def project_json(project: Union[Project, Dict]) -> Dict[str, Any]:
+    """Get a project as an object with the API's field names, for the json output format."""
+    return Project.from_api(project).to_dict()
+
+def compact_task(task: Union[Task, Dict]) -> Dict[str, Any]:
+    """Get the compact output of a single task (see COMPACT_TASK_COLUMNS)."""
+    task = Task.from_api(task)
+    return {"id": task.id, "project_id": task.project_id, "title": task.title, "due": task.due,
+            "priority": int(task.priority)}
+
+def compact_tasks(tasks: List[Task], with_project: bool = True) -> Dict[str, List[Any]]:
+    """
+    Get the compact output of tasks: a list per column (see COMPACT_TASK_COLUMNS), in the order of tasks.
+
+    Args:
+        tasks: Tasks to include
+        with_project: Include the project_id column (leave it out when all tasks are in one project)
+    """
+    columns = {"id": [task.id for task in tasks]}
+    if with_project:
+        columns["project_id"] = [task.project_id for task in tasks]
+    columns["title"] = [task.title for task in tasks]
+    columns["due"] = [task.due for task in tasks]
+    columns["priority"] = [int(task.priority) for task in tasks]
+    return columns
+
+def compact_project(project: Union[Project, Dict]) -> Dict[str, Any]:
+    """Get the compact output of a single project (see COMPACT_PROJECT_COLUMNS)."""
+    project = Project.from_api(project)
+    return {"id": project.id, "name": project.name}
+
+def compact_projects(projects: List[Project]) -> Dict[str, List[Any]]:
+    """Get the compact output of projects: a list per column (see COMPACT_PROJECT_COLUMNS)."""
+    return {"id": [project.id for project in projects], "name": [project.name for project in projects]}
+
+def structured_tasks(tasks: List[Task], output_format: str, fields: Optional[Collection[str]] = None) -> Dict[str, Any]:
+    """
+    Get a list of tasks in the json or compact output format.
+
+    Returns:
+        {"tasks": [...]} for json, or the columns of compact_tasks
+    """
+    if output_format == "compact":
+        return compact_tasks(tasks)
+    return {"tasks": [task_json(task, fields) for task in tasks]}
+
+def structured_task_page(
+    page: List[Tuple[int, Project, int, Task]],
+    total: int,
+    offset: int,
+    output_format: str,
+    fields: Optional[Collection[str]] = None
+) -> Dict[str, Any]:
+    """
+    Get one page of the result of a cross-project task filter in the json or compact output format.
+
+    Args:
+        page: (project number, project, task number, task) for each task on the page
+        total: Number of matching tasks across all pages
+        offset: Number of matching tasks before this page
+        output_format: "json" or "compact"
+        fields: Task fields to include in json output (see TASK_FIELDS); all fields if not given
+
+    Returns:
+        The total and offset, next_offset if more tasks are available, the names of the
+        projects of the tasks by ID (json only) and the tasks (see structured_tasks)
+    """
+    result: Dict[str, Any] = {"total": total, "offset": offset}
+    next_offset = offset + len(page)
+    if next_offset < total:
+        result["next_offset"] = next_offset
+    if output_format == "json":
+        result["projects"] = {project.id: project.name for _, project, _, _ in page}
+    result.update(structured_tasks([task for _, _, _, task in page], output_format, fields))
+    return result
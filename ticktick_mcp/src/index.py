@@ -0,0 +1,226 @@
+"""
+In-memory secondary indexes over TickTick tasks.
+
+TaskIndex is filled from get_project_with_data results and answers the
+queries behind the cross-project filter tools (due date ranges, priority,
+project membership, text search) with index lookups instead of scanning
+every task.
+"""
+
+import bisect
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from .models import Task, TaskRecord, same_task_version
+from .search import SearchIndex
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+class TaskIndex:
+    """
+    Indexes the tasks of several projects by project, priority, due date and text.
+
+    Tasks (parsed Task models) are filed in TaskRecords when a project is added. Each
+    project's tasks are replaced as a whole with update_project, or brought up
+    to date task by task with apply_changes. The due date
+    index is a list of (due timestamp, task ID) pairs kept sorted, rebuilt
+    lazily on the first query after a change. The text of the tasks is kept in
+    a SearchIndex that is updated incrementally.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, TaskRecord] = {}
+        self._by_project: Dict[str, List[str]] = {}
+        self._by_priority: Dict[int, Set[str]] = {}
+        self._due_index: Optional[List[Tuple[int, str]]] = []
+        self._text = SearchIndex()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._records
+
+    def get(self, task_id: str) -> Optional[TaskRecord]:
+        """Get the record of a task."""
+        return self._records.get(task_id)
+
+    def update_project(self, project_id: str, tasks: List[Task]) -> None:
+        """Replace the indexed tasks of a project."""
+        old_task_ids = self._by_project.pop(project_id, [])
+        for task_id in old_task_ids:
+            self._remove_task(task_id)
+
+        task_ids = []
+        for position, task in enumerate(tasks, 1):
+            task_id = task.id
+            if task_id is None:
+                continue
+            if task_id in self._records and self._records[task_id].project_id == project_id:
+                continue
+            self._add_task(project_id, position, task)
+            task_ids.append(task_id)
+
+        # Only tasks that are gone need to leave the text index; the others were updated in place
+        for task_id in old_task_ids:
+            if task_id not in self._records:
+                self._text.remove(task_id)
+
+        self._by_project[project_id] = task_ids
+        self._due_index = None
+
+    def apply_changes(self, project_id: str, tasks: List[Task]) -> int:
+        """
+        Bring the indexed tasks of a project up to date, touching only the tasks that changed.
+
+        Tasks whose version is unchanged (see same_task_version) keep their
+        record and text index entries; only added, changed and removed tasks
+        are re-indexed.
+
+        Returns:
+            The number of tasks added, changed, moved or removed (0 if the project is unchanged)
+        """
+        old_task_ids = self._by_project.get(project_id)
+        if old_task_ids is None:
+            self.update_project(project_id, tasks)
+            return len(self._by_project[project_id])
+
+        task_ids = []
+        seen = set()
+        changes = 0
+        for position, task in enumerate(tasks, 1):
+            task_id = task.id
+            if task_id is None or task_id in seen:
+                continue
+            seen.add(task_id)
+            task_ids.append(task_id)
+
+            record = self._records.get(task_id)
+            if record is not None and record.project_id == project_id:
+                if same_task_version(record.task, task):
+                    if record.position != position:
+                        record.position = position
+                        changes += 1
+                    continue
+                self._remove_task(task_id)
+
+            self._add_task(project_id, position, task)
+            changes += 1
+
+        for task_id in old_task_ids:
+            if task_id not in seen:
+                self._remove_task(task_id)
+                self._text.remove(task_id)
+                changes += 1
+
+        self._by_project[project_id] = task_ids
+        if changes:
+            self._due_index = None
+        return changes
+
+    def _add_task(self, project_id: str, position: int, task: Task) -> None:
+        task_id = task.id
+        if task_id in self._records:
+            # The task moved here from another project that hasn't been refreshed yet
+            other_project_id = self._records[task_id].project_id
+            self._remove_task(task_id)
+            self._by_project[other_project_id].remove(task_id)
+
+        record = TaskRecord(task, project_id, position)
+        self._records[task_id] = record
+        self._by_priority.setdefault(record.priority, set()).add(task_id)
+        self._text.add(task_id, task)
+
+    def remove_project(self, project_id: str) -> None:
+        """Remove the tasks of a project from the index."""
+        task_ids = self._by_project.pop(project_id, None)
+        if not task_ids:
+            return
+
+        for task_id in task_ids:
+            self._remove_task(task_id)
+            self._text.remove(task_id)
+        self._due_index = None
+
+    def _remove_task(self, task_id: str) -> None:
+        record = self._records.pop(task_id)
+        bucket = self._by_priority.get(record.priority)
+        if bucket is not None:
+            bucket.discard(task_id)
+
+    def clear(self) -> None:
+        """Remove every task from the index."""
+        self.__init__()
+
+    def _get_due_index(self) -> List[Tuple[int, str]]:
+        if self._due_index is None:
+            self._due_index = sorted(
+                (record.task.due, task_id) for task_id, record in self._records.items() if record.task.due is not None
+            )
+        return self._due_index
+
+    # Queries
+    def project_ids(self) -> Set[str]:
+        """Get the IDs of the indexed projects."""
+        return set(self._by_project)
+
+    def project_task_ids(self, project_id: str) -> Set[str]:
+        """Get the IDs of the tasks in a project."""
+        return set(self._by_project.get(project_id, ()))
+
+    def all_task_ids(self) -> Set[str]:
+        """Get the IDs of every indexed task."""
+        return set(self._records)
+
+    def with_priority(self, *priorities: int) -> Set[str]:
+        """Get the IDs of the tasks with any of the given priorities."""
+        result = set()
+        for priority in priorities:
+            result |= self._by_priority.get(priority, set())
+        return result
+
+    def due_between(self, start: Optional[int] = None, end: Optional[int] = None) -> Set[str]:
+        """
+        Get the IDs of the tasks due in a time range.
+
+        Args:
+            start: Inclusive lower bound in epoch seconds (None for no bound)
+            end: Exclusive upper bound in epoch seconds (None for no bound)
+        """
+        due_index = self._get_due_index()
+        lo = 0 if start is None else bisect.bisect_left(due_index, (start,))
+        hi = len(due_index) if end is None else bisect.bisect_left(due_index, (end,))
+        return {task_id for _, task_id in due_index[lo:hi]}
+
+    def search(self, query: str) -> Dict[str, float]:
+        """
+        Find the tasks whose title, content or subtask titles match a search query.
+
+        Returns:
+            A dictionary mapping the IDs of matching tasks to their relevance score
+        """
+        return self._text.search(query)
+
+    def matching(self, predicate: Callable[[Task], bool]) -> Set[str]:
+        """Get the IDs of the tasks a predicate returns True for (a full scan)."""
+        return {task_id for task_id, record in self._records.items() if predicate(record.task)}
+
+    def group_by_project(self, task_ids: Iterable[str]) -> Dict[str, List[Tuple[int, Task]]]:
+        """
+        Group tasks by project.
+
+        Returns:
+            A dictionary mapping project IDs to (position, task) pairs, where position
+            is the 1-based position of the task in its project, sorted by position
+        """
+        groups: Dict[str, List[TaskRecord]] = {}
+        for task_id in task_ids:
+            record = self._records.get(task_id)
+            if record is not None:
+                groups.setdefault(record.project_id, []).append(record)
+
+        return {
+            project_id: [(record.position, record.task) for record in sorted(records, key=lambda r: r.position)]
+            for project_id, records in groups.items()
+        }
@@ -0,0 +1,195 @@
+"""
+Pluggable JSON backends for API responses, request bodies and snapshots.
+
+The standard library's json module is always available. orjson and msgspec
+are used when they are installed (pip install orjson, or msgspec):
+TICKTICK_JSON_BACKEND selects "json", "orjson", "msgspec" or "msgspec-schema",
+and "auto", the default, picks the fastest one installed.
+
+Every backend decodes responses into the same models, extra fields
+included, so the tools' output doesn't depend on which packages are
+installed.
+
+"msgspec-schema" is an opt-in variant of the msgspec backend that decodes
+responses parsed into models (parse_task, parse_project_data, ...) with a
+schema, straight into lightweight structs that have only the fields of the
+models. The rest of a large /project/{id}/data payload is skipped rather
+than built into dictionaries and thrown away, so models parsed this way keep
+no extra fields (tags, columnId, kind, ...): they are missing from the json
+output of the tools and from snapshots. "auto" never picks it.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .models import (
+    ChecklistItem, Project, Task, json_default, parse_project, parse_project_data, parse_projects, parse_task
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+JSON_BACKENDS = ("json", "orjson", "msgspec", "msgspec-schema")
+DEFAULT_JSON_BACKEND = "auto"
+
+# Turns decoded JSON into models (see models.parse_task and the like)
+Parse = Callable[[Any], Any]
+
+class JSONBackend:
+    """JSON encoding and decoding with the standard library's json module."""
+
+    name = "json"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode JSON.
+
+        Raises:
+            ValueError: If data is not valid JSON
+        """
+        return json.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        """Encode a value as compact UTF-8 JSON, serializing models as the API's JSON."""
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=json_default).encode()
+
+    def decode(self, data: Union[bytes, str], parse: Optional[Parse] = None) -> Any:
+        """
+        Decode JSON, parsed into models with parse if given.
+
+        Raises:
+            ValueError: If data is not valid JSON
+        """
+        result = self.loads(data)
+        return parse(result) if parse else result
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+class OrjsonBackend(JSONBackend):
+    """JSON encoding and decoding with orjson."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        # orjson.JSONDecodeError is a ValueError
+        return self._orjson.loads(data)
+
+    def dumps(self, value: Any) -> bytes:
+        return self._orjson.dumps(value, default=json_default)
+
+class MsgspecBackend(JSONBackend):
+    """JSON encoding and decoding with msgspec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._msgspec = msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder(enc_hook=json_default)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    def dumps(self, value: Any) -> bytes:
+        return self._encoder.encode(value)
+
+class MsgspecSchemaBackend(MsgspecBackend):
+    """
+    msgspec backend decoding responses with a schema into structs, dropping the fields the models don't have.
+
+    The structs are generated from the FIELDS of the models, with every field
+    optional and of any type, and read by the models' from_api like the
+    dictionaries other backends decode. A payload that doesn't fit its schema (an array where an
+    object was expected, say) is decoded without it.
+    """
+
+    name = "msgspec-schema"
+
+    def __init__(self):
+        super().__init__()
+        msgspec = self._msgspec
+
+        item_struct = self._struct(ChecklistItem)
+        task_struct = self._struct(Task, {"items": Optional[List[item_struct]]})
+        project_struct = self._struct(Project)
+        project_data_struct = msgspec.defstruct(
+            "ProjectData",
+            [("project", Optional[project_struct], None), ("tasks", Optional[List[task_struct]], None),
+             ("columns", Any, None)],
+            gc=False
+        )
+        self._schemas: Dict[Parse, Tuple[Any, Parse]] = {
+            parse_task: (msgspec.json.Decoder(task_struct), Task.from_api),
+            parse_project: (msgspec.json.Decoder(project_struct), Project.from_api),
+            parse_projects: (msgspec.json.Decoder(List[project_struct]), parse_projects),
+            parse_project_data: (msgspec.json.Decoder(project_data_struct), self._parse_project_data),
+        }
+
+    def _struct(self, model: type, types: Optional[Dict[str, Any]] = None) -> type:
+        """Generate the struct a model is decoded into."""
+        fields = [(key, (types or {}).get(key, Any), None) for key in model.FIELDS]
+        # Decoded structs never form reference cycles, so the garbage collector can skip them
+        return self._msgspec.defstruct(model.__name__, fields, gc=False)
+
+    @staticmethod
+    def _parse_project_data(data: Any) -> Any:
+        fields = {key: getattr(data, key) for key in data.__struct_fields__ if getattr(data, key) is not None}
+        return parse_project_data(fields)
+
+    def decode(self, data: Union[bytes, str], parse: Optional[Parse] = None) -> Any:
+        schema = self._schemas.get(parse)
+        if schema is None:
+            return super().decode(data, parse)
+
+        decoder, convert = schema
+        try:
+            return convert(decoder.decode(data))
+        except self._msgspec.ValidationError:
+            # Valid JSON of an unexpected shape, parsed as any other backend would
+            return super().decode(data, parse)
+        except self._msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+_BACKEND_CLASSES = {
+    "json": JSONBackend, "orjson": OrjsonBackend, "msgspec": MsgspecBackend, "msgspec-schema": MsgspecSchemaBackend
+}
+_backends: Dict[str, JSONBackend] = {}
+
+def get_json_backend(name: Optional[str] = None) -> JSONBackend:
+    """
+    Get a JSON backend.
+
+    Args:
+        name: "json", "orjson", "msgspec", "msgspec-schema", or "auto" for the fastest
+            one installed other than "msgspec-schema" (default: "auto")
+
+    Returns:
+        The backend, or the standard library's if the one asked for is not installed
+
+    Raises:
+        ValueError: If the name is not a known backend
+    """
+    name = (name or DEFAULT_JSON_BACKEND).strip().lower()
+    if name != "auto" and name not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown JSON backend: {name}. Use one of auto, {', '.join(JSON_BACKENDS)}.")
+
+    for candidate in ("msgspec", "orjson") if name == "auto" else (name,):
+        if candidate not in _backends:
+            try:
+                _backends[candidate] = _BACKEND_CLASSES[candidate]()
+            except ImportError:
+                if candidate == name:
+                    logger.warning(f"JSON backend {name} is not installed, using the standard library's json module")
+                continue
+        return _backends[candidate]
+    return _backends.setdefault("json", JSONBackend())
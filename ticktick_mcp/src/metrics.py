@@ -0,0 +1,313 @@
+"""
+Request and tool metrics for the TickTick MCP server.
+
+RequestMetrics records every attempt a client makes at an API request, by
+endpoint: how many were made, with which statuses, how many bytes came
+back, how many were retries and how long they took. ToolMetrics records the
+wall time of every MCP tool call. Latencies go into fixed-bucket histograms,
+which are cheap to update and from which percentiles are estimated the way
+Prometheus does; render_prometheus exports everything in the Prometheus
+text format.
+"""
+
+import time
+import bisect
+import threading
+import logging
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments followed by an ID in API endpoints
+_ID_SEGMENTS = {"project": "{projectId}", "task": "{taskId}"}
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Replace the IDs in an API endpoint with placeholders, so that requests are grouped by endpoint.
+
+    For example /project/abc/task/def becomes /project/{projectId}/task/{taskId}.
+    """
+    segments = endpoint.split("?", 1)[0].split("/")
+    for i in range(1, len(segments)):
+        placeholder = _ID_SEGMENTS.get(segments[i - 1])
+        if placeholder and segments[i]:
+            segments[i] = placeholder
+    return "/".join(segments)
+
+class LatencyHistogram:
+    """
+    Histogram of durations with fixed bucket bounds.
+
+    Percentiles are estimated by linear interpolation within the bucket the
+    requested rank falls into, so they are accurate to the bucket resolution
+    (and exact at the extremes, which are tracked separately).
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket, plus one for durations above the last bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds) if self.count > 1 else seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of the recorded durations.
+
+        Args:
+            q: The quantile, between 0 and 1 (0.95 for the 95th percentile)
+
+        Returns:
+            The estimated duration in seconds, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                estimate = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return min(max(estimate, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the count, mean, p50, p95, p99 and max of the recorded durations, in seconds."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+class EndpointStats:
+    """Counters and latency histogram of the requests to one endpoint."""
+
+    def __init__(self):
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.bytes = 0
+        self.retries = 0
+        self.latency = LatencyHistogram()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "statuses": dict(self.statuses),
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "latency": self.latency.summary(),
+        }
+
+class RequestMetrics:
+    """
+    Metrics of the API requests made by one client, by method and endpoint.
+
+    Every attempt is recorded, so a request retried twice counts as three
+    requests and two retries. Status is the HTTP status code, "error" when no
+    response was received and "circuit_open" when the circuit breaker refused
+    to send the request. Safe to use from several threads.
+    """
+
+    def __init__(self):
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def _stats(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method, endpoint_template(endpoint))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def record(self, method: str, endpoint: str, status: Union[int, str],
+               latency: Optional[float] = None, size: int = 0) -> None:
+        """
+        Record an attempt at a request.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (without base URL)
+            status: HTTP status code, "error" or "circuit_open"
+            latency: Seconds the attempt took, if it was sent
+            size: Number of bytes in the response body
+        """
+        with self._lock:
+            stats = self._stats(method, endpoint)
+            stats.requests += 1
+            stats.statuses[str(status)] += 1
+            stats.bytes += size
+            if latency is not None:
+                stats.latency.observe(latency)
+
+    def record_retry(self, method: str, endpoint: str) -> None:
+        """Record that a failed request is being retried."""
+        with self._lock:
+            self._stats(method, endpoint).retries += 1
+
+    def items(self) -> List[Tuple[Tuple[str, str], EndpointStats]]:
+        """Get ((method, endpoint), stats) pairs, ordered by endpoint."""
+        with self._lock:
+            return sorted(self._endpoints.items(), key=lambda item: (item[0][1], item[0][0]))
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the metrics of every endpoint, keyed by "METHOD /endpoint"."""
+        return {f"{method} {endpoint}": stats.summary() for (method, endpoint), stats in self.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+class ToolMetrics:
+    """Number of calls, failures and wall time of every MCP tool. Safe to use from several threads."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._calls: Dict[str, List] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tool: str, seconds: float, failed: bool = False) -> None:
+        """
+        Record a tool call.
+
+        Args:
+            tool: Name of the tool
+            seconds: Wall time of the call
+            failed: Whether the call raised an error
+        """
+        with self._lock:
+            entry = self._calls.get(tool)
+            if entry is None:
+                entry = self._calls[tool] = [0, 0, LatencyHistogram()]
+            entry[0] += 1
+            entry[1] += int(failed)
+            entry[2].observe(seconds)
+
+    def items(self) -> List[Tuple[str, int, int, LatencyHistogram]]:
+        """Get (tool, calls, failures, wall time histogram) tuples, ordered by tool name."""
+        with self._lock:
+            return [(tool, *entry) for tool, entry in sorted(self._calls.items())]
+
+    def summary(self) -> Dict[str, Any]:
+        """Get the metrics of every tool called so far, keyed by tool name."""
+        return {
+            tool: {"calls": calls, "failures": failures, "wall_time": histogram.summary()}
+            for tool, calls, failures, histogram in self.items()
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._calls.clear()
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _render_histogram(lines: List[str], name: str, histogram: LatencyHistogram, **labels: str) -> None:
+    cumulative = 0
+    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels(**labels, le=_format_value(bound))} {cumulative}")
+    lines.append(f"{name}_sum{_labels(**labels)} {_format_value(histogram.sum)}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+
+def render_prometheus(requests: Dict[str, RequestMetrics], tools: Optional[ToolMetrics] = None,
+                      gauges: Optional[Dict[str, Tuple[str, Dict[str, float]]]] = None) -> str:
+    """
+    Export metrics in the Prometheus text exposition format.
+
+    Args:
+        requests: Request metrics by account name
+        tools: Tool metrics
+        gauges: Extra per-account gauges, as {name: (help text, {account: value})}
+
+    Returns:
+        The metrics as text
+    """
+    lines = [
+        "# HELP ticktick_api_requests_total TickTick API request attempts by endpoint and status.",
+        "# TYPE ticktick_api_requests_total counter",
+    ]
+    endpoints = [
+        (account, method, endpoint, stats)
+        for account, metrics in sorted(requests.items())
+        for (method, endpoint), stats in metrics.items()
+    ]
+    for account, method, endpoint, stats in endpoints:
+        for status, count in sorted(stats.statuses.items()):
+            labels = _labels(account=account, method=method, endpoint=endpoint, status=status)
+            lines.append(f"ticktick_api_requests_total{labels} {count}")
+
+    lines += [
+        "# HELP ticktick_api_response_bytes_total Bytes received in TickTick API responses.",
+        "# TYPE ticktick_api_response_bytes_total counter",
+    ]
+    for account, method, endpoint, stats in endpoints:
+        lines.append(f"ticktick_api_response_bytes_total{_labels(account=account, method=method, endpoint=endpoint)} {stats.bytes}")
+
+    lines += [
+        "# HELP ticktick_api_retries_total TickTick API requests retried after a failed attempt.",
+        "# TYPE ticktick_api_retries_total counter",
+    ]
+    for account, method, endpoint, stats in endpoints:
+        lines.append(f"ticktick_api_retries_total{_labels(account=account, method=method, endpoint=endpoint)} {stats.retries}")
+
+    lines += [
+        "# HELP ticktick_api_request_duration_seconds Duration of TickTick API request attempts.",
+        "# TYPE ticktick_api_request_duration_seconds histogram",
+    ]
+    for account, method, endpoint, stats in endpoints:
+        _render_histogram(lines, "ticktick_api_request_duration_seconds", stats.latency,
+                          account=account, method=method, endpoint=endpoint)
+
+    if tools is not None:
+        tool_items = tools.items()
+        lines += [
+            "# HELP ticktick_tool_calls_total MCP tool calls.",
+            "# TYPE ticktick_tool_calls_total counter",
+        ]
+        lines += [f"ticktick_tool_calls_total{_labels(tool=tool)} {calls}" for tool, calls, _, _ in tool_items]
+        lines += [
+            "# HELP ticktick_tool_failures_total MCP tool calls that raised an error.",
+            "# TYPE ticktick_tool_failures_total counter",
+        ]
+        lines += [f"ticktick_tool_failures_total{_labels(tool=tool)} {failures}" for tool, _, failures, _ in tool_items]
+        lines += [
+            "# HELP ticktick_tool_duration_seconds Wall time of MCP tool calls.",
+            "# TYPE ticktick_tool_duration_seconds histogram",
+        ]
+        for tool, _, _, histogram in tool_items:
+            _render_histogram(lines, "ticktick_tool_duration_seconds", histogram, tool=tool)
+
+    for name, (help_text, values) in (gauges or {}).items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        lines += [f"{name}{_labels(account=account)} {_format_value(value)}" for account, value in sorted(values.items())]
+
+    return "\n".join(lines) + "\n"
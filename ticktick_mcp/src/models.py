@@ -0,0 +1,408 @@
+"""
+Compact models of TickTick data.
+
+API responses are parsed once, when the client receives them, into Task,
+ChecklistItem and Project objects with __slots__ instead of dictionaries:
+priorities and statuses are enum-coded, repeated strings (project IDs, time
+zones, dates, recurrence rules) are interned, and due and start dates are
+also kept as integer epoch seconds, so that queries compare integers instead
+of parsing date strings for every task on every call. The models still
+answer get(), [] and "in" with the API's field names, so code written
+against the JSON keeps working, and to_dict() turns them back into JSON.
+"""
+
+import sys
+import calendar
+import logging
+from enum import IntEnum
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+TICKTICK_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
+SECONDS_PER_DAY = 86400
+
+def parse_timestamp(value: Optional[str]) -> Optional[int]:
+    """
+    Parse a TickTick date such as 2019-11-13T03:00:00.000+0000.
+
+    The format the API returns is parsed by slicing; anything else falls
+    back to datetime.strptime.
+
+    Returns:
+        The date as integer seconds since the epoch, or None if it is missing or malformed
+    """
+    if not value:
+        return None
+
+    try:
+        # Fast path for YYYY-MM-DDThh:mm:ss.SSS+hhmm
+        if len(value) == 28 and value[10] == 'T' and value[19] == '.' and value[23] in '+-':
+            seconds = calendar.timegm((
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19])
+            ))
+            offset = int(value[24:26]) * 3600 + int(value[26:28]) * 60
+            return seconds - offset if value[23] == '+' else seconds + offset
+
+        return int(datetime.strptime(value, TICKTICK_DATETIME_FORMAT).timestamp())
+    except (ValueError, TypeError):
+        return None
+
+def task_version(task: "Task") -> Optional[Tuple[Any, Any]]:
+    """
+    Get the version markers of a task: its etag and modification time.
+
+    Returns:
+        (etag, modifiedTime), or None if the task has neither
+    """
+    if task.etag is None and task.modified_time is None:
+        return None
+    return task.etag, task.modified_time
+
+def same_task_version(old: "Task", new: "Task") -> bool:
+    """
+    Check whether two copies of a task are the same version.
+
+    Compares the version markers when the new copy has them, and the whole
+    task otherwise.
+    """
+    version = task_version(new)
+    if version is None:
+        return old == new
+    return task_version(old) == version
+
+class Priority(IntEnum):
+    NONE = 0
+    LOW = 1
+    MEDIUM = 3
+    HIGH = 5
+
+class TaskStatus(IntEnum):
+    NORMAL = 0
+    COMPLETED = 2
+
+class ChecklistStatus(IntEnum):
+    NORMAL = 0
+    COMPLETED = 1
+
+_PRIORITIES = {member.value: member for member in Priority}
+_TASK_STATUSES = {member.value: member for member in TaskStatus}
+_CHECKLIST_STATUSES = {member.value: member for member in ChecklistStatus}
+
+def _code(members: Dict[int, IntEnum], value: Any) -> Any:
+    """Get the enum member of an API value, keeping values the enum doesn't know as they are."""
+    return members.get(value, value)
+
+def _intern(value: Any) -> Any:
+    """Intern a string, so that every copy of it in the cache is the same object."""
+    return sys.intern(value) if type(value) is str else value
+
+def _getter(data: Any) -> Callable[[str], Any]:
+    """Get the function reading the fields of an API object: a dictionary, or a struct decoded with a schema (see json_backend)."""
+    return data.get if isinstance(data, dict) else partial(getattr, data)
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, _Model):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_to_json(item) for item in value]
+    if isinstance(value, IntEnum):
+        return int(value)
+    return value
+
+class _Model:
+    """
+    Base of the models: read-only access by API field name and conversion back to JSON.
+
+    Subclasses map API field names to attributes in FIELDS. Fields of the API
+    response that aren't in FIELDS are kept in extra, so nothing is lost.
+    Missing fields are None and read like missing dictionary keys.
+    """
+
+    __slots__ = ("extra",)
+
+    FIELDS: Dict[str, str] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attribute = self.FIELDS.get(key)
+        if attribute is not None:
+            value = getattr(self, attribute)
+        else:
+            value = self.extra.get(key) if self.extra else None
+        return default if value is None else value
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the API's JSON representation."""
+        result = {}
+        for key, attribute in self.FIELDS.items():
+            value = getattr(self, attribute)
+            if value is not None:
+                result[key] = _to_json(value)
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute in self.FIELDS.values()) \
+            and self.extra == other.extra
+
+    __hash__ = None
+
+    @classmethod
+    def _extra(cls, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the fields of an API object that have no attribute."""
+        if not isinstance(data, dict):
+            # Decoded with a schema (see json_backend), which has only the fields in FIELDS
+            return None
+        if data.keys() <= cls.FIELDS.keys():
+            return None
+        return {key: value for key, value in data.items() if key not in cls.FIELDS}
+
+class ChecklistItem(_Model):
+    """A subtask of a task (the ChecklistItem schema)."""
+
+    __slots__ = ("id", "title", "status", "completed_time", "is_all_day", "sort_order", "start_date", "time_zone")
+
+    FIELDS = {
+        "id": "id", "title": "title", "status": "status", "completedTime": "completed_time",
+        "isAllDay": "is_all_day", "sortOrder": "sort_order", "startDate": "start_date", "timeZone": "time_zone",
+    }
+
+    def __init__(self, id: Optional[str] = None, title: Optional[str] = None,
+                 status: Union[ChecklistStatus, int] = ChecklistStatus.NORMAL, completed_time: Optional[str] = None,
+                 is_all_day: bool = False, sort_order: int = 0, start_date: Optional[str] = None,
+                 time_zone: Optional[str] = None, extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.title = title
+        self.status = _code(_CHECKLIST_STATUSES, status)
+        self.completed_time = _intern(completed_time)
+        self.is_all_day = is_all_day
+        self.sort_order = sort_order
+        self.start_date = _intern(start_date)
+        self.time_zone = _intern(time_zone)
+        self.extra = extra
+
+    @classmethod
+    def from_api(cls, data: Union[Dict[str, Any], "ChecklistItem"]) -> "ChecklistItem":
+        """Parse a checklist item from the API's JSON."""
+        if isinstance(data, ChecklistItem):
+            return data
+        get = _getter(data)
+        return cls(get('id'), get('title'), get('status') or 0, get('completedTime'), bool(get('isAllDay')),
+                   get('sortOrder') or 0, get('startDate'), get('timeZone'), cls._extra(data))
+
+    def __repr__(self) -> str:
+        return f"ChecklistItem(id={self.id!r}, title={self.title!r}, status={self.status!r})"
+
+class Task(_Model):
+    """
+    A task (the Task schema).
+
+    Besides the API's fields, due and start hold the due and start dates as
+    integer epoch seconds (None if missing or malformed).
+    """
+
+    __slots__ = ("id", "project_id", "title", "content", "desc", "is_all_day", "start_date", "due_date",
+                 "time_zone", "reminders", "repeat_flag", "priority", "status", "completed_time", "sort_order",
+                 "items", "etag", "modified_time", "due", "start")
+
+    FIELDS = {
+        "id": "id", "projectId": "project_id", "title": "title", "content": "content", "desc": "desc",
+        "isAllDay": "is_all_day", "startDate": "start_date", "dueDate": "due_date", "timeZone": "time_zone",
+        "reminders": "reminders", "repeatFlag": "repeat_flag", "priority": "priority", "status": "status",
+        "completedTime": "completed_time", "sortOrder": "sort_order", "items": "items", "etag": "etag",
+        "modifiedTime": "modified_time",
+    }
+
+    def __init__(self, id: Optional[str] = None, project_id: Optional[str] = None, title: Optional[str] = None,
+                 content: Optional[str] = None, desc: Optional[str] = None, is_all_day: bool = False,
+                 start_date: Optional[str] = None, due_date: Optional[str] = None, time_zone: Optional[str] = None,
+                 reminders: Tuple[str, ...] = (), repeat_flag: Optional[str] = None,
+                 priority: Union[Priority, int] = Priority.NONE, status: Union[TaskStatus, int] = TaskStatus.NORMAL,
+                 completed_time: Optional[str] = None, sort_order: int = 0, items: Tuple[ChecklistItem, ...] = (),
+                 etag: Optional[str] = None, modified_time: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = id
+        self.project_id = _intern(project_id)
+        self.title = title
+        self.content = content
+        self.desc = desc
+        self.is_all_day = is_all_day
+        self.start_date = _intern(start_date)
+        self.due_date = _intern(due_date)
+        self.time_zone = _intern(time_zone)
+        self.reminders = tuple(_intern(reminder) for reminder in reminders) if reminders else ()
+        self.repeat_flag = _intern(repeat_flag)
+        self.priority = _code(_PRIORITIES, priority)
+        self.status = _code(_TASK_STATUSES, status)
+        self.completed_time = _intern(completed_time)
+        self.sort_order = sort_order
+        self.items = items
+        self.etag = etag
+        self.modified_time = modified_time
+        self.extra = extra
+        self.due = parse_timestamp(due_date)
+        self.start = parse_timestamp(start_date)
+
+    @classmethod
+    def from_api(cls, data: Union[Dict[str, Any], "Task"]) -> "Task":
+        """Parse a task from the API's JSON."""
+        if isinstance(data, Task):
+            return data
+        get = _getter(data)
+        items = get('items')
+        return cls(
+            get('id'), get('projectId'), get('title'), get('content'), get('desc'), bool(get('isAllDay')),
+            get('startDate'), get('dueDate'), get('timeZone'), get('reminders') or (), get('repeatFlag'),
+            get('priority') or 0, get('status') or 0, get('completedTime'), get('sortOrder') or 0,
+            tuple(ChecklistItem.from_api(item) for item in items) if items else (),
+            get('etag'), get('modifiedTime'), cls._extra(data)
+        )
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, project_id={self.project_id!r}, title={self.title!r})"
+
+class Project(_Model):
+    """A project (the Project schema)."""
+
+    __slots__ = ("id", "name", "color", "sort_order", "closed", "group_id", "view_mode", "permission", "kind")
+
+    FIELDS = {
+        "id": "id", "name": "name", "color": "color", "sortOrder": "sort_order", "closed": "closed",
+        "groupId": "group_id", "viewMode": "view_mode", "permission": "permission", "kind": "kind",
+    }
+
+    def __init__(self, id: Optional[str] = None, name: Optional[str] = None, color: Optional[str] = None,
+                 sort_order: int = 0, closed: Optional[bool] = None, group_id: Optional[str] = None,
+                 view_mode: Optional[str] = None, permission: Optional[str] = None, kind: Optional[str] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.id = _intern(id)
+        self.name = name
+        self.color = _intern(color)
+        self.sort_order = sort_order
+        # None when the API leaves it out, which formatters tell apart from False
+        self.closed = closed
+        self.group_id = _intern(group_id)
+        self.view_mode = _intern(view_mode)
+        self.permission = _intern(permission)
+        self.kind = _intern(kind)
+        self.extra = extra
+
+    @classmethod
+    def from_api(cls, data: Union[Dict[str, Any], "Project"]) -> "Project":
+        """Parse a project from the API's JSON."""
+        if isinstance(data, Project):
+            return data
+        get = _getter(data)
+        return cls(get('id'), get('name'), get('color'), get('sortOrder') or 0, get('closed'), get('groupId'),
+                   get('viewMode'), get('permission'), get('kind'), cls._extra(data))
+
+    def __repr__(self) -> str:
+        return f"Project(id={self.id!r}, name={self.name!r})"
+
+def _is_object(result: Any) -> bool:
+    """Check whether an API result is an object to parse, rather than an error or an empty response."""
+    return isinstance(result, dict) and bool(result) and 'error' not in result
+
+def parse_task(result: Any) -> Any:
+    """Parse the result of a task request, passing errors through."""
+    return Task.from_api(result) if _is_object(result) else result
+
+def parse_project(result: Any) -> Any:
+    """Parse the result of a project request, passing errors through."""
+    return Project.from_api(result) if _is_object(result) else result
+
+def parse_projects(result: Any) -> Any:
+    """Parse the result of a project list request, passing errors through."""
+    if isinstance(result, list):
+        return [Project.from_api(project) for project in result]
+    return result
+
+def parse_project_data(result: Any) -> Any:
+    """
+    Parse the result of a get_project_with_data request, passing errors through.
+
+    The result stays a dictionary, with the project and its tasks parsed and
+    the columns left as they are.
+    """
+    if not _is_object(result):
+        return result
+    parsed = dict(result)
+    if result.get('project') is not None:
+        parsed['project'] = Project.from_api(result['project'])
+    parsed['tasks'] = [Task.from_api(task) for task in result.get('tasks') or ()]
+    return parsed
+
+def json_default(value: Any) -> Any:
+    """The default= hook of json.dumps that serializes models as the API's JSON."""
+    if isinstance(value, _Model):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class TaskRecord:
+    """
+    The entry of a task in the task index: the parsed task and where it is listed.
+
+    The fields the filters need (priority, status, due and start dates) are
+    read from the task, which has them normalized already.
+    """
+
+    __slots__ = ("task", "project_id", "position")
+
+    def __init__(self, task: Task, project_id: str, position: int):
+        self.task = task
+        self.project_id = project_id
+        self.position = position
+
+    @classmethod
+    def from_api(cls, task: Union[Dict[str, Any], Task], project_id: str, position: int) -> "TaskRecord":
+        """
+        Build a record from a task returned by the API.
+
+        Args:
+            task: Task from the API, parsed or not
+            project_id: ID of the project the task belongs to
+            position: 1-based position of the task in its project
+        """
+        return cls(Task.from_api(task), project_id, position)
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.task.id
+
+    @property
+    def priority(self) -> Union[Priority, int]:
+        return self.task.priority
+
+    @property
+    def status(self) -> Union[TaskStatus, int]:
+        return self.task.status
+
+    @property
+    def due(self) -> Optional[int]:
+        return self.task.due
+
+    @property
+    def start(self) -> Optional[int]:
+        return self.task.start
+
+    def __repr__(self) -> str:
+        return f"TaskRecord(id={self.id!r}, project_id={self.project_id!r}, due={self.due!r})"
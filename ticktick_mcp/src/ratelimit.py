@@ -0,0 +1,105 @@
+"""
+Client-side rate limiting of TickTick API requests.
+
+Every client (one per account) meters its requests through a TokenBucket,
+so that fan-outs across projects and batch tools, from however many tool
+calls at once, are spread out under the API's rate limit instead of
+bursting into it and getting rejected with 429.
+"""
+
+import time
+import threading
+import logging
+from typing import Any, Dict
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE_LIMIT = 20.0
+DEFAULT_RATE_BURST = 40
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+
+    The bucket holds up to burst tokens and refills at rate tokens per second.
+    Each request takes a token; when the bucket is empty, requests reserve a
+    future token and wait for it, so they go out in order at the sustained
+    rate. A 429 from the API drains the bucket for the Retry-After delay,
+    holding back every request of the account rather than just the rejected
+    one. Safe to use from several threads and from coroutines.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_RATE_BURST):
+        """
+        Args:
+            rate: Sustained requests per second (0 disables rate limiting)
+            burst: Maximum number of requests sent at once after a quiet period
+        """
+        self.rate = max(0.0, rate)
+        self.burst = max(1, burst)
+        self.waits = 0
+        self.wait_time = 0.0
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """
+        Take a token for a request.
+
+        Returns:
+            The number of seconds to wait before sending the request (0 if it can go now)
+        """
+        if not self.enabled:
+            return 0.0
+
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if delay > 0:
+                self.waits += 1
+                self.wait_time += delay
+        return delay
+
+    def throttle(self, delay: float) -> None:
+        """
+        Hold back the requests that follow for delay seconds, after the API rejected one with 429.
+
+        Args:
+            delay: Seconds the API asked to wait
+        """
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - delay * self.rate
+        logger.warning(f"Rate limited by the TickTick API, holding back requests for {delay:.2f}s")
+
+    @property
+    def available(self) -> float:
+        """The number of requests that can be sent right now without waiting."""
+        with self._lock:
+            self._refill()
+            return max(0.0, self._tokens)
+
+    def budget(self) -> Dict[str, Any]:
+        """Get the configuration and current state of the limiter."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "available": round(self.available, 2),
+            "waits": self.waits,
+            "wait_time": round(self.wait_time, 3),
+        }
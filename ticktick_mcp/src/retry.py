@@ -0,0 +1,203 @@
+"""
+Retry and failure handling for TickTick API requests.
+
+RetryPolicy decides which failed requests are retried and how long to wait
+before each retry, and holds the connect and read timeouts. CircuitBreaker
+stops sending requests for a while once the API keeps failing, so that tool
+calls fail fast (and the cache can answer them) during an outage instead of
+each one waiting for its own timeouts and retries.
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BASE_DELAY = 0.5
+DEFAULT_RETRY_MAX_DELAY = 8.0
+DEFAULT_CIRCUIT_FAILURE_THRESHOLD = 5
+DEFAULT_CIRCUIT_RESET_TIMEOUT = 30.0
+
+# Methods that can be sent again without changing the result
+IDEMPOTENT_METHODS = frozenset({"GET", "DELETE"})
+# Statuses worth retrying: rate limited, or the API or a proxy in front of it failing
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float,
+                  retry_after: Optional[float] = None) -> float:
+    """
+    Get the delay before a retry: the server's Retry-After if it gave one,
+    otherwise exponential backoff with jitter.
+
+    Args:
+        attempt: Number of the attempt that failed, starting at 1
+        base_delay: Backoff after the first attempt, in seconds
+        max_delay: Upper bound for the delay, in seconds
+        retry_after: Delay requested by the server, in seconds
+
+    Returns:
+        The number of seconds to wait
+    """
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    delay = min(max_delay, base_delay * (2 ** (attempt - 1)))
+    return random.uniform(delay / 2, delay)
+
+def is_unavailable(result: Any) -> bool:
+    """
+    Check whether an API result is an error caused by the API being unreachable,
+    failing or rate limiting rather than by the request itself.
+    """
+    if not isinstance(result, dict) or 'error' not in result:
+        return False
+    status_code = result.get('status_code')
+    return status_code is None or status_code >= 500 or status_code == 429
+
+class RetryPolicy:
+    """
+    Timeouts and retry rules for API requests.
+
+    GET and DELETE requests are retried after network errors, timeouts and
+    retryable statuses (429 and 5xx). Other requests are only retried when
+    the connection couldn't be established or the API answered 429: the API
+    may already have applied a request whose response was lost or that
+    failed with 5xx, but it refuses rate limited requests without applying
+    them. Nothing else retries rate limited requests (see BatchExecutor).
+    """
+
+    def __init__(self, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_delay: float = DEFAULT_RETRY_BASE_DELAY, max_delay: float = DEFAULT_RETRY_MAX_DELAY):
+        """
+        Args:
+            connect_timeout: Seconds to wait for a connection to the API
+            read_timeout: Seconds to wait for the API to send data
+            max_retries: Maximum number of retries of a request (0 disables retrying)
+            base_delay: Backoff before the first retry, in seconds
+            max_delay: Upper bound for a single backoff, in seconds
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max(0, max_retries)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @property
+    def timeouts(self) -> Tuple[float, float]:
+        """The (connect, read) timeouts."""
+        return self.connect_timeout, self.read_timeout
+
+    def retry_delay(self, method: str, attempt: int, status_code: Optional[int] = None,
+                    retry_after: Optional[float] = None, sent: bool = True) -> Optional[float]:
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            method: HTTP method of the request
+            attempt: Number of the attempt that failed, starting at 1
+            status_code: Status of the response, or None if no response was received
+            retry_after: Delay requested by the server, in seconds
+            sent: False if the request certainly didn't reach the API
+
+        Returns:
+            The number of seconds to wait before retrying, or None if the request isn't retried
+        """
+        if attempt > self.max_retries:
+            return None
+        if status_code is not None and status_code not in RETRY_STATUSES:
+            return None
+        if sent and method not in IDEMPOTENT_METHODS and status_code != 429:
+            return None
+        return backoff_delay(attempt, self.base_delay, self.max_delay, retry_after)
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the API is down.
+
+    After failure_threshold consecutive failures (network errors, timeouts or
+    5xx responses) the circuit opens and requests are refused without being
+    sent. Once reset_timeout seconds have passed, a single request is let
+    through as a probe: if it succeeds the circuit closes again, otherwise it
+    stays open for another reset_timeout. Safe to use from several threads.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int = DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_CIRCUIT_RESET_TIMEOUT):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (0 disables the breaker)
+            reset_timeout: Seconds the circuit stays open before a probe request is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def retry_after(self) -> float:
+        """Get the number of seconds until the next probe request is let through."""
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be sent, letting through a probe once the circuit is due to close."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self.retry_after() <= 0:
+                # Let one request through; the others keep failing fast until it is
+                # answered, or until another reset_timeout passes without an answer
+                self._state = self.HALF_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Record a request that got a response from the API."""
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info("TickTick API is reachable again, closing the circuit")
+            self._state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Record a request that failed because of the API or the network."""
+        with self._lock:
+            self.failures += 1
+            if self._state == self.HALF_OPEN or (
+                self.failure_threshold > 0 and self._state == self.CLOSED
+                and self.failures >= self.failure_threshold
+            ):
+                if self._state == self.CLOSED:
+                    logger.warning(
+                        f"TickTick API failed {self.failures} times in a row, "
+                        f"failing requests fast for {self.reset_timeout:g}s"
+                    )
+                    self.opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def open_response(self) -> Dict[str, Any]:
+        """Build the error returned for a request refused because the circuit is open."""
+        return {
+            "error": f"TickTick API is unavailable after {self.failures} consecutive failures; "
+                     "not sending requests until it recovers",
+            "circuit_open": True,
+            "retry_after": round(self.retry_after(), 3),
+        }
@@ -0,0 +1,154 @@
+"""
+Full-text search over TickTick tasks.
+
+SearchIndex is an inverted index from tokens of a task's title, content
+and subtask titles to the tasks containing them. Query tokens match any
+indexed token they are a prefix of, and results are ranked by where and
+how often the tokens occur.
+"""
+
+import re
+import bisect
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .models import Task
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Chinese and Japanese text is not separated by spaces, so every ideograph
+# and kana character is a token of its own; anything else is split into words
+TOKEN_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]|[^\W_]+")
+
+# How much an occurrence of a token counts in each field
+TITLE_WEIGHT = 3.0
+SUBTASK_WEIGHT = 2.0
+CONTENT_WEIGHT = 1.0
+
+# Extra weight for a query token that matches an indexed token exactly rather than as a prefix
+EXACT_MATCH_BONUS = 2.0
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase search tokens."""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _task_text(task: Task) -> Tuple[str, str, Tuple[str, ...]]:
+    """Get the searchable text of a task: title, content and subtask titles."""
+    items = tuple(item.title or '' for item in task.items)
+    return task.title or '', task.content or '', items
+
+class SearchIndex:
+    """
+    Inverted index over the text of tasks.
+
+    Tasks are added, replaced and removed one at a time. Re-adding a task whose
+    text hasn't changed is a no-op, so refreshing a project only re-tokenizes
+    the tasks that were actually edited. The sorted vocabulary used for prefix
+    lookups is rebuilt lazily on the first search after new tokens appear.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._task_terms: Dict[str, Tuple[Tuple[str, str, Tuple[str, ...]], Tuple[str, ...]]] = {}
+        self._vocabulary: Optional[List[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._task_terms)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._task_terms
+
+    def add(self, task_id: str, task: Task) -> None:
+        """Index a task, replacing its previous text if it was indexed before."""
+        text = _task_text(task)
+        indexed = self._task_terms.get(task_id)
+        if indexed is not None:
+            if indexed[0] == text:
+                return
+            self.remove(task_id)
+
+        title, content, items = text
+        weights: Dict[str, float] = {}
+        for token in tokenize(title):
+            weights[token] = weights.get(token, 0.0) + TITLE_WEIGHT
+        for item_title in items:
+            for token in tokenize(item_title):
+                weights[token] = weights.get(token, 0.0) + SUBTASK_WEIGHT
+        for token in tokenize(content):
+            weights[token] = weights.get(token, 0.0) + CONTENT_WEIGHT
+
+        for token, weight in weights.items():
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._vocabulary = None
+            postings[task_id] = weight
+
+        self._task_terms[task_id] = (text, tuple(weights))
+
+    def remove(self, task_id: str) -> None:
+        """Remove a task from the index."""
+        indexed = self._task_terms.pop(task_id, None)
+        if indexed is None:
+            return
+
+        for token in indexed[1]:
+            postings = self._postings[token]
+            del postings[task_id]
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+
+    def clear(self) -> None:
+        """Remove every task from the index."""
+        self.__init__()
+
+    def _get_vocabulary(self) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        return self._vocabulary
+
+    def _prefix_scores(self, prefix: str) -> Dict[str, float]:
+        """Score the tasks containing a token that starts with prefix."""
+        vocabulary = self._get_vocabulary()
+        scores: Dict[str, float] = {}
+
+        i = bisect.bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            token = vocabulary[i]
+            bonus = EXACT_MATCH_BONUS if token == prefix else 1.0
+            for task_id, weight in self._postings[token].items():
+                scores[task_id] = scores.get(task_id, 0.0) + weight * bonus
+            i += 1
+
+        return scores
+
+    def search(self, query: str) -> Dict[str, float]:
+        """
+        Find the tasks matching every token of a query.
+
+        Args:
+            query: Search text; each of its tokens matches indexed tokens it is a prefix of
+
+        Returns:
+            A dictionary mapping the IDs of matching tasks to their relevance score
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return {}
+
+        result: Optional[Dict[str, float]] = None
+        # Start with the rarest-looking (longest) tokens so the candidate set shrinks quickly
+        for token in sorted(set(tokens), key=len, reverse=True):
+            scores = self._prefix_scores(token)
+            if result is None:
+                result = scores
+            else:
+                result = {task_id: score + scores[task_id] for task_id, score in result.items() if task_id in scores}
+            if not result:
+                return {}
+
+        return result
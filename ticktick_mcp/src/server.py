@@ -1,211 +1,428 @@
 import asyncio
 import json
 import os
+import time
 import logging
-from datetime import datetime, timezone, date, timedelta
-from typing import Dict, List, Any, Optional
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Any, Optional, Set, Tuple
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.server.transport_security import TransportSecuritySettings
 from dotenv import load_dotenv
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
-from .ticktick_client import TickTickClient
+from .async_client import AsyncTickTickClient
+from .cache import CachedTickTickClient
+from .index import TaskIndex
+from .models import SECONDS_PER_DAY, Project, Task
+from .formatting import (
+    OUTPUT_FORMATS, PRIORITY_MAP, TASK_FIELDS, format_task, format_project,
+    render_numbered, render_filtered_projects, render_task_page,
+    task_json, project_json, compact_task, compact_tasks, compact_project, compact_projects,
+    structured_tasks, structured_task_page
+)
+from .snapshot import SnapshotStore
+from .sync import SyncDaemon
+from .concurrency import bounded_as_completed, BatchExecutor, BatchItemResult
+from .accounts import AccountRegistry, DEFAULT_ACCOUNT, account_env_prefix, configured_accounts
+from .metrics import ToolMetrics, render_prometheus
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Wall time of the MCP tool calls
+tool_metrics = ToolMetrics()
+
+class TickTickMCP(FastMCP):
+    """FastMCP server that records the wall time of every tool call in tool_metrics."""
+    
+    async def call_tool(self, name: str, arguments: Dict[str, Any]):
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = await super().call_tool(name, arguments)
+            failed = False
+            return result
+        finally:
+            tool_metrics.record(name, time.perf_counter() - start, failed)
+
 # Create FastMCP server
-mcp = FastMCP("ticktick")
+mcp = TickTickMCP("ticktick")
+
+# Transports the server can be run with, and where the HTTP transports listen by default
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+DEFAULT_HTTP_HOST = "127.0.0.1"
+DEFAULT_HTTP_PORT = 8000
 
-# Create TickTick client
-ticktick = None
+# Hosts that only accept local connections, and addresses that listen on every interface
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+WILDCARD_HOSTS = ("0.0.0.0", "::")
 
-def initialize_client():
-    global ticktick
+# Background tasks started by the server (kept so they are not garbage collected)
+background_tasks = set()
+
+def _open_snapshot_store(account: str = DEFAULT_ACCOUNT) -> Optional[SnapshotStore]:
+    """
+    Open the on-disk snapshot of an account if TICKTICK_CACHE_DIR is set.
+    
+    The default account's snapshot is stored in the cache directory itself,
+    other accounts' snapshots in a subdirectory named after the account.
+    """
+    cache_dir = os.getenv("TICKTICK_CACHE_DIR")
+    if not cache_dir:
+        return None
+    if account != DEFAULT_ACCOUNT:
+        cache_dir = os.path.join(cache_dir, account)
+    
+    try:
+        return SnapshotStore.from_cache_dir(cache_dir)
+    except Exception as e:
+        logger.error(f"Failed to open snapshot in {cache_dir}: {e}")
+        return None
+
+def _start_background_task(coro) -> None:
+    """Run a coroutine in the background on the current event loop."""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+async def _refresh_snapshot(client: CachedTickTickClient) -> None:
+    """Refresh the cached projects and tasks loaded from the snapshot."""
+    try:
+        if await client.refresh(client.max_concurrency):
+            logger.info("Snapshot refreshed from TickTick API")
+        else:
+            logger.error("Failed to refresh snapshot. Your access token may have expired. "
+                         "Please run 'uv run -m ticktick_mcp.cli auth' to refresh it.")
+    except Exception as e:
+        logger.error(f"Error refreshing snapshot: {e}")
+
+async def _create_client(account: str) -> Optional[CachedTickTickClient]:
+    """
+    Create the client of an account and check that it can reach the API.
+    
+    Returns:
+        The client, or None if the account has no access token or the API can't be reached
+    """
     try:
         # Check if .env file exists with access token
         load_dotenv()
         
         # Check if we have valid credentials
-        if os.getenv("TICKTICK_ACCESS_TOKEN") is None:
-            logger.error("No access token found in .env file. Please run 'uv run -m ticktick_mcp.cli auth' to authenticate.")
-            return False
+        env_prefix = account_env_prefix(account)
+        if os.getenv(f"{env_prefix}ACCESS_TOKEN") is None:
+            logger.error(f"No access token found in .env file ({env_prefix}ACCESS_TOKEN). "
+                         "Please run 'uv run -m ticktick_mcp.cli auth' to authenticate.")
+            return None
+        
+        # Initialize the client, with an in-memory cache in front of it
+        client = CachedTickTickClient(AsyncTickTickClient(env_prefix=env_prefix), snapshot=_open_snapshot_store(account))
+        logger.info(f"TickTick client for account '{account}' initialized successfully")
+        
+        # Start warm from the snapshot and check API connectivity in the background
+        if client.load_snapshot():
+            _start_background_task(_refresh_snapshot(client))
+        else:
+            # Test API connectivity
+            projects = await client.get_projects()
+            if 'error' in projects:
+                logger.error(f"Failed to access TickTick API: {projects['error']}")
+                logger.error("Your access token may have expired. Please run 'uv run -m ticktick_mcp.cli auth' to refresh it.")
+                return None
+            
+            logger.info(f"Successfully connected to TickTick API with {len(projects)} projects")
         
-        # Initialize the client
-        ticktick = TickTickClient()
-        logger.info("TickTick client initialized successfully")
+        # Keep the cache up to date in the background if TICKTICK_SYNC_INTERVAL is set
+        sync_daemon = SyncDaemon(client, max_concurrency=client.max_concurrency)
+        if sync_daemon.enabled:
+            _start_background_task(sync_daemon.run())
         
-        # Test API connectivity
-        projects = ticktick.get_projects()
-        if 'error' in projects:
-            logger.error(f"Failed to access TickTick API: {projects['error']}")
-            logger.error("Your access token may have expired. Please run 'uv run -m ticktick_mcp.cli auth' to refresh it.")
-            return False
-            
-        logger.info(f"Successfully connected to TickTick API with {len(projects)} projects")
-        return True
+        return client
     except Exception as e:
-        logger.error(f"Failed to initialize TickTick client: {e}")
-        return False
-
-# Format a task object from TickTick for better display
-def format_task(task: Dict) -> str:
-    """Format a task into a human-readable string."""
-    formatted = f"ID: {task.get('id', 'No ID')}\n"
-    formatted += f"Title: {task.get('title', 'No title')}\n"
-    
-    # Add project ID
-    formatted += f"Project ID: {task.get('projectId', 'None')}\n"
-    
-    # Add dates if available
-    if task.get('startDate'):
-        formatted += f"Start Date: {task.get('startDate')}\n"
-    if task.get('dueDate'):
-        formatted += f"Due Date: {task.get('dueDate')}\n"
-    
-    # Add priority if available
-    priority_map = {0: "None", 1: "Low", 3: "Medium", 5: "High"}
-    priority = task.get('priority', 0)
-    formatted += f"Priority: {priority_map.get(priority, str(priority))}\n"
-    
-    # Add status if available
-    status = "Completed" if task.get('status') == 2 else "Active"
-    formatted += f"Status: {status}\n"
-    
-    # Add content if available
-    if task.get('content'):
-        formatted += f"\nContent:\n{task.get('content')}\n"
-    
-    # Add subtasks if available
-    items = task.get('items', [])
-    if items:
-        formatted += f"\nSubtasks ({len(items)}):\n"
-        for i, item in enumerate(items, 1):
-            status = "✓" if item.get('status') == 1 else "□"
-            formatted += f"{i}. [{status}] {item.get('title', 'No title')}\n"
-    
-    return formatted
-
-# Format a project object from TickTick for better display
-def format_project(project: Dict) -> str:
-    """Format a project into a human-readable string."""
-    formatted = f"Name: {project.get('name', 'No name')}\n"
-    formatted += f"ID: {project.get('id', 'No ID')}\n"
-    
-    # Add color if available
-    if project.get('color'):
-        formatted += f"Color: {project.get('color')}\n"
-    
-    # Add view mode if available
-    if project.get('viewMode'):
-        formatted += f"View Mode: {project.get('viewMode')}\n"
-    
-    # Add closed status if available
-    if 'closed' in project:
-        formatted += f"Closed: {'Yes' if project.get('closed') else 'No'}\n"
-    
-    # Add kind if available
-    if project.get('kind'):
-        formatted += f"Kind: {project.get('kind')}\n"
-    
-    return formatted
+        logger.error(f"Failed to initialize TickTick client for account '{account}': {e}")
+        return None
+
+# Clients of the TickTick accounts served, created on first use
+accounts: AccountRegistry[CachedTickTickClient] = AccountRegistry(_create_client)
+
+async def get_client(account: Optional[str] = None) -> Optional[CachedTickTickClient]:
+    """
+    Get the client of an account, initializing it on first use.
+    
+    Args:
+        account: Name of the account (the default account if not given)
+    
+    Returns:
+        The client, or None if it couldn't be initialized
+    """
+    return await accounts.get(account)
+
+def _client_error(account: Optional[str]) -> str:
+    """Get the message of a tool whose account has no client."""
+    if account and account != DEFAULT_ACCOUNT and account not in configured_accounts():
+        return f"Unknown account '{account}'; configured accounts: {', '.join(configured_accounts()) or 'none'}"
+    return "Failed to initialize TickTick client. Please check your API credentials."
+
+async def initialize_client(account: Optional[str] = None) -> bool:
+    """Initialize the client of an account (the default account if not given)."""
+    return await get_client(account) is not None
 
 # MCP Tools
 
 @mcp.tool()
-async def get_projects() -> str:
-    """Get all projects from TickTick."""
+async def get_accounts() -> str:
+    """Get the TickTick accounts this server can access, for the account argument of the other tools."""
+    names = configured_accounts()
+    if not names:
+        return "No accounts configured. Please run 'uv run -m ticktick_mcp.cli auth' to authenticate."
+    
+    parts = [f"Found {len(names)} accounts:\n\n"]
+    clients = dict(accounts.items())
+    for name in names:
+        client = clients.get(name)
+        if client is None:
+            status = "not connected yet"
+        elif client.rate_limiter.enabled:
+            budget = client.rate_limiter.budget()
+            status = (f"connected, {int(budget['available'])} of {budget['burst']} requests available "
+                      f"(rate limit {budget['rate']:g}/s)")
+        else:
+            status = "connected"
+        parts.append(f"- {name}{' (default)' if name == DEFAULT_ACCOUNT else ''}: {status}\n")
+    return "".join(parts)
+
+STATS_FORMATS = ("text", "json", "prometheus")
+
+def _format_ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+def _format_latency(summary: Dict[str, Any]) -> str:
+    return f"p50 {_format_ms(summary['p50'])}, p95 {_format_ms(summary['p95'])}, p99 {_format_ms(summary['p99'])}"
+
+def _prometheus_metrics(clients: List[Tuple[str, CachedTickTickClient]]) -> str:
+    """Export the request metrics of the given accounts and the tool metrics for Prometheus."""
+    return render_prometheus(
+        {name: client.metrics for name, client in clients},
+        tool_metrics,
+        gauges={
+            "ticktick_rate_limit_available": (
+                "Requests that can be sent without waiting for the client-side rate limit.",
+                {name: client.rate_limiter.available for name, client in clients}
+            ),
+            "ticktick_circuit_open": (
+                "1 while the circuit breaker refuses to send TickTick API requests.",
+                {name: int(client.circuit_breaker.state != "closed") for name, client in clients}
+            ),
+        }
+    )
+
+@mcp.tool()
+async def get_server_stats(account: str = None, output_format: str = "text") -> str:
+    """
+    Get performance statistics of this server: API requests by endpoint (counts, statuses,
+    bytes, retries and latency percentiles) and the wall time of every tool.
+    
+    Args:
+        account: Only report the API requests of this account (optional, all accounts if not given)
+        output_format: "text", "json", or "prometheus" for the Prometheus text format
+    """
+    if output_format not in STATS_FORMATS:
+        return f"Invalid output_format: {output_format}. Use one of {', '.join(STATS_FORMATS)}."
+    
+    clients = accounts.items()
+    if account:
+        clients = [(name, client) for name, client in clients if name == account]
+    
+    if output_format == "prometheus":
+        return _prometheus_metrics(clients)
+    
+    uptime = time.time() - tool_metrics.started
+    if output_format == "json":
+        return json.dumps({
+            "uptime": round(uptime, 3),
+            "tools": tool_metrics.summary(),
+            "accounts": {
+                name: {
+                    "requests": client.metrics.summary(),
+                    "coalesced_requests": client.coalesced_requests,
+                    "rate_limit": client.rate_limiter.budget(),
+                    "circuit": client.circuit_breaker.state,
+                }
+                for name, client in clients
+            },
+        }, indent=2)
+    
+    parts = [f"Server stats (up {timedelta(seconds=int(uptime))}):\n\n", "Tools:\n"]
+    tool_items = tool_metrics.items()
+    if not tool_items:
+        parts.append("No tool calls yet.\n")
+    for tool, calls, failures, histogram in tool_items:
+        parts.append(f"- {tool}: {calls} calls, {failures} failed, {_format_latency(histogram.summary())}\n")
+    
+    if account and not clients:
+        parts.append(f"\nAccount {account} is not connected yet.\n")
+    for name, client in clients:
+        budget = client.rate_limiter.budget()
+        parts.append(
+            f"\nAccount {name}: circuit {client.circuit_breaker.state}, "
+            f"{int(budget['available'])} of {budget['burst']} requests available, "
+            f"{client.coalesced_requests} coalesced requests\n"
+        )
+        endpoints = client.metrics.items()
+        if not endpoints:
+            parts.append("No API requests yet.\n")
+        for (method, endpoint), stats in endpoints:
+            statuses = ", ".join(f"{status}: {count}" for status, count in sorted(stats.statuses.items()))
+            parts.append(
+                f"- {method} {endpoint}: {stats.requests} requests ({statuses}), {stats.bytes / 1024:.1f} KB, "
+                f"{stats.retries} retries, {_format_latency(stats.latency.summary())}\n"
+            )
+    return "".join(parts)
+
+@mcp.tool()
+async def get_projects(output_format: str = "text", account: str = None) -> str:
+    """
+    Get all projects from TickTick.
+    
+    Args:
+        output_format: "text", "json" for the projects as TickTick API objects, or "compact" for lists of their IDs and names
+            (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    """
+    error = _validate_output_format(output_format)
+    if error:
+        return error
+    
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
+        if output_format == "json":
+            return _dump_output(ticktick, {"projects": [project_json(project) for project in projects]})
+        if output_format == "compact":
+            return _dump_output(ticktick, compact_projects(projects))
+        
         if not projects:
             return "No projects found."
         
-        result = f"Found {len(projects)} projects:\n\n"
-        for i, project in enumerate(projects, 1):
-            result += f"Project {i}:\n" + format_project(project) + "\n"
-        
-        return result
+        header = f"Found {len(projects)} projects:\n\n"
+        return header + "".join(render_numbered("Project", projects, format_project))
     except Exception as e:
         logger.error(f"Error in get_projects: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_project(project_id: str) -> str:
+async def get_project(project_id: str, output_format: str = "text", account: str = None) -> str:
     """
     Get details about a specific project.
     
     Args:
         project_id: ID of the project
+        output_format: "text", "json" for the project as a TickTick API object, or "compact" for its ID and name
+            (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    error = _validate_output_format(output_format)
+    if error:
+        return error
+    
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        project = ticktick.get_project(project_id)
+        project = await ticktick.get_project(project_id)
         if 'error' in project:
             return f"Error fetching project: {project['error']}"
         
+        if output_format == "json":
+            return _dump_output(ticktick, project_json(project))
+        if output_format == "compact":
+            return _dump_output(ticktick, compact_project(project))
         return format_project(project)
     except Exception as e:
         logger.error(f"Error in get_project: {e}")
         return f"Error retrieving project: {str(e)}"
 
 @mcp.tool()
-async def get_project_tasks(project_id: str) -> str:
+async def get_project_tasks(project_id: str, output_format: str = "text", account: str = None) -> str:
     """
     Get all tasks in a specific project.
     
     Args:
         project_id: ID of the project
+        output_format: "text", "json" for the project and its tasks as TickTick API objects, or "compact" for lists of the tasks' IDs, titles, due dates
+            (epoch seconds) and priorities
+            (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    error = _validate_output_format(output_format)
+    if error:
+        return error
+    
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        project_data = ticktick.get_project_with_data(project_id)
+        project_data = await ticktick.get_project_with_data(project_id)
         if 'error' in project_data:
             return f"Error fetching project data: {project_data['error']}"
         
         tasks = project_data.get('tasks', [])
+        if output_format == "json":
+            project = project_data.get('project')
+            return _dump_output(ticktick, {"project": project_json(project) if project is not None else None,
+                                           **structured_tasks(tasks, output_format)})
+        if output_format == "compact":
+            return _dump_output(ticktick, {"project_id": project_id, **compact_tasks(tasks, with_project=False)})
+        
         if not tasks:
             return f"No tasks found in project '{project_data.get('project', {}).get('name', project_id)}'."
         
-        result = f"Found {len(tasks)} tasks in project '{project_data.get('project', {}).get('name', project_id)}':\n\n"
-        for i, task in enumerate(tasks, 1):
-            result += f"Task {i}:\n" + format_task(task) + "\n"
-        
-        return result
+        header = f"Found {len(tasks)} tasks in project '{project_data.get('project', {}).get('name', project_id)}':\n\n"
+        return header + "".join(render_numbered("Task", tasks, format_task))
     except Exception as e:
         logger.error(f"Error in get_project_tasks: {e}")
         return f"Error retrieving project tasks: {str(e)}"
 
 @mcp.tool()
-async def get_task(project_id: str, task_id: str) -> str:
+async def get_task(project_id: str, task_id: str, output_format: str = "text", account: str = None) -> str:
     """
     Get details about a specific task.
     
     Args:
         project_id: ID of the project
         task_id: ID of the task
+        output_format: "text", "json" for the task as a TickTick API object, or "compact" for its ID, project ID, title,
+            due date (epoch seconds) and priority
+            (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    error = _validate_output_format(output_format)
+    if error:
+        return error
+    
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        task = ticktick.get_task(project_id, task_id)
+        task = await ticktick.get_task(project_id, task_id)
         if 'error' in task:
             return f"Error fetching task: {task['error']}"
         
+        if output_format == "json":
+            return _dump_output(ticktick, task_json(task))
+        if output_format == "compact":
+            return _dump_output(ticktick, compact_task(task))
         return format_task(task)
     except Exception as e:
         logger.error(f"Error in get_task: {e}")
@@ -218,7 +435,8 @@ async def create_task(
     content: str = None, 
     start_date: str = None, 
     due_date: str = None, 
-    priority: int = 0
+    priority: int = 0,
+    account: str = None
 ) -> str:
     """
     Create a new task in TickTick.
@@ -230,10 +448,11 @@ async def create_task(
         start_date: Start date in ISO format YYYY-MM-DDThh:mm:ss+0000 (optional)
         due_date: Due date in ISO format YYYY-MM-DDThh:mm:ss+0000 (optional)
         priority: Priority level (0: None, 1: Low, 3: Medium, 5: High) (optional)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     # Validate priority
     if priority not in [0, 1, 3, 5]:
@@ -249,7 +468,7 @@ async def create_task(
                 except ValueError:
                     return f"Invalid {date_name} format. Use ISO format: YYYY-MM-DDThh:mm:ss+0000"
         
-        task = ticktick.create_task(
+        task = await ticktick.create_task(
             title=title,
             project_id=project_id,
             content=content,
@@ -274,7 +493,8 @@ async def update_task(
     content: str = None,
     start_date: str = None,
     due_date: str = None,
-    priority: int = None
+    priority: int = None,
+    account: str = None
 ) -> str:
     """
     Update an existing task in TickTick.
@@ -287,10 +507,11 @@ async def update_task(
         start_date: New start date in ISO format YYYY-MM-DDThh:mm:ss+0000 (optional)
         due_date: New due date in ISO format YYYY-MM-DDThh:mm:ss+0000 (optional)
         priority: New priority level (0: None, 1: Low, 3: Medium, 5: High) (optional)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     # Validate priority if provided
     if priority is not None and priority not in [0, 1, 3, 5]:
@@ -306,7 +527,7 @@ async def update_task(
                 except ValueError:
                     return f"Invalid {date_name} format. Use ISO format: YYYY-MM-DDThh:mm:ss+0000"
         
-        task = ticktick.update_task(
+        task = await ticktick.update_task(
             task_id=task_id,
             project_id=project_id,
             title=title,
@@ -325,20 +546,21 @@ async def update_task(
         return f"Error updating task: {str(e)}"
 
 @mcp.tool()
-async def complete_task(project_id: str, task_id: str) -> str:
+async def complete_task(project_id: str, task_id: str, account: str = None) -> str:
     """
     Mark a task as complete.
     
     Args:
         project_id: ID of the project
         task_id: ID of the task
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        result = ticktick.complete_task(project_id, task_id)
+        result = await ticktick.complete_task(project_id, task_id)
         if 'error' in result:
             return f"Error completing task: {result['error']}"
         
@@ -348,20 +570,21 @@ async def complete_task(project_id: str, task_id: str) -> str:
         return f"Error completing task: {str(e)}"
 
 @mcp.tool()
-async def delete_task(project_id: str, task_id: str) -> str:
+async def delete_task(project_id: str, task_id: str, account: str = None) -> str:
     """
     Delete a task.
     
     Args:
         project_id: ID of the project
         task_id: ID of the task
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        result = ticktick.delete_task(project_id, task_id)
+        result = await ticktick.delete_task(project_id, task_id)
         if 'error' in result:
             return f"Error deleting task: {result['error']}"
         
@@ -374,7 +597,8 @@ async def delete_task(project_id: str, task_id: str) -> str:
 async def create_project(
     name: str,
     color: str = "#F18181",
-    view_mode: str = "list"
+    view_mode: str = "list",
+    account: str = None
 ) -> str:
     """
     Create a new project in TickTick.
@@ -383,17 +607,18 @@ async def create_project(
         name: Project name
         color: Color code (hex format) (optional)
         view_mode: View mode - one of list, kanban, or timeline (optional)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     # Validate view_mode
     if view_mode not in ["list", "kanban", "timeline"]:
         return "Invalid view_mode. Must be one of: list, kanban, timeline."
     
     try:
-        project = ticktick.create_project(
+        project = await ticktick.create_project(
             name=name,
             color=color,
             view_mode=view_mode
@@ -408,19 +633,20 @@ async def create_project(
         return f"Error creating project: {str(e)}"
 
 @mcp.tool()
-async def delete_project(project_id: str) -> str:
+async def delete_project(project_id: str, account: str = None) -> str:
     """
     Delete a project.
     
     Args:
         project_id: ID of the project
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        result = ticktick.delete_project(project_id)
+        result = await ticktick.delete_project(project_id)
         if 'error' in result:
             return f"Error deleting project: {result['error']}"
         
@@ -434,82 +660,60 @@ async def delete_project(project_id: str) -> str:
 
 # Helper Functions
 
-PRIORITY_MAP = {0: "None", 1: "Low", 3: "Medium", 5: "High"}
+def _day_start(now: int, days: int = 0) -> int:
+    """Get midnight (UTC) a number of days from today, in epoch seconds."""
+    return (now // SECONDS_PER_DAY + days) * SECONDS_PER_DAY
 
-def _is_task_due_today(task: Dict[str, Any]) -> bool:
-    """Check if a task is due today."""
-    due_date = task.get('dueDate')
-    if not due_date:
-        return False
-    
-    try:
-        task_due_date = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z").date()
-        today_date = datetime.now(timezone.utc).date()
-        return task_due_date == today_date
-    except (ValueError, TypeError):
-        return False
-
-def _is_task_overdue(task: Dict[str, Any]) -> bool:
-    """Check if a task is overdue."""
-    due_date = task.get('dueDate')
-    if not due_date:
-        return False
-    
-    try:
-        task_due = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z")
-        return task_due < datetime.now(timezone.utc)
-    except (ValueError, TypeError):
-        return False
+def _due_in_days(index: TaskIndex, now: int, days: int) -> Set[str]:
+    """Get the IDs of the tasks due on the day X days from today."""
+    return index.due_between(_day_start(now, days), _day_start(now, days + 1))
 
-def _is_task_due_in_days(task: Dict[str, Any], days: int) -> bool:
-    """Check if a task is due in exactly X days."""
-    due_date = task.get('dueDate')
-    if not due_date:
-        return False
-    
-    try:
-        task_due_date = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z").date()
-        target_date = (datetime.now(timezone.utc) + timedelta(days=days)).date()
-        return task_due_date == target_date
-    except (ValueError, TypeError):
-        return False
+def _overdue(index: TaskIndex, now: int) -> Set[str]:
+    """Get the IDs of the overdue tasks."""
+    return index.due_between(end=now)
 
-def _task_matches_search(task: Dict[str, Any], search_term: str) -> bool:
+def _task_matches_search(task: Task, search_term: str) -> bool:
     """Check if a task matches the search term (case-insensitive)."""
     search_term = search_term.lower()
     
     # Search in title
-    title = task.get('title', '').lower()
+    title = (task.title or '').lower()
     if search_term in title:
         return True
     
     # Search in content
-    content = task.get('content', '').lower()
+    content = (task.content or '').lower()
     if search_term in content:
         return True
     
     # Search in subtasks
-    items = task.get('items', [])
-    for item in items:
-        item_title = item.get('title', '').lower()
+    for item in task.items:
+        item_title = (item.title or '').lower()
         if search_term in item_title:
             return True
     
     return False
 
-def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[str]:
+def _validate_task_data(
+    task_data: Dict[str, Any],
+    task_index: int,
+    required: Tuple[str, ...] = ('title', 'project_id')
+) -> Optional[str]:
     """
-    Validate a single task's data for batch creation.
+    Validate a single task's data for a batch operation.
+    
+    Args:
+        task_data: Task dictionary passed to the batch tool
+        task_index: Position of the task in the batch
+        required: Fields that must be present and non-empty
     
     Returns:
         None if valid, error message string if invalid
     """
     # Check required fields
-    if 'title' not in task_data or not task_data['title']:
-        return f"Task {task_index + 1}: 'title' is required and cannot be empty"
-    
-    if 'project_id' not in task_data or not task_data['project_id']:
-        return f"Task {task_index + 1}: 'project_id' is required and cannot be empty"
+    for field in required:
+        if field not in task_data or not task_data[field]:
+            return f"Task {task_index + 1}: '{field}' is required and cannot be empty"
     
     # Validate priority if provided
     priority = task_data.get('priority')
@@ -535,404 +739,831 @@ def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[
     
     return None
 
-def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name: str) -> str:
+def _batch_task_title(client: CachedTickTickClient, task_data: Dict[str, Any]) -> str:
+    """Get the title of a task in a batch, looking it up in the index if it wasn't given."""
+    title = task_data.get('title')
+    if not title and 'task_id' in task_data:
+        record = client.index.get(task_data['task_id'])
+        if record is not None:
+            title = record.task.title
+    return title or task_data.get('task_id', 'Unknown')
+
+def _format_batch_timing(item: BatchItemResult) -> str:
+    """Format the latency of a batch item."""
+    return f"{item.latency * 1000:.0f} ms"
+
+async def _iter_projects_data(client: CachedTickTickClient, project_ids: List[str]):
+    """
+    Fetch the tasks of several projects concurrently.
+    
+    Args:
+        client: Client of the account the projects belong to
+        project_ids: IDs of the projects to fetch
+    
+    Yields:
+        (position in project_ids, project data dictionary) pairs as each fetch completes
+    """
+    async def fetch(project_id: str) -> Dict:
+        try:
+            return await client.get_project_with_data(project_id)
+        except Exception as e:
+            logger.error(f"Error fetching data for project {project_id}: {e}")
+            return {"error": str(e)}
+    
+    async for position, project_data in bounded_as_completed(project_ids, fetch, client.max_concurrency):
+        yield position, project_data
+
+async def _report_progress(ctx: Optional[Context], progress: int, total: int) -> None:
+    """Send a progress notification for the current request, if there is one."""
+    if ctx is None:
+        return
+    try:
+        await ctx.report_progress(progress, total)
+    except Exception as e:
+        # Progress is informational only; never fail a tool because of it
+        logger.debug(f"Could not report progress: {e}")
+
+def _validate_page(limit: Optional[int], offset: int, fields: Optional[List[str]]) -> Optional[str]:
+    """
+    Validate the paging parameters of a cross-project task tool.
+    
+    Returns:
+        None if valid, error message string if invalid
+    """
+    if limit is not None and limit < 1:
+        return "limit must be a positive integer."
+    if offset < 0:
+        return "offset must be a non-negative integer."
+    if fields is not None:
+        unknown = [field for field in fields if field not in TASK_FIELDS]
+        if unknown:
+            return f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(TASK_FIELDS)}"
+    return None
+
+def _validate_output_format(output_format: str) -> Optional[str]:
+    """
+    Validate the output_format parameter of a read tool.
+    
+    Returns:
+        None if valid, error message string if invalid
+    """
+    if output_format not in OUTPUT_FORMATS:
+        return f"Invalid output_format: {output_format}. Use one of {', '.join(OUTPUT_FORMATS)}."
+    return None
+
+def _dump_output(client: CachedTickTickClient, value: Any) -> str:
+    """Encode the json or compact output of a tool with the JSON backend of the account's client."""
+    return client.json_backend.dumps(value).decode()
+
+def _project_sort_key(item):
+    """Sort key for (project number, project) pairs: project sortOrder, then original order."""
+    i, project = item
+    return project.sort_order or 0, i
+
+def _task_sort_key(item):
+    """Sort key for (task number, task) pairs: task sortOrder, then original order."""
+    t, task = item
+    return task.sort_order or 0, t
+
+async def _get_project_tasks_by_filter(client: CachedTickTickClient, projects: List[Project], query: Callable[[TaskIndex, int], Set[str]], filter_name: str,
+                                       ranked: bool = False, limit: Optional[int] = None, offset: int = 0,
+                                       fields: Optional[List[str]] = None, output_format: str = "text",
+                                       ctx: Optional[Context] = None) -> str:
     """
     Helper function to filter tasks across all projects.
     
     Args:
-        projects: List of project dictionaries
-        filter_func: Function that takes a task and returns True if it matches the filter
+        client: Client of the account the projects belong to
+        projects: List of projects
+        query: Function that takes the task index and the current time in epoch seconds,
+            and returns the IDs of the matching tasks
         filter_name: Name of the filter for output formatting
+        ranked: If True, query returns a dictionary mapping task IDs to relevance scores
+            and the tasks of each project are listed by descending score
+        limit: Maximum number of tasks to return; when limit or offset is given, tasks are
+            paged in a stable order (project sortOrder, then task sortOrder)
+        offset: Number of matching tasks to skip
+        fields: Task fields to include (see TASK_FIELDS); all fields if not given
+        output_format: "text", or "json" or "compact" for one page of tasks in a stable order
+            whether or not limit or offset is given (see structured_task_page)
+        ctx: MCP request context, used to report progress while projects are fetched
     
     Returns:
         Formatted string of filtered tasks
     """
+    error = _validate_page(limit, offset, fields) or _validate_output_format(output_format)
+    if error:
+        return error
+    
     if not projects:
+        if output_format != "text":
+            return _dump_output(client, structured_task_page([], 0, offset, output_format, fields))
         return "No projects found."
     
-    result = f"Found {len(projects)} projects:\n\n"
-    
-    for i, project in enumerate(projects, 1):
-        if project.get('closed'):
-            continue
-            
-        project_id = project.get('id', 'No ID')
-        project_data = ticktick.get_project_with_data(project_id)
-        tasks = project_data.get('tasks', [])
-        
-        if not tasks:
-            result += f"Project {i}:\n{format_project(project)}"
-            result += f"With 0 tasks that are to be '{filter_name}' in this project :\n\n\n"
-            continue
-        
-        # Filter tasks using the provided function
-        filtered_tasks = [(t, task) for t, task in enumerate(tasks, 1) if filter_func(task)]
-        
-        result += f"Project {i}:\n{format_project(project)}"
-        result += f"With {len(filtered_tasks)} tasks that are to be '{filter_name}' in this project :\n"
-        
-        for t, task in filtered_tasks:
-            result += f"Task {t}:\n{format_task(task)}\n"
-        
-        result += "\n\n"
-    
-    return result
+    # Fetching the project data through the cache keeps the task index up to date
+    open_projects = [(i, project) for i, project in enumerate(projects, 1) if not project.closed]
+    project_ids = [project.get('id', 'No ID') for _, project in open_projects]
+    fetched = [False] * len(open_projects)
+    fetched_data = [None] * len(open_projects)
+    
+    done = 0
+    async for position, project_data in _iter_projects_data(client, project_ids):
+        fetched[position] = bool(project_data.get('tasks'))
+        if fetched[position]:
+            fetched_data[position] = project_data
+        done += 1
+        await _report_progress(ctx, done, len(open_projects))
+    
+    # Projects evicted from a cache smaller than the account are no longer in
+    # the task index; their fetched data is indexed for this query only
+    indexed = client.index.project_ids()
+    overflow = TaskIndex()
+    for project_id, project_data in zip(project_ids, fetched_data):
+        if project_data is not None and project_id not in indexed:
+            overflow.update_project(project_id, project_data.get('tasks', []))
+    
+    now = int(time.time())
+    task_ids = query(client.index, now)
+    matches = client.index.group_by_project(task_ids)
+    if len(overflow):
+        overflow_task_ids = query(overflow, now)
+        matches.update(overflow.group_by_project(overflow_task_ids))
+        if ranked:
+            task_ids = {**task_ids, **overflow_task_ids}
+    if ranked:
+        for project_tasks in matches.values():
+            project_tasks.sort(key=lambda item: task_ids[item[1].id], reverse=True)
+    
+    if output_format == "text" and limit is None and not offset:
+        # Projects whose data couldn't be fetched are listed without tasks
+        sections = (
+            (i, project, matches.get(project.id, []) if has_tasks else [])
+            for (i, project), has_tasks in zip(open_projects, fetched)
+        )
+        return "".join(render_filtered_projects(len(projects), sections, filter_name, fields))
+    
+    # Order the matching tasks, then format only the ones on the requested page
+    ordered = []
+    fetched_projects = [item for item, has_tasks in zip(open_projects, fetched) if has_tasks]
+    for i, project in sorted(fetched_projects, key=_project_sort_key):
+        project_tasks = matches.get(project.id, [])
+        if not ranked:
+            project_tasks = sorted(project_tasks, key=_task_sort_key)
+        ordered.extend((i, project, t, task) for t, task in project_tasks)
+    
+    page = ordered[offset:offset + limit] if limit is not None else ordered[offset:]
+    if output_format != "text":
+        return _dump_output(client, structured_task_page(page, len(ordered), offset, output_format, fields))
+    return "".join(render_task_page(page, len(ordered), offset, filter_name, fields))
 
 # New MCP Tools for Tasks
 
 @mcp.tool()
-async def get_all_tasks() -> str:
-    """Get all tasks from TickTick. Ignores closed projects."""
+async def get_all_tasks(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
+    """
+    Get all tasks from TickTick. Ignores closed projects.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def all_tasks_filter(task: Dict[str, Any]) -> bool:
-            return True  # Include all tasks
+        def all_tasks_query(index: TaskIndex, now: int) -> Set[str]:
+            return index.all_task_ids()  # Include all tasks
         
-        return _get_project_tasks_by_filter(projects, all_tasks_filter, "included")
+        return await _get_project_tasks_by_filter(ticktick, projects, all_tasks_query, "included", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_all_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_tasks_by_priority(priority_id: int) -> str:
+async def get_tasks_by_priority(
+    priority_id: int,
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
     """
     Get all tasks from TickTick by priority. Ignores closed projects.
 
     Args:
         priority_id: Priority of tasks to retrieve {0: "None", 1: "Low", 3: "Medium", 5: "High"}
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     if priority_id not in PRIORITY_MAP:
-        return f"Invalid priority_id. Valid values: {list(PRIORITY_MAP.keys())}"
+        return f"Invalid priority_id. Valid values: {[int(priority) for priority in PRIORITY_MAP]}"
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def priority_filter(task: Dict[str, Any]) -> bool:
-            return task.get('priority', 0) == priority_id
+        def priority_query(index: TaskIndex, now: int) -> Set[str]:
+            return index.with_priority(priority_id)
         
         priority_name = f"{PRIORITY_MAP[priority_id]} ({priority_id})"
-        return _get_project_tasks_by_filter(projects, priority_filter, f"priority '{priority_name}'")
+        return await _get_project_tasks_by_filter(ticktick, projects, priority_query, f"priority '{priority_name}'", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_tasks_by_priority: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_tasks_due_today() -> str:
-    """Get all tasks from TickTick that are due today. Ignores closed projects."""
+async def get_tasks_due_today(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
+    """
+    Get all tasks from TickTick that are due today. Ignores closed projects.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def today_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_due_today(task)
+        def today_query(index: TaskIndex, now: int) -> Set[str]:
+            return _due_in_days(index, now, 0)
         
-        return _get_project_tasks_by_filter(projects, today_filter, "due today")
+        return await _get_project_tasks_by_filter(ticktick, projects, today_query, "due today", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_tasks_due_today: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_overdue_tasks() -> str:
-    """Get all overdue tasks from TickTick. Ignores closed projects."""
+async def get_overdue_tasks(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
+    """
+    Get all overdue tasks from TickTick. Ignores closed projects.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def overdue_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_overdue(task)
-        
-        return _get_project_tasks_by_filter(projects, overdue_filter, "overdue")
+        return await _get_project_tasks_by_filter(ticktick, projects, _overdue, "overdue", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_overdue_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_tasks_due_tomorrow() -> str:
-    """Get all tasks from TickTick that are due today. Ignores closed projects."""
+async def get_tasks_due_tomorrow(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
+    """
+    Get all tasks from TickTick that are due today. Ignores closed projects.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def today_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_due_in_days(task, 1)
+        def tomorrow_query(index: TaskIndex, now: int) -> Set[str]:
+            return _due_in_days(index, now, 1)
         
-        return _get_project_tasks_by_filter(projects, today_filter, "due today")
+        return await _get_project_tasks_by_filter(ticktick, projects, tomorrow_query, "due today", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_tasks_due_today: {e}")
         return f"Error retrieving projects: {str(e)}"
     
 @mcp.tool()
-async def get_tasks_due_in_days(days: int) -> str:
+async def get_tasks_due_in_days(
+    days: int,
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
     """
     Get all tasks from TickTick that are due in exactly X days. Ignores closed projects.
     
     Args:
         days: Number of days from today (0 = today, 1 = tomorrow, etc.)
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     if days < 0:
         return "Days must be a non-negative integer."
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def days_filter(task: Dict[str, Any]) -> bool:
-            return _is_task_due_in_days(task, days)
+        def days_query(index: TaskIndex, now: int) -> Set[str]:
+            return _due_in_days(index, now, days)
         
         day_description = "today" if days == 0 else f"in {days} day{'s' if days != 1 else ''}"
-        return _get_project_tasks_by_filter(projects, days_filter, f"due {day_description}")
+        return await _get_project_tasks_by_filter(ticktick, projects, days_query, f"due {day_description}", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_tasks_due_in_days: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_tasks_due_this_week() -> str:
-    """Get all tasks from TickTick that are due within the next 7 days. Ignores closed projects."""
+async def get_tasks_due_this_week(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
+    """
+    Get all tasks from TickTick that are due within the next 7 days. Ignores closed projects.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def week_filter(task: Dict[str, Any]) -> bool:
-            due_date = task.get('dueDate')
-            if not due_date:
-                return False
-            
-            try:
-                task_due_date = datetime.strptime(due_date, "%Y-%m-%dT%H:%M:%S.%f%z").date()
-                today = datetime.now(timezone.utc).date()
-                week_from_today = today + timedelta(days=7)
-                return today <= task_due_date <= week_from_today
-            except (ValueError, TypeError):
-                return False
+        def week_query(index: TaskIndex, now: int) -> Set[str]:
+            # From today up to and including the day a week from today
+            return index.due_between(_day_start(now), _day_start(now, 8))
         
-        return _get_project_tasks_by_filter(projects, week_filter, "due this week")
+        return await _get_project_tasks_by_filter(ticktick, projects, week_query, "due this week", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_tasks_due_this_week: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def search_tasks(search_term: str) -> str:
+async def search_tasks(
+    search_term: str,
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
     """
     Search for tasks in TickTick by title, content, or subtask titles. Ignores closed projects.
+    Every word of the search term must match the start of a word in the task (so "rep"
+    finds "report"); the tasks of each project are listed from most to least relevant.
+    Only if no task matches that way are tasks containing the search term anywhere,
+    e.g. in the middle of a word ("port" in "report"), returned instead.
     
     Args:
         search_term: Text to search for (case-insensitive)
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     if not search_term.strip():
         return "Search term cannot be empty."
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def search_filter(task: Dict[str, Any]) -> bool:
-            return _task_matches_search(task, search_term)
+        def search_query(index: TaskIndex, now: int) -> Dict[str, float]:
+            scores = index.search(search_term)
+            if not scores:
+                # No word starts with the search term (or it is only punctuation): fall back to
+                # the substring matching search used before the text index, a full scan
+                return dict.fromkeys(index.matching(lambda task: _task_matches_search(task, search_term)), 0.0)
+            return scores
         
-        return _get_project_tasks_by_filter(projects, search_filter, f"matching '{search_term}'")
+        return await _get_project_tasks_by_filter(ticktick, projects, search_query, f"matching '{search_term}'", ranked=True, limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in search_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
-@mcp.tool()
-async def batch_create_tasks(tasks: List[Dict[str, Any]]) -> str:
+async def _run_batch(
+    client: CachedTickTickClient,
+    tasks: List[Dict[str, Any]],
+    verb: str,
+    action: str,
+    required: Tuple[str, ...],
+    operation: Callable[[Dict[str, Any]], Awaitable[Dict]]
+) -> str:
     """
-    Create multiple tasks in TickTick at once
+    Validate a batch of task operations, run them concurrently and report the outcome.
+    
+    Every task is validated before any of them is sent, and the cached data of
+    each touched project is invalidated once, after the whole batch.
     
     Args:
-        tasks: List of task dictionaries. Each task must contain:
-            - title (required): Task Name
-            - project_id (required): ID of the project for the task
-            - content (optional): Task description
-            - start_date (optional): Start date in user timezone (YYYY-MM-DDTHH:mm:ss or with timezone)
-            - due_date (optional): Due date in user timezone (YYYY-MM-DDTHH:mm:ss or with timezone)  
-            - priority (optional): Priority level {0: "None", 1: "Low", 3: "Medium", 5: "High"}
+        client: Client of the account the tasks belong to
+        tasks: Task dictionaries passed to the batch tool
+        verb: The operation for messages, e.g. "create"
+        action: The operation as a noun for messages, e.g. "creation"
+        required: Fields every task must have
+        operation: Coroutine function making the API call for one task
     
-    Example:
-        tasks = [
-            {"title": "Example A", "project_id": "1234ABC", "priority": 5},
-            {"title": "Example B", "project_id": "1234XYZ", "content": "Description", "start_date": "2025-07-18T10:00:00", "due_date": "2025-07-19T10:00:00"}
-        ]
+    Returns:
+        The report of the batch, or the validation errors if any task is invalid
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     if not tasks:
-        return "No tasks provided. Please provide a list of tasks to create."
+        return f"No tasks provided. Please provide a list of tasks to {verb}."
     
     if not isinstance(tasks, list):
         return "Tasks must be provided as a list of dictionaries."
     
-    # Validate all tasks before creating any
+    # Validate all tasks before sending any
     validation_errors = []
     for i, task_data in enumerate(tasks):
         if not isinstance(task_data, dict):
             validation_errors.append(f"Task {i + 1}: Must be a dictionary")
             continue
         
-        error = _validate_task_data(task_data, i)
+        error = _validate_task_data(task_data, i, required)
         if error:
             validation_errors.append(error)
     
     if validation_errors:
         return "Validation errors found:\n" + "\n".join(validation_errors)
     
-    # Create tasks one by one and collect results
-    created_tasks = []
-    failed_tasks = []
-    
+    done = f"{verb}d"
     try:
-        for i, task_data in enumerate(tasks):
-            try:
-                # Extract task parameters with defaults
-                title = task_data['title']
-                project_id = task_data['project_id']
-                content = task_data.get('content')
-                start_date = task_data.get('start_date')
-                due_date = task_data.get('due_date')
-                priority = task_data.get('priority', 0)
-                
-                # Create the task
-                result = ticktick.create_task(
-                    title=title,
-                    project_id=project_id,
-                    content=content,
-                    start_date=start_date,
-                    due_date=due_date,
-                    priority=priority
-                )
-                
-                if 'error' in result:
-                    failed_tasks.append(f"Task {i + 1} ('{title}'): {result['error']}")
-                else:
-                    created_tasks.append((i + 1, title, result))
-                    
-            except Exception as e:
-                failed_tasks.append(f"Task {i + 1} ('{task_data.get('title', 'Unknown')}'): {str(e)}")
+        # Look the titles up now; the index forgets the touched projects after the batch
+        titles = [_batch_task_title(client, task_data) for task_data in tasks]
         
-        # Format the results
-        result_message = f"Batch task creation completed.\n\n"
-        result_message += f"Successfully created: {len(created_tasks)} tasks\n"
-        result_message += f"Failed: {len(failed_tasks)} tasks\n\n"
+        # Run the operations concurrently; results come back in input order
+        start = time.perf_counter()
+        with client.deferred_invalidation():
+            results = await BatchExecutor().run(tasks, operation)
+        elapsed = time.perf_counter() - start
+        
+        succeeded = [item for item in results if item.ok]
+        failed = [item for item in results if not item.ok]
         
-        if created_tasks:
-            result_message += "✅ Successfully Created Tasks:\n"
-            for task_num, title, task_obj in created_tasks:
-                result_message += f"{task_num}. {title} (ID: {task_obj.get('id', 'Unknown')})\n"
-            result_message += "\n"
+        # Format the results
+        parts = [
+            f"Batch task {action} completed.\n\n",
+            f"Successfully {done}: {len(succeeded)} tasks\n",
+            f"Failed: {len(failed)} tasks\n",
+            f"Total time: {elapsed:.2f}s\n\n"
+        ]
         
-        if failed_tasks:
-            result_message += "❌ Failed Tasks:\n"
-            for error in failed_tasks:
-                result_message += f"{error}\n"
+        if succeeded:
+            parts.append(f"✅ Successfully {done.capitalize()} Tasks:\n")
+            for item in succeeded:
+                title = item.result.get('title') or titles[item.position]
+                task_id = item.result.get('id') or tasks[item.position].get('task_id', 'Unknown')
+                parts.append(
+                    f"{item.position + 1}. {title} (ID: {task_id}) "
+                    f"[{_format_batch_timing(item)}]\n"
+                )
+            parts.append("\n")
+        
+        if failed:
+            parts.append("❌ Failed Tasks:\n")
+            for item in failed:
+                parts.append(
+                    f"Task {item.position + 1} ('{titles[item.position]}'): {item.result['error']} "
+                    f"[{_format_batch_timing(item)}]\n"
+                )
         
+        result_message = "".join(parts)
         return result_message
         
     except Exception as e:
-        logger.error(f"Error in batch_create_tasks: {e}")
-        return f"Error during batch task creation: {str(e)}"
+        logger.error(f"Error in batch task {action}: {e}")
+        return f"Error during batch task {action}: {str(e)}"
+
+@mcp.tool()
+async def batch_create_tasks(tasks: List[Dict[str, Any]], account: str = None) -> str:
+    """
+    Create multiple tasks in TickTick at once
+    
+    Args:
+        tasks: List of task dictionaries. Each task must contain:
+            - title (required): Task Name
+            - project_id (required): ID of the project for the task
+            - content (optional): Task description
+            - start_date (optional): Start date in user timezone (YYYY-MM-DDTHH:mm:ss or with timezone)
+            - due_date (optional): Due date in user timezone (YYYY-MM-DDTHH:mm:ss or with timezone)  
+            - priority (optional): Priority level {0: "None", 1: "Low", 3: "Medium", 5: "High"}
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    
+    Example:
+        tasks = [
+            {"title": "Example A", "project_id": "1234ABC", "priority": 5},
+            {"title": "Example B", "project_id": "1234XYZ", "content": "Description", "start_date": "2025-07-18T10:00:00", "due_date": "2025-07-19T10:00:00"}
+        ]
+    """
+    ticktick = await get_client(account)
+    if not ticktick:
+        return _client_error(account)
+    
+    async def create(task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await ticktick.create_task(
+            title=task_data['title'],
+            project_id=task_data['project_id'],
+            content=task_data.get('content'),
+            start_date=task_data.get('start_date'),
+            due_date=task_data.get('due_date'),
+            priority=task_data.get('priority', 0)
+        )
+    
+    return await _run_batch(ticktick, tasks, "create", "creation", ('title', 'project_id'), create)
+
+@mcp.tool()
+async def batch_update_tasks(tasks: List[Dict[str, Any]], account: str = None) -> str:
+    """
+    Update multiple tasks in TickTick at once
+    
+    Args:
+        tasks: List of task dictionaries. Each task must contain:
+            - task_id (required): ID of the task to update
+            - project_id (required): ID of the project the task belongs to
+            - title (optional): New task title
+            - content (optional): New task description
+            - start_date (optional): New start date in ISO format YYYY-MM-DDThh:mm:ss+0000
+            - due_date (optional): New due date in ISO format YYYY-MM-DDThh:mm:ss+0000
+            - priority (optional): New priority level {0: "None", 1: "Low", 3: "Medium", 5: "High"}
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    
+    Example:
+        tasks = [
+            {"task_id": "abc123", "project_id": "1234ABC", "priority": 5},
+            {"task_id": "def456", "project_id": "1234XYZ", "title": "Renamed", "due_date": "2025-07-19T10:00:00+0000"}
+        ]
+    """
+    ticktick = await get_client(account)
+    if not ticktick:
+        return _client_error(account)
+    
+    async def update(task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await ticktick.update_task(
+            task_id=task_data['task_id'],
+            project_id=task_data['project_id'],
+            title=task_data.get('title'),
+            content=task_data.get('content'),
+            start_date=task_data.get('start_date'),
+            due_date=task_data.get('due_date'),
+            priority=task_data.get('priority')
+        )
+    
+    return await _run_batch(ticktick, tasks, "update", "update", ('task_id', 'project_id'), update)
+
+@mcp.tool()
+async def batch_complete_tasks(tasks: List[Dict[str, Any]], account: str = None) -> str:
+    """
+    Mark multiple tasks as complete at once
+    
+    Args:
+        tasks: List of task dictionaries. Each task must contain:
+            - task_id (required): ID of the task
+            - project_id (required): ID of the project the task belongs to
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    
+    Example:
+        tasks = [
+            {"task_id": "abc123", "project_id": "1234ABC"},
+            {"task_id": "def456", "project_id": "1234XYZ"}
+        ]
+    """
+    ticktick = await get_client(account)
+    if not ticktick:
+        return _client_error(account)
+    
+    async def complete(task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await ticktick.complete_task(task_data['project_id'], task_data['task_id'])
+    
+    return await _run_batch(ticktick, tasks, "complete", "completion", ('task_id', 'project_id'), complete)
+
+@mcp.tool()
+async def batch_delete_tasks(tasks: List[Dict[str, Any]], account: str = None) -> str:
+    """
+    Delete multiple tasks at once
+    
+    Args:
+        tasks: List of task dictionaries. Each task must contain:
+            - task_id (required): ID of the task
+            - project_id (required): ID of the project the task belongs to
+        account: Name of the TickTick account to use (optional, the default account if not given)
+    
+    Example:
+        tasks = [
+            {"task_id": "abc123", "project_id": "1234ABC"},
+            {"task_id": "def456", "project_id": "1234XYZ"}
+        ]
+    """
+    ticktick = await get_client(account)
+    if not ticktick:
+        return _client_error(account)
+    
+    async def delete(task_data: Dict[str, Any]) -> Dict[str, Any]:
+        return await ticktick.delete_task(task_data['project_id'], task_data['task_id'])
+    
+    return await _run_batch(ticktick, tasks, "delete", "deletion", ('task_id', 'project_id'), delete)
 
 # New MCP Tools for Getting things done framework (Priority / Due Dates)
 
 @mcp.tool()
-async def get_engaged_tasks() -> str:
+async def get_engaged_tasks(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
     """
     Get all tasks from TickTick that are "Engaged".
     This includes tasks marked as high priority (5), due today or overdue.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def engaged_filter(task: Dict[str, Any]) -> bool:
-            is_high_priority = task.get('priority', 0) == 5
-            is_overdue = _is_task_overdue(task)
-            is_today = _is_task_due_today(task)
-            return is_high_priority or is_overdue or is_today
+        def engaged_query(index: TaskIndex, now: int) -> Set[str]:
+            high_priority = index.with_priority(5)
+            return high_priority | _overdue(index, now) | _due_in_days(index, now, 0)
         
-        return _get_project_tasks_by_filter(projects, engaged_filter, "engaged")
+        return await _get_project_tasks_by_filter(ticktick, projects, engaged_query, "engaged", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_engaged_tasks: {e}")
         return f"Error retrieving projects: {str(e)}"
 
 @mcp.tool()
-async def get_next_tasks() -> str:
+async def get_next_tasks(
+    limit: int = None,
+    offset: int = 0,
+    fields: List[str] = None,
+    output_format: str = "text",
+    account: str = None,
+    ctx: Context = None
+) -> str:
     """
     Get all tasks from TickTick that are "Next".
     This includes tasks marked as medium priority (3) or due tomorrow.
+    
+    Args:
+        limit: Maximum number of tasks to return (optional)
+        offset: Number of matching tasks to skip, to page through results (optional)
+        fields: Task fields to include, any of id, title, project_id, start_date, due_date,
+            priority, status, content, subtasks (optional, all fields by default)
+        output_format: "text", "json" for the tasks as TickTick API objects, or "compact" for lists
+            of their IDs, project IDs, titles, due dates (epoch seconds) and priorities, which fields
+            doesn't change (optional, "text" by default)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     try:
-        projects = ticktick.get_projects()
+        projects = await ticktick.get_projects()
         if 'error' in projects:
             return f"Error fetching projects: {projects['error']}"
         
-        def next_filter(task: Dict[str, Any]) -> bool:
-            is_medium_priority = task.get('priority', 0) == 3
-            is_due_tomorrow = _is_task_due_in_days(task, 1)
-            return is_medium_priority or is_due_tomorrow
+        def next_query(index: TaskIndex, now: int) -> Set[str]:
+            medium_priority = index.with_priority(3)
+            return medium_priority | _due_in_days(index, now, 1)
         
-        return _get_project_tasks_by_filter(projects, next_filter, "next")
+        return await _get_project_tasks_by_filter(ticktick, projects, next_query, "next", limit=limit, offset=offset, fields=fields, output_format=output_format, ctx=ctx)
         
     except Exception as e:
         logger.error(f"Error in get_next_tasks: {e}")
@@ -944,7 +1575,8 @@ async def create_subtask(
     parent_task_id: str,
     project_id: str,
     content: str = None,
-    priority: int = 0
+    priority: int = 0,
+    account: str = None
 ) -> str:
     """
     Create a subtask for a parent task within the same project.
@@ -955,17 +1587,18 @@ async def create_subtask(
         project_id: ID of the project (must be same for both parent and subtask)
         content: Optional content/description for the subtask
         priority: Priority level (0: None, 1: Low, 3: Medium, 5: High) (optional)
+        account: Name of the TickTick account to use (optional, the default account if not given)
     """
+    ticktick = await get_client(account)
     if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
+        return _client_error(account)
     
     # Validate priority
     if priority not in [0, 1, 3, 5]:
         return "Invalid priority. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)."
     
     try:
-        subtask = ticktick.create_subtask(
+        subtask = await ticktick.create_subtask(
             subtask_title=subtask_title,
             parent_task_id=parent_task_id,
             project_id=project_id,
@@ -981,15 +1614,101 @@ async def create_subtask(
         logger.error(f"Error in create_subtask: {e}")
         return f"Error creating subtask: {str(e)}"
 
-def main():
-    """Main entry point for the MCP server."""
+@mcp.custom_route("/metrics", methods=["GET"])
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    """Serve the metrics of every connected account in the Prometheus text format (HTTP transports only)."""
+    return PlainTextResponse(_prometheus_metrics(accounts.items()), media_type="text/plain; version=0.0.4")
+
+def _transport_security(host: str, allowed_hosts: Optional[List[str]] = None) -> TransportSecuritySettings:
+    """
+    Get the DNS rebinding protection settings of the HTTP transports.
+    
+    Requests are accepted when their Host header, and their Origin header if
+    they have one, name localhost, the host the server listens on (unless it
+    is a wildcard address such as 0.0.0.0) or one of allowed_hosts, with any port.
+    
+    Args:
+        host: Interface the server listens on
+        allowed_hosts: Further host names clients connect with, e.g. mcp.example.com
+    """
+    names = ["127.0.0.1", "localhost", "[::1]"]
+    if host not in LOCAL_HOSTS and host not in WILDCARD_HOSTS:
+        names.append(f"[{host}]" if ":" in host else host)
+    names.extend(allowed_hosts or [])
+    
+    hosts, origins = [], []
+    for name in dict.fromkeys(names):
+        hosts += [name, f"{name}:*"]
+        origins += [f"http://{name}", f"http://{name}:*", f"https://{name}", f"https://{name}:*"]
+    return TransportSecuritySettings(allowed_hosts=hosts, allowed_origins=origins)
+
+async def _serve_http(transport: str, host: Optional[str], port: Optional[int],
+                      limit_concurrency: Optional[int], allowed_hosts: Optional[List[str]] = None) -> None:
+    """Run the MCP server over SSE or streamable HTTP with uvicorn."""
+    import uvicorn
+    
+    host = host or os.getenv("TICKTICK_MCP_HOST") or DEFAULT_HTTP_HOST
+    port = port or int(os.getenv("TICKTICK_MCP_PORT") or DEFAULT_HTTP_PORT)
+    if limit_concurrency is None and os.getenv("TICKTICK_MCP_LIMIT_CONCURRENCY"):
+        limit_concurrency = int(os.getenv("TICKTICK_MCP_LIMIT_CONCURRENCY"))
+    if allowed_hosts is None:
+        allowed_hosts = os.getenv("TICKTICK_MCP_ALLOWED_HOSTS", "").split(",")
+    allowed_hosts = [name.strip() for name in allowed_hosts if name.strip()]
+    
+    mcp.settings.host = host
+    mcp.settings.port = port
+    mcp.settings.transport_security = _transport_security(host, allowed_hosts)
+    if host in WILDCARD_HOSTS and not allowed_hosts:
+        logger.warning(f"Listening on {host}, but only requests addressed to localhost are accepted. "
+                       "Set TICKTICK_MCP_ALLOWED_HOSTS (or --allowed-hosts) to the host names clients connect with.")
+    
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        limit_concurrency=limit_concurrency,
+        log_level=logging.getLevelName(logging.getLogger().getEffectiveLevel()).lower()
+    )
+    logger.info(f"Serving MCP over {transport} on http://{host}:{port}")
+    await uvicorn.Server(config).serve()
+
+async def serve(transport: str = "stdio", host: Optional[str] = None, port: Optional[int] = None,
+                limit_concurrency: Optional[int] = None, allowed_hosts: Optional[List[str]] = None):
+    """
+    Initialize the TickTick client and run the MCP server on the same event loop.
+    
+    With the HTTP transports, every MCP client connected to the server shares
+    its clients, connection pools and caches.
+    
+    Args:
+        transport: One of TRANSPORTS
+        host: Interface the HTTP transports listen on (defaults to TICKTICK_MCP_HOST or 127.0.0.1)
+        port: Port the HTTP transports listen on (defaults to TICKTICK_MCP_PORT or 8000)
+        limit_concurrency: Maximum number of concurrent HTTP connections and requests, beyond
+            which requests are answered with 503 (defaults to TICKTICK_MCP_LIMIT_CONCURRENCY,
+            unlimited if that is not set)
+        allowed_hosts: Host names, besides localhost and host, that HTTP requests may be
+            addressed to (defaults to the comma-separated TICKTICK_MCP_ALLOWED_HOSTS)
+    """
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unsupported transport: {transport}. Use one of {', '.join(TRANSPORTS)}")
+    
     # Initialize the TickTick client
-    if not initialize_client():
+    if not await initialize_client():
         logger.error("Failed to initialize TickTick client. Please check your API credentials.")
         return
     
     # Run the server
-    mcp.run(transport='stdio')
+    if transport == "stdio":
+        await mcp.run_stdio_async()
+    else:
+        await _serve_http(transport, host, port, limit_concurrency, allowed_hosts)
+
+def main(transport: str = "stdio", host: Optional[str] = None, port: Optional[int] = None,
+         limit_concurrency: Optional[int] = None, allowed_hosts: Optional[List[str]] = None):
+    """Main entry point for the MCP server."""
+    asyncio.run(serve(transport, host, port, limit_concurrency, allowed_hosts))
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,151 @@
+"""
+On-disk snapshot of TickTick projects and tasks.
+
+The snapshot lets the server start warm: the project list and each
+project's task data are saved to a SQLite database as they are fetched,
+loaded back into the in-memory cache at boot and refreshed in the
+background afterwards. Writes run on a writer thread of their own, so that
+encoding and committing large payloads doesn't hold up the event loop.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .json_backend import JSONBackend, get_json_backend
+from .models import Project, parse_project_data, parse_projects
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILENAME = "snapshot.sqlite3"
+
+class SnapshotStore:
+    """
+    SQLite-backed store for the project list and project data payloads.
+
+    The save_*, delete_* and clear methods write synchronously; submit runs
+    them on the store's writer thread instead, one at a time in the order
+    they were submitted.
+    """
+
+    def __init__(self, path: str, json_backend: Optional[JSONBackend] = None):
+        """
+        Args:
+            path: Path of the SQLite database file; its directory is created if needed
+            json_backend: Backend the payloads are encoded and decoded with
+                (default: the one TICKTICK_JSON_BACKEND selects)
+        """
+        self.path = Path(path)
+        self.json_backend = json_backend or get_json_backend(os.getenv("TICKTICK_JSON_BACKEND"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ticktick-snapshot")
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS projects ("
+            "id INTEGER PRIMARY KEY CHECK (id = 0), payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS project_data ("
+            "project_id TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def from_cache_dir(cls, cache_dir: str) -> "SnapshotStore":
+        """Open the snapshot stored in a cache directory."""
+        return cls(str(Path(cache_dir).expanduser() / SNAPSHOT_FILENAME))
+
+    def load(self) -> Tuple[Optional[List[Project]], Dict[str, Dict]]:
+        """
+        Load the whole snapshot, parsed into models.
+
+        Returns:
+            A (projects, project_data) tuple where projects is None if no project
+            list has been saved and project_data maps project IDs to their payloads
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM projects WHERE id = 0").fetchone()
+            rows = self._conn.execute("SELECT project_id, payload FROM project_data").fetchall()
+
+        decode = self.json_backend.decode
+        projects = decode(row[0], parse_projects) if row else None
+        project_data = {project_id: decode(payload, parse_project_data) for project_id, payload in rows}
+        return projects, project_data
+
+    def save_projects(self, projects: List[Project]) -> None:
+        """Save the project list."""
+        payload = self.json_backend.dumps(projects).decode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects (id, payload, updated_at) VALUES (0, ?, ?)",
+                (payload, time.time())
+            )
+            self._conn.commit()
+
+    def save_project_data(self, project_id: str, project_data: Dict) -> None:
+        """Save the data of a project."""
+        payload = self.json_backend.dumps(project_data).decode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO project_data (project_id, payload, updated_at) VALUES (?, ?, ?)",
+                (project_id, payload, time.time())
+            )
+            self._conn.commit()
+
+    def delete_projects(self) -> None:
+        """Remove the saved project list."""
+        with self._lock:
+            self._conn.execute("DELETE FROM projects")
+            self._conn.commit()
+
+    def delete_project_data(self, project_id: str) -> None:
+        """Remove the saved data of a project."""
+        with self._lock:
+            self._conn.execute("DELETE FROM project_data WHERE project_id = ?", (project_id,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove everything from the snapshot."""
+        with self._lock:
+            self._conn.execute("DELETE FROM projects")
+            self._conn.execute("DELETE FROM project_data")
+            self._conn.commit()
+
+    def submit(self, write: Callable[..., None], *args: Any) -> Future:
+        """
+        Run a write on the writer thread, after the writes submitted before it.
+
+        Args:
+            write: One of the save_*, delete_* and clear methods of the store
+            *args: Arguments of write
+
+        Returns:
+            A future that is done once the write has run; failed writes are logged, not raised
+        """
+        return self._writer.submit(self._run_write, write, *args)
+
+    @staticmethod
+    def _run_write(write: Callable[..., None], *args: Any) -> None:
+        try:
+            write(*args)
+        except Exception as e:
+            logger.error(f"Failed to write snapshot: {e}")
+
+    def flush(self) -> None:
+        """Wait until the submitted writes have run."""
+        self._writer.submit(lambda: None).result()
+
+    def close(self) -> None:
+        """Run the submitted writes, then close the database connection."""
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
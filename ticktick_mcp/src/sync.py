@@ -0,0 +1,126 @@
+"""
+Background synchronization for the TickTick MCP server.
+
+SyncDaemon periodically re-fetches the project list and every open project
+and applies what changed to a CachedTickTickClient, so that the read tools
+are answered from memory instead of waiting on the API.
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+from typing import Optional
+
+from .cache import CachedTickTickClient
+from .concurrency import bounded_gather, DEFAULT_MAX_CONCURRENCY
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_INTERVAL = 0.0
+DEFAULT_SYNC_JITTER = 0.1
+
+class SyncDaemon:
+    """
+    Keeps a CachedTickTickClient up to date in the background.
+
+    Every interval (give or take the jitter) the daemon fetches the projects,
+    compares each project's tasks with the indexed copy by id and version
+    (etag and modifiedTime) and re-indexes only the tasks that changed. A
+    project that didn't change costs no re-indexing and no snapshot write.
+    Cache entries are kept alive for two intervals, so that reads don't
+    expire between syncs. Projects written to while they were being fetched
+    are skipped until the next sync.
+    """
+
+    def __init__(self, cache: CachedTickTickClient, interval: Optional[float] = None,
+                 jitter: Optional[float] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """
+        Args:
+            cache: The cache to keep up to date
+            interval: Seconds between syncs (defaults to TICKTICK_SYNC_INTERVAL; 0 disables syncing)
+            jitter: Fraction of the interval the delay is randomly varied by, so that several
+                servers don't sync in lockstep (defaults to TICKTICK_SYNC_JITTER)
+            max_concurrency: Maximum number of projects fetched at once
+        """
+        if interval is None:
+            interval = float(os.getenv("TICKTICK_SYNC_INTERVAL", DEFAULT_SYNC_INTERVAL))
+        if jitter is None:
+            jitter = float(os.getenv("TICKTICK_SYNC_JITTER", DEFAULT_SYNC_JITTER))
+
+        self.cache = cache
+        self.interval = max(0.0, interval)
+        self.jitter = min(max(0.0, jitter), 1.0)
+        self.max_concurrency = max_concurrency
+        self.entry_ttl = max(self.cache.project_data_cache.ttl, 2 * self.interval)
+        self.last_sync: Optional[float] = None
+        self.syncs = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def next_delay(self) -> float:
+        """Get the number of seconds to wait before the next sync."""
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def sync_once(self) -> bool:
+        """
+        Fetch the projects and their tasks once and apply the changes to the cache.
+
+        Returns:
+            True if the project list could be fetched, False otherwise
+        """
+        start = time.perf_counter()
+        client = self.cache.client
+
+        version = self.cache.version
+        projects = await client.get_projects()
+        if 'error' in projects:
+            logger.error(f"Background sync failed to fetch projects: {projects['error']}")
+            return False
+        if self.cache.version == version:
+            self.cache.apply_projects(projects, self.entry_ttl)
+
+        open_project_ids = [project.id for project in projects if not project.closed and project.id]
+
+        async def sync_project(project_id: str) -> int:
+            version = self.cache.version
+            project_data = await client.get_project_with_data(project_id)
+            if 'error' in project_data:
+                logger.warning(f"Background sync failed to fetch project {project_id}: {project_data['error']}")
+                return 0
+            if self.cache.version != version:
+                # Written to meanwhile; the data may predate the write
+                return 0
+            return self.cache.apply_project_data(project_id, project_data, self.entry_ttl)
+
+        changes = await bounded_gather(open_project_ids, sync_project, self.max_concurrency)
+
+        # Forget projects that were deleted or closed
+        for project_id in self.cache.index.project_ids() - set(open_project_ids):
+            self.cache.invalidate_project(project_id)
+
+        self.last_sync = time.time()
+        self.syncs += 1
+        changed_projects = sum(1 for count in changes if count)
+        logger.info(
+            f"Background sync of {len(open_project_ids)} projects took {time.perf_counter() - start:.2f}s, "
+            f"{changed_projects} changed ({sum(changes)} changes)"
+        )
+        return True
+
+    async def run(self) -> None:
+        """Sync forever, waiting about interval seconds between syncs."""
+        if not self.enabled:
+            return
+
+        logger.info(f"Background sync every {self.interval:g}s (jitter {self.jitter:.0%})")
+        while True:
+            await asyncio.sleep(self.next_delay())
+            try:
+                await self.sync_once()
+            except Exception as e:
+                logger.error(f"Error in background sync: {e}")
@@ -1,29 +1,147 @@
 import os
-import json
 import base64
+import time
+import threading
+import email.utils
 import requests
 import logging
-from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
 from dotenv import load_dotenv
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
+
+from .concurrency import DEFAULT_MAX_CONCURRENCY
+from .env_file import update_env_file
+from .json_backend import get_json_backend
+from .metrics import RequestMetrics
+from .models import Project, Task, parse_project, parse_project_data, parse_projects, parse_task
+from .ratelimit import TokenBucket, DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST
+from .retry import (
+    RetryPolicy, CircuitBreaker, DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, DEFAULT_MAX_RETRIES,
+    DEFAULT_RETRY_BASE_DELAY, DEFAULT_RETRY_MAX_DELAY, DEFAULT_CIRCUIT_FAILURE_THRESHOLD,
+    DEFAULT_CIRCUIT_RESET_TIMEOUT
+)
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Default connection pool settings
+DEFAULT_POOL_SIZE = 20
+DEFAULT_POOL_MAX_PER_HOST = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+
+# Refresh the access token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 300.0
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either in seconds or as an HTTP date.
+    
+    Returns:
+        The number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def request_not_sent(error: requests.exceptions.RequestException) -> bool:
+    """
+    Check whether a failed request certainly didn't reach the API.
+    
+    That is the case when no connection could be opened: the connection timed
+    out, was refused or failed the TLS handshake. Errors after the request was
+    written, such as a read timeout or a dropped connection, don't count.
+    """
+    if isinstance(error, (requests.exceptions.ConnectTimeout, requests.exceptions.SSLError)):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError):
+        return False
+    # requests wraps urllib3's MaxRetryError, which holds the underlying error as its reason
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+def error_response(error: Exception, status_code: Optional[int] = None,
+                   headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Build the dictionary returned for a failed API request.
+    
+    Args:
+        error: The exception raised for the request
+        status_code: HTTP status code of the response, if one was received
+        headers: Headers of the response, if one was received
+    
+    Returns:
+        A dictionary with an 'error' message, plus 'status_code' and, for rate
+        limited or unavailable responses, 'retry_after' in seconds when known
+    """
+    # Some exceptions, timeouts in particular, have an empty message
+    result = {"error": str(error) or type(error).__name__}
+    if status_code is not None:
+        result["status_code"] = status_code
+        retry_after = parse_retry_after(headers.get("Retry-After")) if headers else None
+        if retry_after is not None:
+            result["retry_after"] = retry_after
+    return result
+
 class TickTickClient:
     """
     Client for the TickTick API using OAuth2 authentication.
+    
+    Requests go through a long-lived session, so connections to the API are kept
+    alive and reused. The pool can be tuned with the pool_size, pool_max_per_host
+    and keepalive_timeout arguments or the TICKTICK_POOL_SIZE,
+    TICKTICK_POOL_MAX_PER_HOST and TICKTICK_KEEPALIVE_TIMEOUT environment variables.
+    
+    Settings are read from environment variables starting with env_prefix, so
+    that several accounts can be configured side by side (for example
+    TICKTICK_WORK_ACCESS_TOKEN for the account "work"). Everything except the
+    tokens falls back to the unprefixed TICKTICK_ variable.
+    
+    When the token response said when the access token expires, the token is
+    refreshed shortly before that instead of after a request fails with 401.
+    Refreshes are serialized: callers that find a refresh in progress wait for
+    it and use its token rather than refreshing again.
+    
+    Requests time out, are retried according to a RetryPolicy (configured with
+    TICKTICK_CONNECT_TIMEOUT, TICKTICK_READ_TIMEOUT, TICKTICK_MAX_RETRIES,
+    TICKTICK_RETRY_BASE_DELAY and TICKTICK_RETRY_MAX_DELAY) and go through a
+    CircuitBreaker (TICKTICK_CIRCUIT_FAILURE_THRESHOLD and
+    TICKTICK_CIRCUIT_RESET_TIMEOUT); while the circuit is open, requests
+    return an error with 'circuit_open' set without being sent.
+    
+    Requests of a client are metered by a TokenBucket (TICKTICK_RATE_LIMIT
+    requests per second, with bursts of up to TICKTICK_RATE_BURST), shared by
+    every caller of the client; rate_limiter.budget() reports its state.
+    
+    JSON is encoded and decoded by the backend named by TICKTICK_JSON_BACKEND
+    (see json_backend).
     """
     
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None, pool_max_per_host: Optional[int] = None,
+                 keepalive_timeout: Optional[float] = None, access_token: Optional[str] = None,
+                 refresh_token: Optional[str] = None, env_prefix: str = "TICKTICK_",
+                 retry_policy: Optional[RetryPolicy] = None):
         load_dotenv()
-        self.client_id = os.getenv("TICKTICK_CLIENT_ID")
-        self.client_secret = os.getenv("TICKTICK_CLIENT_SECRET")
-        self.access_token = os.getenv("TICKTICK_ACCESS_TOKEN")
-        self.refresh_token = os.getenv("TICKTICK_REFRESH_TOKEN")
+        self.env_prefix = env_prefix
+        self.client_id = self._getenv("CLIENT_ID")
+        self.client_secret = self._getenv("CLIENT_SECRET")
+        self.access_token = access_token or self._getenv("ACCESS_TOKEN", shared=False)
+        self.refresh_token = refresh_token or self._getenv("REFRESH_TOKEN", shared=False)
+        # Epoch seconds at which the access token expires, if known
+        expires_at = None if access_token else self._getenv("TOKEN_EXPIRES_AT", shared=False)
+        self.token_expires_at = float(expires_at or 0) or None
+        self._refresh_lock = threading.Lock()
         
         if not self.access_token:
-            raise ValueError("TICKTICK_ACCESS_TOKEN environment variable is not set. "
+            raise ValueError(f"{env_prefix}ACCESS_TOKEN environment variable is not set. "
                             "Please run 'uv run -m ticktick_mcp.authenticate' to set up your credentials.")
             
         self.base_url = os.getenv("TICKTICK_BASE_URL") or "https://api.ticktick.com/open/v1"
@@ -31,24 +149,90 @@ class TickTickClient:
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json",
-            "Accept-Encoding": None,
             "User-Agent": 'curl/8.7.1'
         }
+        
+        # Connection pool settings
+        self.pool_size = pool_size or int(self._getenv("POOL_SIZE") or DEFAULT_POOL_SIZE)
+        self.pool_max_per_host = pool_max_per_host or int(self._getenv("POOL_MAX_PER_HOST") or DEFAULT_POOL_MAX_PER_HOST)
+        self.keepalive_timeout = keepalive_timeout or float(self._getenv("KEEPALIVE_TIMEOUT") or DEFAULT_KEEPALIVE_TIMEOUT)
+        # Maximum number of requests fanned out at once for this account
+        self.max_concurrency = int(self._getenv("MAX_CONCURRENCY") or DEFAULT_MAX_CONCURRENCY)
+        # Timeouts, retries and fail-fast during outages
+        self.retry_policy = retry_policy or RetryPolicy(
+            connect_timeout=float(self._getenv("CONNECT_TIMEOUT") or DEFAULT_CONNECT_TIMEOUT),
+            read_timeout=float(self._getenv("READ_TIMEOUT") or DEFAULT_READ_TIMEOUT),
+            max_retries=int(self._getenv("MAX_RETRIES") or DEFAULT_MAX_RETRIES),
+            base_delay=float(self._getenv("RETRY_BASE_DELAY") or DEFAULT_RETRY_BASE_DELAY),
+            max_delay=float(self._getenv("RETRY_MAX_DELAY") or DEFAULT_RETRY_MAX_DELAY)
+        )
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=int(self._getenv("CIRCUIT_FAILURE_THRESHOLD") or DEFAULT_CIRCUIT_FAILURE_THRESHOLD),
+            reset_timeout=float(self._getenv("CIRCUIT_RESET_TIMEOUT") or DEFAULT_CIRCUIT_RESET_TIMEOUT)
+        )
+        # Counts, statuses and latencies of the requests made, by endpoint
+        self.metrics = RequestMetrics()
+        # Client-side rate limit, shared by everything using this client
+        self.rate_limiter = TokenBucket(
+            rate=float(self._getenv("RATE_LIMIT") or DEFAULT_RATE_LIMIT),
+            burst=int(self._getenv("RATE_BURST") or DEFAULT_RATE_BURST)
+        )
+        # Encodes request bodies and decodes responses, into models where they have a schema
+        self.json_backend = get_json_backend(self._getenv("JSON_BACKEND"))
+        self._session = None
+        self._last_request_time = 0.0
     
-    def _refresh_access_token(self) -> bool:
+    def _getenv(self, name: str, shared: bool = True) -> Optional[str]:
         """
-        Refresh the access token using the refresh token.
+        Read a setting from the environment.
+        
+        Args:
+            name: Name of the setting without prefix, e.g. ACCESS_TOKEN
+            shared: Fall back to the unprefixed TICKTICK_ variable if the prefixed one is not set
+        """
+        value = os.getenv(f"{self.env_prefix}{name}")
+        if value is None and shared:
+            value = os.getenv(f"TICKTICK_{name}")
+        return value
+    
+    def _get_session(self) -> requests.Session:
+        """
+        Get the keep-alive session, creating it on first use.
+        
+        urllib3 does not expire idle connections itself, so connections that have
+        been idle for longer than the keep-alive timeout are dropped before reuse.
+        """
+        now = time.monotonic()
+        if self._session is None:
+            self._session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_max_per_host)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        elif now - self._last_request_time > self.keepalive_timeout:
+            self._session.close()
+        self._last_request_time = now
+        return self._session
+    
+    def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+    
+    def _build_refresh_request(self) -> Optional[Tuple[Dict[str, str], Dict[str, str]]]:
+        """
+        Build the form data and headers for a refresh token request.
         
         Returns:
-            True if successful, False otherwise
+            A (token_data, headers) tuple, or None if the tokens cannot be refreshed
         """
         if not self.refresh_token:
             logger.warning("No refresh token available. Cannot refresh access token.")
-            return False
+            return None
             
         if not self.client_id or not self.client_secret:
             logger.warning("Client ID or Client Secret missing. Cannot refresh access token.")
-            return False
+            return None
             
         # Prepare the token request
         token_data = {
@@ -66,26 +250,82 @@ class TickTickClient:
             "Content-Type": "application/x-www-form-urlencoded"
         }
         
+        return token_data, headers
+    
+    def _token_needs_refresh(self) -> bool:
+        """Check whether the access token is about to expire and can be refreshed."""
+        return (
+            self.token_expires_at is not None
+            and time.time() >= self.token_expires_at - TOKEN_REFRESH_MARGIN
+            and bool(self.refresh_token and self.client_id and self.client_secret)
+        )
+    
+    def _token_refreshed_since(self, stale_token: Optional[str]) -> bool:
+        """Check whether the access token changed since a caller saw stale_token."""
+        return stale_token is not None and self.access_token != stale_token
+    
+    def _use_tokens(self, tokens: Dict[str, str]) -> None:
+        """
+        Use the tokens from a successful token response for the requests that follow.
+        
+        Args:
+            tokens: The parsed token response
+        """
+        # Update the tokens
+        self.access_token = tokens.get('access_token')
+        if 'refresh_token' in tokens:
+            self.refresh_token = tokens.get('refresh_token')
+        expires_in = tokens.get('expires_in')
+        self.token_expires_at = time.time() + float(expires_in) if expires_in else None
+            
+        # Update the headers
+        self.headers["Authorization"] = f"Bearer {self.access_token}"
+    
+    def _apply_tokens(self, tokens: Dict[str, str]) -> None:
+        """
+        Use the tokens from a successful token response and persist them.
+        
+        Args:
+            tokens: The parsed token response
+        """
+        self._use_tokens(tokens)
+        
+        # Save the tokens to the .env file
+        self._save_tokens_to_env(tokens)
+        
+        logger.info("Access token refreshed successfully.")
+    
+    def _refresh_access_token(self, stale_token: Optional[str] = None) -> bool:
+        """
+        Refresh the access token using the refresh token.
+        
+        Args:
+            stale_token: The access token the caller found expired; if another caller
+                has replaced it in the meantime, its token is used instead of refreshing again
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        with self._refresh_lock:
+            if self._token_refreshed_since(stale_token):
+                return True
+            return self._send_refresh_request()
+    
+    def _send_refresh_request(self) -> bool:
+        """Send the refresh token request and apply the new tokens."""
+        refresh_request = self._build_refresh_request()
+        if refresh_request is None:
+            return False
+        token_data, headers = refresh_request
+        
         try:
             # Send the token request
-            response = requests.post(self.token_url, data=token_data, headers=headers)
+            response = self._get_session().post(self.token_url, data=token_data, headers=headers,
+                                                timeout=self.retry_policy.timeouts)
             response.raise_for_status()
             
-            # Parse the response
-            tokens = response.json()
-            
-            # Update the tokens
-            self.access_token = tokens.get('access_token')
-            if 'refresh_token' in tokens:
-                self.refresh_token = tokens.get('refresh_token')
-                
-            # Update the headers
-            self.headers["Authorization"] = f"Bearer {self.access_token}"
-            
-            # Save the tokens to the .env file
-            self._save_tokens_to_env(tokens)
-            
-            logger.info("Access token refreshed successfully.")
+            # Parse the response and update the tokens
+            self._apply_tokens(response.json())
             return True
             
         except requests.exceptions.RequestException as e:
@@ -99,101 +339,153 @@ class TickTickClient:
         Args:
             tokens: A dictionary containing the access_token and optionally refresh_token
         """
-        # Load existing .env file content
-        env_path = Path('.env')
-        env_content = {}
-        
-        if env_path.exists():
-            with open(env_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        env_content[key] = value
-        
         # Update with new tokens
-        env_content["TICKTICK_ACCESS_TOKEN"] = tokens.get('access_token', '')
+        updates = {f"{self.env_prefix}ACCESS_TOKEN": tokens.get('access_token', '')}
         if 'refresh_token' in tokens:
-            env_content["TICKTICK_REFRESH_TOKEN"] = tokens.get('refresh_token', '')
-        
-        # Make sure client credentials are saved as well
-        if self.client_id and "TICKTICK_CLIENT_ID" not in env_content:
-            env_content["TICKTICK_CLIENT_ID"] = self.client_id
-        if self.client_secret and "TICKTICK_CLIENT_SECRET" not in env_content:
-            env_content["TICKTICK_CLIENT_SECRET"] = self.client_secret
+            updates[f"{self.env_prefix}REFRESH_TOKEN"] = tokens.get('refresh_token', '')
+        updates[f"{self.env_prefix}TOKEN_EXPIRES_AT"] = str(int(self.token_expires_at or 0))
         
-        # Write back to .env file
-        with open(env_path, 'w') as f:
-            for key, value in env_content.items():
-                f.write(f"{key}={value}\n")
+        # Make sure client credentials are saved as well, unless they are shared by all accounts
+        defaults = {}
+        for name, value in (("CLIENT_ID", self.client_id), ("CLIENT_SECRET", self.client_secret)):
+            if value and not os.getenv(f"TICKTICK_{name}"):
+                defaults[f"{self.env_prefix}{name}"] = value
         
+        update_env_file(updates, defaults)
         logger.debug("Tokens saved to .env file")
     
-    def _make_request(self, method: str, endpoint: str, data=None) -> Dict:
+    def _make_request(self, method: str, endpoint: str, data=None, parse: Optional[Callable[[Any], Any]] = None) -> Any:
         """
-        Makes a request to the TickTick API.
+        Makes a request to the TickTick API, retrying failed attempts according to the retry policy.
         
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint (without base URL)
             data: Request data (for POST, PUT)
+            parse: Function that turns the JSON of a successful response into models
         
         Returns:
-            API response as a dictionary
+            API response, parsed with parse if given, or an error dictionary
         """
+        if method not in ("GET", "POST", "DELETE"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        
         url = f"{self.base_url}{endpoint}"
+        session = self._get_session()
         
-        try:
-            # Make the request
-            if method == "GET":
-                response = requests.get(url, headers=self.headers)
-            elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers)
+        # Refresh the access token before it expires rather than after a 401
+        if self._token_needs_refresh():
+            logger.info("Access token is about to expire. Refreshing...")
+            if not self._refresh_access_token(stale_token=self.access_token):
+                # Don't try again before every request; fall back to refreshing on 401
+                self.token_expires_at = None
+        
+        # Encoded once, not on every attempt
+        body = self.json_backend.dumps(data) if method == "POST" and data is not None else None
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.circuit_breaker.allow_request():
+                logger.warning(f"Not sending {method} {endpoint}: the circuit is open")
+                self.metrics.record(method, endpoint, "circuit_open")
+                return self.circuit_breaker.open_response()
+            
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                time.sleep(wait)
+            
+            start = time.perf_counter()
+            try:
+                response = self._send(session, method, url, body)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                # No response: the API or the network failed
+                self.metrics.record(method, endpoint, "error", time.perf_counter() - start)
+                self.circuit_breaker.record_failure()
+                delay = self.retry_policy.retry_delay(
+                    method, attempt, sent=not request_not_sent(e)
+                )
+                if delay is None:
+                    result = error_response(e)
+                    logger.error(f"API request failed: {result['error']}")
+                    return result
+            except requests.exceptions.RequestException as e:
+                logger.error(f"API request failed: {e}")
+                return error_response(e)
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                self.metrics.record(method, endpoint, response.status_code, time.perf_counter() - start,
+                                    len(response.content))
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    self.rate_limiter.throttle(retry_after or self.retry_policy.base_delay)
+                delay = self.retry_policy.retry_delay(
+                    method, attempt, response.status_code, retry_after
+                ) if response.status_code >= 400 else None
+                if delay is None:
+                    return self._parse_response(response, parse)
             
-            # Check if the request was unauthorized (401)
-            if response.status_code == 401:
-                logger.info("Access token expired. Attempting to refresh...")
-                
-                # Try to refresh the access token
-                if self._refresh_access_token():
-                    # Retry the request with the new token
-                    if method == "GET":
-                        response = requests.get(url, headers=self.headers)
-                    elif method == "POST":
-                        response = requests.post(url, headers=self.headers, json=data)
-                    elif method == "DELETE":
-                        response = requests.delete(url, headers=self.headers)
+            self.metrics.record_retry(method, endpoint)
+            logger.warning(f"{method} {endpoint} failed (attempt {attempt}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+    
+    def _send(self, session: requests.Session, method: str, url: str, body: Optional[bytes] = None) -> requests.Response:
+        """
+        Send a request once, refreshing the access token and resending it if it is rejected with 401.
+        
+        Raises:
+            requests.exceptions.RequestException: If no response was received
+        """
+        token = self.access_token
+        response = session.request(method, url, headers=self.headers, data=body,
+                                   timeout=self.retry_policy.timeouts)
+        
+        # Check if the request was unauthorized (401)
+        if response.status_code == 401:
+            logger.info("Access token expired. Attempting to refresh...")
             
+            # Try to refresh the access token and retry the request with the new token
+            if self._refresh_access_token(stale_token=token):
+                response = session.request(method, url, headers=self.headers, data=body,
+                                           timeout=self.retry_policy.timeouts)
+        return response
+    
+    def _parse_response(self, response: requests.Response, parse: Optional[Callable[[Any], Any]] = None) -> Any:
+        """Get the result of a request from its final response, parsed with parse if it succeeded."""
+        try:
             # Raise an exception for 4xx/5xx status codes
             response.raise_for_status()
             
             # Return empty dict for 204 No Content
-            if response.status_code == 204 or response.text == "":
+            if response.status_code == 204 or not response.content:
                 return {}
             
-            return response.json()
+            return self.json_backend.decode(response.content, parse)
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {e}")
-            return {"error": str(e)}
+            if e.response is not None:
+                return error_response(e, e.response.status_code, e.response.headers)
+            return error_response(e)
+        except ValueError as e:
+            logger.error(f"Invalid JSON in API response: {e}")
+            return error_response(e, response.status_code)
     
     # Project methods
-    def get_projects(self) -> List[Dict]:
+    def get_projects(self) -> List[Project]:
         """Gets all projects for the user."""
-        return self._make_request("GET", "/project")
+        return self._make_request("GET", "/project", parse=parse_projects)
     
-    def get_project(self, project_id: str) -> Dict:
+    def get_project(self, project_id: str) -> Project:
         """Gets a specific project by ID."""
-        return self._make_request("GET", f"/project/{project_id}")
+        return self._make_request("GET", f"/project/{project_id}", parse=parse_project)
     
     def get_project_with_data(self, project_id: str) -> Dict:
         """Gets project with tasks and columns."""
-        return self._make_request("GET", f"/project/{project_id}/data")
+        return self._make_request("GET", f"/project/{project_id}/data", parse=parse_project_data)
     
-    def create_project(self, name: str, color: str = "#F18181", view_mode: str = "list", kind: str = "TASK") -> Dict:
+    def create_project(self, name: str, color: str = "#F18181", view_mode: str = "list", kind: str = "TASK") -> Project:
         """Creates a new project."""
         data = {
             "name": name,
@@ -201,10 +493,10 @@ class TickTickClient:
             "viewMode": view_mode,
             "kind": kind
         }
-        return self._make_request("POST", "/project", data)
+        return self._make_request("POST", "/project", data, parse=parse_project)
     
     def update_project(self, project_id: str, name: str = None, color: str = None, 
-                       view_mode: str = None, kind: str = None) -> Dict:
+                       view_mode: str = None, kind: str = None) -> Project:
         """Updates an existing project."""
         data = {}
         if name:
@@ -216,20 +508,20 @@ class TickTickClient:
         if kind:
             data["kind"] = kind
             
-        return self._make_request("POST", f"/project/{project_id}", data)
+        return self._make_request("POST", f"/project/{project_id}", data, parse=parse_project)
     
     def delete_project(self, project_id: str) -> Dict:
         """Deletes a project."""
         return self._make_request("DELETE", f"/project/{project_id}")
     
     # Task methods
-    def get_task(self, project_id: str, task_id: str) -> Dict:
+    def get_task(self, project_id: str, task_id: str) -> Task:
         """Gets a specific task by project ID and task ID."""
-        return self._make_request("GET", f"/project/{project_id}/task/{task_id}")
+        return self._make_request("GET", f"/project/{project_id}/task/{task_id}", parse=parse_task)
     
     def create_task(self, title: str, project_id: str, content: str = None, 
                    start_date: str = None, due_date: str = None, 
-                   priority: int = 0, is_all_day: bool = False) -> Dict:
+                   priority: int = 0, is_all_day: bool = False) -> Task:
         """Creates a new task."""
         data = {
             "title": title,
@@ -247,11 +539,11 @@ class TickTickClient:
         if is_all_day is not None:
             data["isAllDay"] = is_all_day
             
-        return self._make_request("POST", "/task", data)
+        return self._make_request("POST", "/task", data, parse=parse_task)
     
     def update_task(self, task_id: str, project_id: str, title: str = None, 
                    content: str = None, priority: int = None, 
-                   start_date: str = None, due_date: str = None) -> Dict:
+                   start_date: str = None, due_date: str = None) -> Task:
         """Updates an existing task."""
         data = {
             "id": task_id,
@@ -269,7 +561,7 @@ class TickTickClient:
         if due_date:
             data["dueDate"] = due_date
             
-        return self._make_request("POST", f"/task/{task_id}", data)
+        return self._make_request("POST", f"/task/{task_id}", data, parse=parse_task)
     
     def complete_task(self, project_id: str, task_id: str) -> Dict:
         """Marks a task as complete."""
@@ -280,7 +572,7 @@ class TickTickClient:
         return self._make_request("DELETE", f"/project/{project_id}/task/{task_id}")
     
     def create_subtask(self, subtask_title: str, parent_task_id: str, project_id: str, 
-                      content: str = None, priority: int = 0) -> Dict:
+                      content: str = None, priority: int = 0) -> Task:
         """
         Creates a subtask for a parent task within the same project.
         
@@ -292,7 +584,7 @@ class TickTickClient:
             priority: Priority level (0-3, where 3 is highest)
         
         Returns:
-            API response as a dictionary containing the created subtask
+            The created subtask
         """
         data = {
             "title": subtask_title,
@@ -305,4 +597,4 @@ class TickTickClient:
         if priority is not None:
             data["priority"] = priority
             
-        return self._make_request("POST", "/task", data)
\ No newline at end of file
+        return self._make_request("POST", "/task", data, parse=parse_task)
\ No newline at end of file